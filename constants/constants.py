@@ -1,13 +1,187 @@
-from solders.pubkey import Pubkey
-
-
 ###############################################################################
 # Configuration
 ###############################################################################
 RPC_HTTP_URL = "https://api.mainnet-beta.solana.com"
 RPC_WS_URL = "wss://api.mainnet-beta.solana.com"
-SPL_TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
-RAYDIUM_AMM_PROGRAM_ID = Pubkey.from_string("RVKd61ztZW9bxemSZ6kBByTnGDRi4KzgPuAzJFnSsnR")
-RAYDIUM_POOL_PROGRAM_ID = Pubkey.from_string("FRC8ebfT1Gp2xCD43zUvGfxjHaMj2rr6zjxxynFzpZpo")
+# Program IDs are plain base58 strings so importing constants stays cheap;
+# convert with solders' Pubkey.from_string() where a Pubkey is needed.
+SPL_TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+RAYDIUM_AMM_PROGRAM_ID = "RVKd61ztZW9bxemSZ6kBByTnGDRi4KzgPuAzJFnSsnR"
+RAYDIUM_POOL_PROGRAM_ID = "FRC8ebfT1Gp2xCD43zUvGfxjHaMj2rr6zjxxynFzpZpo"
+METAPLEX_METADATA_PROGRAM_ID = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"
 HEARTBEAT_INTERVAL = 30
-RECONNECT_DELAY = 5
\ No newline at end of file
+RECONNECT_DELAY = 5
+
+###############################################################################
+# Storage
+###############################################################################
+STORAGE_DB_PATH = "data/detections.db"
+STORAGE_BATCH_SIZE = 500          # Max rows per write transaction
+STORAGE_FLUSH_INTERVAL = 0.5      # Seconds before a partial batch is flushed
+STORAGE_MAX_PENDING = 100_000     # Writes queued before new ones are dropped
+
+###############################################################################
+# Fan-out Server
+###############################################################################
+FANOUT_HOST = "127.0.0.1"
+FANOUT_PORT = 8765
+FANOUT_SOCKET_PATH = None         # Set to a path to serve on a Unix socket instead
+FANOUT_QUEUE_SIZE = 1000          # Frames buffered per subscriber
+FANOUT_SLOW_POLICY = "drop"       # "drop", "coalesce" or "disconnect"
+
+###############################################################################
+# Mint-to-Pool Correlation
+###############################################################################
+CORRELATION_MINT_TTL = 600        # Seconds a new mint stays eligible for a pool match
+CORRELATION_MAX_MINTS = 100_000   # Hard cap on the recent-mint index
+CORRELATION_MAX_LOOKUPS = 8       # Pool transactions fetched at once (getTransaction on the executor)
+RAYDIUM_POOL_INIT_MARKERS = ("initialize2", "InitializeInstruction2")
+
+###############################################################################
+# Benchmarks
+###############################################################################
+BENCH_STARTUP_RUNS = 10           # Interpreter launches per measured module
+
+###############################################################################
+# Engines & Enrichment
+###############################################################################
+DEFAULT_ENGINE = "websockets"     # See core/engines/engine.py for the registry
+GEYSER_URL = "http://127.0.0.1:10000"  # Yellowstone gRPC endpoint (geyser engine; https:// for TLS)
+GEYSER_X_TOKEN = None             # Sent as the x-token header when set
+LOGS_COMMITMENT = None            # None = the node's default commitment
+RATE_LIMIT = 5                    # Enrichment RPC requests allowed per second
+ENRICHMENT_WORKERS = 4            # Concurrent enrichment lookups
+ENRICHMENT_DEADLINE = 30          # Seconds a queued mint stays worth enriching
+ENRICHMENT_EXPIRED_POLICY = "drop"  # Past the deadline: "drop", or "downgrade" to a cheap lookup
+WATCHED_AUTHORITIES = ()          # Mint authorities whose mints jump the enrichment queue
+ENRICHMENT_LOOKUPS = ("mint", "metadata", "dex")  # Run concurrently for every mint
+ENRICHMENT_LOOKUP_DEADLINE = 2.0  # Seconds before partial results are emitted
+BENCH_MESSAGES = 20_000           # Frames replayed per engine by `bench engines`
+BENCH_MINT_RATIO = 0.05           # Share of replayed frames carrying InitializeMint
+BENCH_CLUSTER_NODES = 3           # Node processes started by `bench cluster`
+BATCH_MAX_FRAMES = 256            # Buffered frames decoded together (1 = one at a time)
+INBOX_MAX_FRAMES = 10_000         # Frames the reader task may queue ahead of processing (0 = read inline)
+INBOX_OVERFLOW_POLICY = "drop-oldest"  # Inbox full: "drop-oldest", "drop-newest" or "block"
+
+###############################################################################
+# Runtime
+###############################################################################
+USE_UVLOOP = False                # Opt-in; falls back to asyncio if uvloop is missing
+EXECUTOR_WORKERS = 8              # Threads for blocking work (HTTP lookups, disk)
+
+###############################################################################
+# Shared-Memory Workers
+###############################################################################
+SHM_RING_SLOTS = 2048             # Records per ring (power of two)
+SHM_SLOT_SIZE = 16 * 1024         # Max bytes per record (raw frames are larger than records)
+SHM_MAX_CONSUMERS = 16            # Cursor slots per ring
+SHM_WORKERS = 0                   # Decode/detect worker processes (0 = in the reader process)
+SHM_POLL_INTERVAL = 0.001         # Seconds an idle ring consumer sleeps between polls
+SHM_RESULT_SLOTS = 8192           # Detection records per worker result ring (~2 MB); more undrained ones are lost
+
+###############################################################################
+# Two-Phase Commitment
+###############################################################################
+CONFIRMATION_TARGET = "confirmed"     # Track processed events until "confirmed" or "finalized"
+CONFIRMATION_POLL_INTERVAL = 0.4      # Seconds between signature status batches (~1 slot)
+CONFIRMATION_TIMEOUT = 90             # Unseen this long (blockhash expired) = dropped fork
+CONFIRMATION_MAX_PENDING = 50_000     # Signatures tracked at once
+
+###############################################################################
+# Overload Control
+###############################################################################
+OVERLOAD_CHECK_INTERVAL = 0.5     # Seconds between loop-lag / queue-depth samples
+OVERLOAD_LAG_HIGH = 0.1           # Loop lag (s) that escalates one shedding stage
+OVERLOAD_LAG_LOW = 0.02           # Loop lag (s) considered healthy again
+OVERLOAD_DEPTH_HIGH = 1_000       # Queued work items that escalate one stage
+OVERLOAD_DEPTH_LOW = 100          # Queued work items considered healthy again
+OVERLOAD_RECOVERY_CHECKS = 6      # Healthy samples in a row before stepping back down
+PARSER_SAMPLE_EVERY = 10          # Under overload, parse 1 in N low-priority instructions
+METRICS_REPORT_INTERVAL = 60      # Seconds between "metrics" events (counters and gauges, 0 = never)
+
+###############################################################################
+# Memory Bounds & Soak
+###############################################################################
+LOG_MAX_BYTES = 50 * 1024 * 1024  # Rotate the run's log file at this size
+LOG_BACKUP_COUNT = 3              # Rotated files kept per run
+LOG_KEEP_RUNS = 20                # Older per-run log files are deleted at startup
+ENRICHMENT_MAX_QUEUED = 10_000    # Mints waiting for enrichment; new ones are rejected past this
+MAX_SNIFFERS = 64                 # Concurrent program subscriptions in SolanaSniffer
+SOAK_RATE = 200                   # Assumed live notifications/s when converting soak hours to messages
+SOAK_MAX_GROWTH_MB = 32           # Soak fails if RSS grows more than this after warm-up
+
+###############################################################################
+# Transfer Activity
+###############################################################################
+ACTIVITY_SKETCH_WIDTH = 4096      # Count-min counters per row (overcount <= e/width of all transfers)
+ACTIVITY_SKETCH_DEPTH = 4         # Count-min rows (error bound holds with probability 1 - e^-depth)
+ACTIVITY_TOP_K = 100              # Heavy-hitter mints kept per ranking (transfers, volume)
+ACTIVITY_HLL_PRECISION = 10       # 1 KiB HyperLogLog per tracked mint, ~3% error on unique wallets
+ACTIVITY_REPORT_INTERVAL = 60     # Seconds between "hot_mints" events
+ACTIVITY_REPORT_SIZE = 10         # Mints per "hot_mints" event
+
+###############################################################################
+# State Snapshots
+###############################################################################
+STATE_PATH = "data/solsniff.state"  # Written on shutdown, read on startup ('' disables)
+SHUTDOWN_DRAIN_TIMEOUT = 5.0      # Seconds queued enrichment gets to finish before the snapshot
+DEDUPE_WINDOW = 10_000            # Recent (signature, mint) detections remembered to drop repeats
+
+###############################################################################
+# Cluster
+###############################################################################
+CLUSTER_HOST = "127.0.0.1"        # Coordinator listen address (nodes connect here)
+CLUSTER_PORT = 8766
+CLUSTER_VNODES = 64               # Points per node on the consistent-hash ring
+CLUSTER_HEARTBEAT_INTERVAL = 1.0  # Seconds between node heartbeats
+CLUSTER_NODE_TIMEOUT = 5.0        # Silent this long and a node is dropped and its work rebalanced
+CLUSTER_HANDOFF_GRACE = 2.0       # A node keeps a reassigned subscription this long (overlap, not a gap)
+CLUSTER_MAX_BUFFERED = 10_000     # Events a node holds while the coordinator is unreachable
+CLUSTER_BATCH_EVENTS = 256        # Events per message from node to coordinator
+
+###############################################################################
+# Execution
+###############################################################################
+EXECUTION_BLOCKHASH_REFRESH = 2.0     # Seconds between background getLatestBlockhash calls
+EXECUTION_MAX_BLOCKHASH_AGE = 45.0    # Refuse to sign with a cached blockhash older than this (~60s validity)
+EXECUTION_SLOT_DURATION = 0.4         # Seconds per slot when extrapolating the slot clock
+EXECUTION_POOL_SIZE = 4               # Kept-alive connections per submission endpoint
+EXECUTION_SUBMIT_TIMEOUT = 5.0        # Seconds per sendTransaction call
+EXECUTION_COMPUTE_UNIT_LIMIT = 50_000  # Compute budget of built-in templates
+EXECUTION_COMPUTE_UNIT_PRICE = 10_000  # Priority fee in micro-lamports per compute unit
+BENCH_EXECUTE_MINTS = 500             # Mints executed against the mock in `bench execute`
+
+###############################################################################
+# Filters
+###############################################################################
+FILTER_RELOAD_INTERVAL = 1.0          # Seconds between checks of --filter-file for changes
+FILTER_MAX_TRACKED = 100_000          # Mints whose partial fields or verdict are remembered
+FILTER_HOLD_TIMEOUT = 60.0            # Seconds an undecided detection is held for a verdict before it is dropped
+
+###############################################################################
+# Mint Tracking
+###############################################################################
+TRACKING_MAX_MINTS = 1_000            # Mints with a live accountSubscribe (least recently tracked evicted first)
+TRACKING_MAX_AGE = 3600.0             # Seconds a mint stays tracked after it was last detected or matched
+TRACKING_PER_CONNECTION = 100         # accountSubscribe subscriptions multiplexed per WebSocket
+TRACKING_COMMITMENT = "processed"     # Push account changes as soon as they are seen
+TRACKING_SWEEP_INTERVAL = 10.0        # Seconds between age-eviction passes
+
+###############################################################################
+# Slot Reordering
+###############################################################################
+REORDER_MAX_DELAY = 0.8               # Seconds an event may be held for ordering (~2 slots of latency)
+REORDER_MAX_BUFFERED = 50_000         # Events held at most; the lowest slots are released beyond this
+REORDER_SLOT_LAG = 1                  # Slots of grace behind the furthest subscription or chain tip before a slot is complete
+
+###############################################################################
+# Historical Scan
+###############################################################################
+SCAN_CONCURRENCY = 8                  # getBlock requests in flight at once
+SCAN_RATE_LIMIT = 10                  # getBlock requests per second (full blocks are heavy for public RPCs)
+SCAN_RETRIES = 3                      # Extra attempts per slot before it is left for the next run
+SCAN_TIMEOUT = 30.0                   # Seconds per getBlock call
+SCAN_CHECKPOINT_PATH = "data/scan.checkpoint"  # Finished slots of the current scan ('' disables resuming)
+SCAN_CHECKPOINT_INTERVAL = 5.0        # Seconds between checkpoint writes (also written on exit)
+SCAN_PROGRESS_INTERVAL = 5.0          # Seconds between progress lines
+BENCH_SCAN_SLOTS = 2_000              # Slots served by the mock in `bench scan`
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.activity.sketches import CountMinSketch, HyperLogLog, TopK, hash64
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from constants.constants import (
+    ACTIVITY_SKETCH_WIDTH,
+    ACTIVITY_SKETCH_DEPTH,
+    ACTIVITY_TOP_K,
+    ACTIVITY_HLL_PRECISION,
+    ACTIVITY_REPORT_INTERVAL,
+    ACTIVITY_REPORT_SIZE,
+)
+
+
+class TransferActivity:
+    """
+    Which mints are hot, in fixed memory.
+
+    Every transfer, mint-to and burn the InstructionParser can attribute to
+    a mint (only lines that name it, see InstructionParser._record_activity)
+    goes into two count-min sketches (transfer count and volume per mint).
+    A top-K per sketch keeps the heavy hitters, and only mints in either
+    top-K get a HyperLogLog of the wallets involved, so memory is bounded
+    by the sketch shapes and 2 * top_k, not by the number of mints on chain.
+
+    Snapshots are plain JSON-safe dicts; `merge` adds another instance's
+    snapshot (another shard, or a previous run) to this one.
+    """
+    def __init__(
+        self,
+        width: int = ACTIVITY_SKETCH_WIDTH,
+        depth: int = ACTIVITY_SKETCH_DEPTH,
+        top_k: int = ACTIVITY_TOP_K,
+        hll_precision: int = ACTIVITY_HLL_PRECISION,
+    ):
+        self.transfers = CountMinSketch(width, depth)
+        self.volume = CountMinSketch(width, depth, typecode="d")
+        self.by_transfers = TopK(top_k)
+        self.by_volume = TopK(top_k)
+        self.hll_precision = hll_precision
+        self.wallets: Dict[str, HyperLogLog] = {}  # Tracked mints only
+        self.recorded = 0
+
+    def record(self, mint: str, amount: Optional[int] = None, wallets: Iterable[Optional[str]] = (), weight: int = 1) -> None:
+        """
+        Count one transfer-like instruction for `mint`.
+
+        :param weight: How many instructions this one stands for (the parser
+                       samples transfers under overload).
+        """
+        self.recorded += weight
+        hashed = hash64(mint)
+        self._evicted(self.by_transfers.offer(mint, self.transfers.add_hashed(hashed, weight)))
+        if amount:
+            self._evicted(self.by_volume.offer(mint, self.volume.add_hashed(hashed, float(amount) * weight)))
+
+        if mint in self.by_transfers or mint in self.by_volume:
+            hll = self.wallets.get(mint)
+            if hll is None:
+                hll = self.wallets[mint] = HyperLogLog(self.hll_precision)
+            for wallet in wallets:
+                if wallet:
+                    hll.add(wallet)
+
+    def _evicted(self, mint: Optional[str]) -> None:
+        # A mint keeps its wallet count while it is in either top-K
+        if mint is not None and mint not in self.by_transfers and mint not in self.by_volume:
+            self.wallets.pop(mint, None)
+
+    def unique_wallets(self, mint: str) -> Optional[int]:
+        hll = self.wallets.get(mint)
+        return hll.count() if hll is not None else None
+
+    def hot(self, limit: int = ACTIVITY_REPORT_SIZE) -> List[Dict[str, Any]]:
+        """The `limit` mints with the most transfers, with their volume and wallet counts."""
+        return [
+            {
+                "mint": mint,
+                "transfers": transfers,
+                "volume": self.volume.estimate(mint),
+                "unique_wallets": self.unique_wallets(mint),
+            }
+            for mint, transfers in self.by_transfers.items()[:limit]
+        ]
+
+    ###########################################################################
+    # Snapshots
+    ###########################################################################
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "transfers": self.transfers.snapshot(),
+            "volume": self.volume.snapshot(),
+            "top_k": self.by_transfers.k,
+            "candidates": sorted(set(self.by_transfers.values) | set(self.by_volume.values)),
+            "wallets": {mint: hll.snapshot() for mint, hll in self.wallets.items()},
+        }
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Add another instance's snapshot. Both sides' heavy hitters are
+        re-ranked against the merged sketches, so a mint that was hot on
+        either side is considered.
+        """
+        self.transfers.merge(CountMinSketch.from_snapshot(snapshot["transfers"]))
+        self.volume.merge(CountMinSketch.from_snapshot(snapshot["volume"]))
+        self.recorded += snapshot["recorded"]
+
+        candidates = set(self.by_transfers.values) | set(self.by_volume.values) | set(snapshot["candidates"])
+        wallets = self.wallets
+        for mint, hll_snapshot in snapshot["wallets"].items():
+            other = HyperLogLog.from_snapshot(hll_snapshot)
+            if mint in wallets:
+                wallets[mint].merge(other)
+            else:
+                wallets[mint] = other
+
+        self.by_transfers = TopK(self.by_transfers.k)
+        self.by_volume = TopK(self.by_volume.k)
+        for mint in candidates:
+            hashed = hash64(mint)
+            self.by_transfers.offer(mint, self.transfers.estimate_hashed(hashed))
+            volume = self.volume.estimate_hashed(hashed)
+            if volume:
+                self.by_volume.offer(mint, volume)
+        for mint in list(wallets):
+            self._evicted(mint)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> "TransferActivity":
+        transfers = snapshot["transfers"]
+        activity = cls(
+            width=transfers["width"],
+            depth=transfers["depth"],
+            top_k=snapshot["top_k"],
+            hll_precision=next(iter(snapshot["wallets"].values()), {}).get("precision", ACTIVITY_HLL_PRECISION),
+        )
+        activity.merge(snapshot)
+        return activity
+
+    ###########################################################################
+    # Reporting
+    ###########################################################################
+    async def run(self, emit: Callable[[Dict[str, Any]], None], interval: float = ACTIVITY_REPORT_INTERVAL) -> None:
+        """Emit a "hot_mints" event every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            metrics.set_gauge("activity.tracked_mints", len(self.wallets))
+            if not self.recorded:
+                continue
+            emit({
+                "type": "hot_mints",
+                "recorded": self.recorded,
+                "mints": self.hot(),
+                "reported_at": time.time(),
+            })
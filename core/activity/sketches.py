@@ -0,0 +1,207 @@
+import base64
+import hashlib
+import heapq
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MASK64 = (1 << 64) - 1
+
+
+def hash64(key: str) -> int:
+    """
+    Stable 64-bit hash of `key`. Python's own str hash is salted per process,
+    which would make snapshots from different runs impossible to merge.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _decode(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"))
+
+
+###############################################################################
+# Count-Min Sketch
+###############################################################################
+class CountMinSketch:
+    """
+    Approximate per-key totals in `width` x `depth` counters, whatever the
+    number of keys. Estimates never undercount; they overcount by at most
+    e/width of the grand total with probability 1 - e^-depth.
+
+    `typecode` "Q" counts events, "d" sums amounts (token amounts can
+    overflow 64 bits once summed). Sketches of the same shape merge by
+    adding their counters.
+    """
+    def __init__(self, width: int, depth: int, typecode: str = "Q"):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.typecode = typecode
+        self.counters = array(typecode, bytes(array(typecode).itemsize * width * depth))
+        self.total = 0
+
+    def _cells(self, hashed: int) -> Iterable[int]:
+        # Double hashing: row i uses h1 + i * h2 (Kirsch & Mitzenmacher)
+        h1, h2 = hashed & 0xFFFFFFFF, (hashed >> 32) | 1
+        width = self.width
+        for row in range(self.depth):
+            yield row * width + (h1 + row * h2) % width
+
+    def add(self, key: str, value=1):
+        """Add `value` to `key`'s total. Returns the new estimate."""
+        return self.add_hashed(hash64(key), value)
+
+    def add_hashed(self, hashed: int, value=1):
+        counters = self.counters
+        estimate = None
+        for cell in self._cells(hashed):
+            counters[cell] += value
+            if estimate is None or counters[cell] < estimate:
+                estimate = counters[cell]
+        self.total += value
+        return estimate
+
+    def estimate(self, key: str):
+        return self.estimate_hashed(hash64(key))
+
+    def estimate_hashed(self, hashed: int):
+        counters = self.counters
+        return min(counters[cell] for cell in self._cells(hashed))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (other.width, other.depth, other.typecode) != (self.width, self.depth, self.typecode):
+            raise ValueError("Only sketches of the same shape can be merged")
+        counters = self.counters
+        for i, value in enumerate(other.counters):
+            if value:
+                counters[i] += value
+        self.total += other.total
+
+    def snapshot(self) -> Dict:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "typecode": self.typecode,
+            "total": self.total,
+            "counters": _encode(self.counters.tobytes()),
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "CountMinSketch":
+        sketch = cls(snapshot["width"], snapshot["depth"], snapshot["typecode"])
+        sketch.counters = array(sketch.typecode, _decode(snapshot["counters"]))
+        if len(sketch.counters) != sketch.width * sketch.depth:
+            raise ValueError("Count-min snapshot does not match its shape")
+        sketch.total = snapshot["total"]
+        return sketch
+
+
+###############################################################################
+# Top-K
+###############################################################################
+class TopK:
+    """
+    The `k` keys with the largest values offered so far.
+
+    `values` is authoritative; the heap holds one entry per tracked key and
+    may lag behind it (values only grow), so stale minimums are refreshed
+    lazily when a newcomer challenges them.
+    """
+    def __init__(self, k: int):
+        self.k = k
+        self.values: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def offer(self, key: str, value) -> Optional[str]:
+        """
+        Record `key`'s current value.
+
+        :return: The key this pushed out of the top k, if any.
+        """
+        values, heap = self.values, self._heap
+        if key in values:
+            values[key] = value
+            return None
+        if len(values) < self.k:
+            values[key] = value
+            heapq.heappush(heap, (value, key))
+            return None
+        # Refresh stale minimums before comparing
+        while heap[0][0] != values[heap[0][1]]:
+            heapq.heapreplace(heap, (values[heap[0][1]], heap[0][1]))
+        if value <= heap[0][0]:
+            return None
+        _, evicted = heapq.heapreplace(heap, (value, key))
+        del values[evicted]
+        values[key] = value
+        return evicted
+
+    def items(self) -> List[Tuple[str, float]]:
+        """Tracked keys, largest value first."""
+        return sorted(self.values.items(), key=lambda item: item[1], reverse=True)
+
+
+###############################################################################
+# HyperLogLog
+###############################################################################
+class HyperLogLog:
+    """
+    Approximate distinct count in 2^precision one-byte registers (standard
+    error about 1.04 / sqrt(2^precision)). Merges by taking register maxima.
+    """
+    def __init__(self, precision: int = 10):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, item: str) -> None:
+        self.add_hashed(hash64(item))
+
+    def add_hashed(self, hashed: int) -> None:
+        precision = self.precision
+        index = hashed >> (64 - precision)
+        rest = hashed & (MASK64 >> precision)
+        rank = (64 - precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        registers = self.registers
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in registers)
+        if estimate <= 2.5 * m:
+            zeros = registers.count(0)
+            if zeros:
+                estimate = m * math.log(m / zeros)  # Linear counting for small sets
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Only HyperLogLogs of the same precision can be merged")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def snapshot(self) -> Dict:
+        return {"precision": self.precision, "registers": _encode(bytes(self.registers))}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "HyperLogLog":
+        hll = cls(snapshot["precision"])
+        registers = _decode(snapshot["registers"])
+        if len(registers) != len(hll.registers):
+            raise ValueError("HyperLogLog snapshot does not match its precision")
+        hll.registers = bytearray(registers)
+        return hll
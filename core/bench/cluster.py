@@ -0,0 +1,145 @@
+import asyncio
+import multiprocessing
+import signal
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from core.cluster.cluster import Coordinator
+from core.mock.mock_rpc import serve_forever, synthetic_frames
+from core.pipeline.pipeline import Pipeline
+from core.sinks.sinks import Sink
+from constants.constants import BENCH_MESSAGES, BENCH_MINT_RATIO, BENCH_CLUSTER_NODES
+
+PROGRAMS_PER_NODE = 4       # Fake program IDs to spread (the mock streams the same frames to each)
+DEFAULT_RATE = 2_000        # Frames/s per subscription, so the run lasts long enough to lose a node
+KILL_AT = 0.4               # Share of expected mints seen before the busiest node is killed
+JOIN_TIMEOUT = 30.0
+NODE_TIMEOUT = 3.0          # Coordinator heartbeat timeout for the run
+
+
+class _Collector(Sink):
+    """Counts what leaves the coordinator's pipeline."""
+    def __init__(self):
+        self.detections: Counter = Counter()
+        self.changed = asyncio.Event()
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        if event.get("type") == "detection":
+            self.detections[(event["signature"], event["mint"])] += 1
+            self.changed.set()
+
+
+def _expected_mints(frames: List[dict]) -> int:
+    return sum(
+        any("InitializeMint" in line for line in frame["params"]["result"]["value"]["logs"])
+        for frame in frames
+    )
+
+
+async def _wait_for(condition, timeout: float, interval: float = 0.05) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(interval)
+    return True
+
+
+async def _run(url: str, nodes: int, expected: int, timeout: float) -> Dict[str, Any]:
+    collector = _Collector()
+    pipeline = Pipeline(sinks=[collector])
+    programs = [f"BenchProgram{i:03d}" for i in range(nodes * PROGRAMS_PER_NODE)]
+    coordinator = Coordinator(pipeline, programs, port=0, node_timeout=NODE_TIMEOUT)
+    await pipeline.start()
+    await coordinator.start()
+
+    processes: Dict[str, asyncio.subprocess.Process] = {}
+    report: Dict[str, Any] = {"expected": expected, "killed": None}
+    started = time.perf_counter()
+    try:
+        for i in range(nodes):
+            node_id = f"node-{i}"
+            processes[node_id] = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "core", "run",
+                "--join", f"{coordinator.host}:{coordinator.port}",
+                "--node-id", node_id,
+                "--engine", "websockets",
+                "--rpc-ws-url", url,
+                "--log-dir", "",
+                "--state", "",
+                "--db", "",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        if not await _wait_for(lambda: len(coordinator.members) == nodes, JOIN_TIMEOUT):
+            raise RuntimeError(f"only {len(coordinator.members)} of {nodes} nodes joined")
+        report["joined_s"] = time.perf_counter() - started
+
+        # Lose the node with the most subscriptions part way through
+        await _wait_for(lambda: len(collector.detections) >= expected * KILL_AT, timeout)
+        if nodes > 1:
+            victim = max(coordinator.members.values(), key=lambda member: len(member.programs))
+            report["killed"] = (victim.node_id, len(victim.programs))
+            processes[victim.node_id].send_signal(signal.SIGKILL)
+
+        await _wait_for(lambda: len(collector.detections) >= expected, timeout)
+        report["seconds"] = time.perf_counter() - started
+    finally:
+        for process in processes.values():
+            if process.returncode is None:
+                process.terminate()
+        await asyncio.gather(*(process.wait() for process in processes.values()), return_exceptions=True)
+        await coordinator.stop()
+        await pipeline.stop()
+
+    report["unique"] = len(collector.detections)
+    report["duplicates"] = sum(count - 1 for count in collector.detections.values())
+    report["epochs"] = coordinator.epoch
+    report["members"] = len(coordinator.members)
+    return report
+
+
+def run_cluster_bench(
+    nodes: int = BENCH_CLUSTER_NODES,
+    messages: int = BENCH_MESSAGES,
+    rate: Optional[float] = None,
+    timeout: float = 120.0,
+) -> bool:
+    """
+    Run a coordinator and `nodes` node processes over loopback against a
+    mock RPC, kill the busiest node part way through, and check that the
+    merged stream still holds every mint exactly once.
+
+    :return: True if every mint was reported and none twice.
+    """
+    frames = synthetic_frames(messages, BENCH_MINT_RATIO)
+    expected = _expected_mints(frames)
+
+    ctx = multiprocessing.get_context("spawn")
+    port_queue = ctx.Queue()
+    server = ctx.Process(target=serve_forever, args=(frames, rate or DEFAULT_RATE, port_queue), daemon=True)
+    server.start()
+    url = f"ws://127.0.0.1:{port_queue.get(timeout=30)}"
+    try:
+        print(
+            f"Replaying {len(frames)} frames ({expected} mints) at {rate or DEFAULT_RATE:g}/s per subscription "
+            f"to {nodes} nodes sharing {nodes * PROGRAMS_PER_NODE} programs"
+        )
+        report = asyncio.run(_run(url, nodes, expected, timeout))
+    finally:
+        server.terminate()
+        server.join()
+
+    if report["killed"]:
+        node_id, programs = report["killed"]
+        print(f"Killed {node_id} ({programs} programs) at {KILL_AT:.0%} of the mints")
+    print(f"{'nodes joined in':<18} {report['joined_s']:>8.2f} s")
+    print(f"{'finished in':<18} {report.get('seconds', float('nan')):>8.2f} s")
+    print(f"{'membership epochs':<18} {report['epochs']:>8}")
+    print(f"{'mints reported':<18} {report['unique']:>8} / {report['expected']}")
+    print(f"{'duplicates':<18} {report['duplicates']:>8}")
+    passed = report["unique"] == report["expected"] and not report["duplicates"]
+    print("PASS" if passed else "FAIL")
+    return passed
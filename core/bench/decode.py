@@ -0,0 +1,71 @@
+import json
+import time
+from typing import Dict, List, Optional
+
+from core.detector.detector import MintDetector
+from core.engines.engine import get_engine
+from core.mock.mock_rpc import synthetic_frames
+from constants.constants import BENCH_MESSAGES, BENCH_MINT_RATIO, BATCH_MAX_FRAMES, SPL_TOKEN_PROGRAM_ID
+
+ROUNDS = 3  # Best of
+
+
+def _encoded_frames(transport: str, frames: List[dict]) -> List:
+    if transport == "geyser":
+        from core.mock.mock_geyser import to_geyser_update
+
+        return [to_geyser_update(frame, [SPL_TOKEN_PROGRAM_ID]) for frame in frames]
+    return [json.dumps(frame) for frame in frames]
+
+
+def _best_us_per_frame(decode, count: int) -> float:
+    best = None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        decode()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None or elapsed < best else best
+    return best / count * 1e6
+
+
+def run_decode_bench(messages: int = BENCH_MESSAGES, transports: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Decode cost per event of each transport's wire format, without the
+    network: the same synthetic stream as logsNotification JSON text
+    (websockets engine) and as Geyser SubscribeUpdate protobuf (geyser
+    engine), decoded one frame at a time and in prefiltered batches.
+    """
+    frames = synthetic_frames(messages, BENCH_MINT_RATIO)
+    prefilter = MintDetector().markers
+    report = {}
+    print(f"Decoding {len(frames)} frames ({BENCH_MINT_RATIO:.0%} mints), best of {ROUNDS}")
+    print(f"{'transport':<12} {'bytes/frame':>11} {'us/frame':>9} {'us/frame batched':>17}")
+    for name in transports or ["websockets", "geyser"]:
+        try:
+            engine = get_engine(name)([SPL_TOKEN_PROGRAM_ID])
+            encoded = _encoded_frames(name, frames)
+        except ImportError as e:
+            print(f"{name:<12} skipped ({e})")
+            continue
+        decode = engine.decode
+        batches = [encoded[i:i + BATCH_MAX_FRAMES] for i in range(0, len(encoded), BATCH_MAX_FRAMES)]
+
+        def one_at_a_time():
+            for raw in encoded:
+                decode(raw)
+
+        def batched():
+            for batch in batches:
+                engine.decode_batch(batch, prefilter)
+
+        report[name] = {
+            "bytes_per_frame": sum(len(raw) for raw in encoded) / len(encoded),
+            "us_per_frame": _best_us_per_frame(one_at_a_time, len(encoded)),
+            "us_per_frame_batched": _best_us_per_frame(batched, len(encoded)),
+        }
+        result = report[name]
+        print(
+            f"{name:<12} {result['bytes_per_frame']:>11.0f} {result['us_per_frame']:>9.2f} "
+            f"{result['us_per_frame_batched']:>17.2f}"
+        )
+    return report
@@ -0,0 +1,136 @@
+import asyncio
+import contextlib
+import multiprocessing
+import time
+from typing import Dict, List, Optional
+
+from core.engines.engine import engine_names, get_engine
+from core.mock.mock_geyser import serve_geyser_forever
+from core.mock.mock_rpc import SENT_AT_PREFIX, load_recording, serve_forever, synthetic_frames
+from core.pipeline.pipeline import Pipeline
+from constants.constants import BENCH_MESSAGES, BENCH_MINT_RATIO, SPL_TOKEN_PROGRAM_ID
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def _run_engine(name: str, url: str, expected: int, timeout: float, batch: int = 1, **options) -> Dict[str, float]:
+    engine = get_engine(name)([SPL_TOKEN_PROGRAM_ID], rpc_ws_url=url, reconnect_delay=1, **options)
+    pipeline = Pipeline()
+    latencies: List[float] = []
+    done = asyncio.Event()
+
+    def record(events):
+        now = time.monotonic()
+        for event in events:
+            marker = event.logs[-1]
+            if marker.startswith(SENT_AT_PREFIX):
+                latencies.append(now - float(marker[len(SENT_AT_PREFIX):]))
+
+    async def consume():
+        # aclosing: leaving the loop early must close the connection here,
+        # not from the loop's async-generator finalizer at shutdown
+        if batch > 1:
+            # No prefilter: every frame is decoded so latency covers all of them
+            async with contextlib.aclosing(engine.batches(batch)) as batches:
+                async for events in batches:
+                    pipeline.process_batch(events)
+                    record(events)
+                    if pipeline.processed >= expected:
+                        done.set()
+                        return
+        async with contextlib.aclosing(engine.notifications()) as notifications:
+            async for event in notifications:
+                pipeline.process(event)
+                record((event,))
+                if pipeline.processed >= expected:
+                    done.set()
+                    return
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    task = asyncio.create_task(consume())
+    try:
+        await asyncio.wait_for(done.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    processed = pipeline.processed
+    if not processed:
+        return {"messages": 0}
+    return {
+        "messages": processed,
+        "msgs_per_s": processed / wall,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "cpu_us_per_msg": cpu / processed * 1e6,
+    }
+
+
+def run_engine_bench(
+    engines: Optional[List[str]] = None,
+    messages: int = BENCH_MESSAGES,
+    rate: Optional[float] = None,
+    recording: Optional[str] = None,
+    timeout: float = 120.0,
+    batch: int = 1,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Replay the same stream to each engine over a loopback mock RPC and compare.
+
+    The mock servers (WebSocket, and gRPC for the geyser engine) run in
+    child processes, so CPU time per message only counts the engine's
+    receive, decode and the shared pipeline.
+
+    :param rate: Frames per second to replay at (None = as fast as possible).
+    :param recording: Captured frames to replay instead of a synthetic stream.
+    :param batch: Drain and decode up to this many frames at a time (1 = per frame).
+    """
+    frames = load_recording(recording) if recording else synthetic_frames(messages, BENCH_MINT_RATIO)
+    engines = engines or engine_names()
+
+    ctx = multiprocessing.get_context("spawn")
+    port_queue = ctx.Queue()
+    server = ctx.Process(target=serve_forever, args=(frames, rate, port_queue), daemon=True)
+    server.start()
+    url = f"ws://127.0.0.1:{port_queue.get(timeout=30)}"
+    servers = [server]
+    options = {name: {} for name in engines}
+    if "geyser" in engines:
+        geyser = ctx.Process(target=serve_geyser_forever, args=(frames, rate, port_queue), daemon=True)
+        geyser.start()
+        servers.append(geyser)
+        options["geyser"]["geyser_url"] = f"http://127.0.0.1:{port_queue.get(timeout=30)}"
+
+    report = {}
+    try:
+        print(
+            f"Replaying {len(frames)} frames ({'max rate' if not rate else f'{rate:g}/s'}, "
+            f"batch {batch}) from {url}"
+        )
+        print(f"{'engine':<12} {'msgs':>8} {'msgs/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'cpu us/msg':>11}")
+        for name in engines:
+            try:
+                result = asyncio.run(_run_engine(name, url, len(frames), timeout, batch, **options[name]))
+            except ImportError as e:
+                print(f"{name:<12} skipped ({e})")
+                continue
+            report[name] = result
+            if not result["messages"]:
+                print(f"{name:<12} {'no messages received':>8}")
+                continue
+            print(
+                f"{name:<12} {result['messages']:>8} {result['msgs_per_s']:>10.0f} "
+                f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['cpu_us_per_msg']:>11.1f}"
+            )
+    finally:
+        for process in servers:
+            process.terminate()
+            process.join()
+    return report
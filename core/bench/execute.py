@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from typing import Any, Dict, List
+
+from core.bench.scan import _serve
+from core.execution.execution import Executor, create_ata_template
+from core.mock.mock_http import MockHttpRpc
+from constants.constants import BENCH_EXECUTE_MINTS
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def _execute(url: str, payer, mints: List[str]) -> List[Dict[str, Any]]:
+    events: List[Dict[str, Any]] = []
+    executor = Executor(create_ata_template(payer), events.append, submit_urls=[url], rpc_http_url=url)
+    await executor.start()
+    try:
+        await asyncio.gather(*(executor.execute(mint) for mint in mints))
+    finally:
+        await executor.stop()
+    return events
+
+
+def _check(raw: bytes, payer, blockhashes: set) -> str:
+    """The mint a submitted transaction opens a token account for; raises if it is not a valid create-ata."""
+    from solders.transaction import Transaction
+    from spl.token.instructions import get_associated_token_address
+
+    transaction = Transaction.from_bytes(raw)
+    transaction.verify()  # Signed by the payer over the patched message
+    message = transaction.message
+    if str(message.recent_blockhash) not in blockhashes:
+        raise ValueError(f"unknown blockhash {message.recent_blockhash}")
+    keys = message.account_keys
+    instruction = message.instructions[-1]
+    token_account, mint = keys[instruction.accounts[1]], keys[instruction.accounts[3]]
+    if token_account != get_associated_token_address(payer.pubkey(), mint):
+        raise ValueError(f"token account {token_account} is not the payer's for {mint}")
+    return str(mint)
+
+
+def run_execute_bench(mints: int = BENCH_EXECUTE_MINTS) -> bool:
+    """
+    Execute the create-ata template for `mints` fresh mints against a local
+    MockHttpRpc, then decode every transaction it received: each must carry
+    a valid payer signature, a blockhash the mock handed out and the
+    payer's token account for its mint, and every mint must be sent exactly
+    once. Reports build and submit latency.
+    """
+    from solders.keypair import Keypair
+
+    payer = Keypair()
+    wanted = [str(Keypair().pubkey()) for _ in range(mints)]
+    server = MockHttpRpc()
+    ready, stop = threading.Event(), []
+    thread = threading.Thread(target=_serve, args=(server, ready, stop), daemon=True)
+    thread.start()
+    ready.wait()
+    try:
+        events = asyncio.run(_execute(server.url, payer, wanted))
+    finally:
+        loop, event = stop[0]
+        loop.call_soon_threadsafe(event.set)
+        thread.join()
+
+    failed = [event for event in events if "error" in event]
+    blockhashes = {server.blockhash(slot) for slot in range(server.start_slot, server.slot + 1)}
+    sent, invalid = [], 0
+    for raw in server.transactions:
+        try:
+            sent.append(_check(raw, payer, blockhashes))
+        except Exception as e:
+            invalid += 1
+            print(f"  invalid transaction: {e}")
+    builds = [event["build_us"] for event in events if "build_us" in event]
+    submits = [event["submit_ms"] for event in events if "submit_ms" in event]
+    queued = [event["queue_ms"] for event in events if "queue_ms" in event]
+    if builds:
+        print(
+            f"Executed {len(builds)} mints: build p50 {_percentile(builds, 0.5)}us p99 {_percentile(builds, 0.99)}us, "
+            f"submit p50 {_percentile(submits, 0.5)}ms p99 {_percentile(submits, 0.99)}ms, "
+            f"queued p50 {_percentile(queued, 0.5)}ms p99 {_percentile(queued, 0.99)}ms"
+        )
+    passed = not failed and not invalid and sorted(sent) == sorted(wanted)
+    print(
+        f"Transactions: {len(sent)}/{mints} valid, {invalid} invalid, {len(failed)} failed, "
+        f"{len(sent) - len(set(sent))} duplicates: {'PASS' if passed else 'FAIL'}"
+    )
+    return passed
@@ -0,0 +1,127 @@
+import asyncio
+import queue
+import threading
+import time
+from typing import Dict, List
+
+from core.runtime.runtime import new_event_loop
+
+SWITCH_TASKS = 100
+SWITCH_ROUNDS = 1_000
+HANDOFF_ITEMS = 5_000
+HANDOFF_INTERVAL = 0.0002   # Seconds between produced items
+TIMER_SAMPLES = 1_000
+TIMER_INTERVAL = 0.001
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    pick = lambda fraction: ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] * 1e6
+    return {"p50_us": pick(0.50), "p99_us": pick(0.99), "max_us": ordered[-1] * 1e6}
+
+
+async def _background_load(stop: asyncio.Event) -> None:
+    """Stand-in for decode work: short CPU bursts between yields."""
+    while not stop.is_set():
+        sum(range(200))
+        await asyncio.sleep(0)
+
+
+async def _switch_overhead() -> float:
+    """Microseconds per task switch (await sleep(0) across many tasks)."""
+    async def spin():
+        for _ in range(SWITCH_ROUNDS):
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(spin() for _ in range(SWITCH_TASKS)))
+    return (time.perf_counter() - start) / (SWITCH_TASKS * SWITCH_ROUNDS) * 1e6
+
+
+async def _same_loop_handoff() -> List[float]:
+    """Reader -> worker latency through an asyncio.Queue on one loop."""
+    inbox: asyncio.Queue = asyncio.Queue()
+    latencies: List[float] = []
+
+    async def worker():
+        for _ in range(HANDOFF_ITEMS):
+            sent = await inbox.get()
+            latencies.append(time.perf_counter() - sent)
+
+    consumer = asyncio.create_task(worker())
+    for _ in range(HANDOFF_ITEMS):
+        inbox.put_nowait(time.perf_counter())
+        await asyncio.sleep(HANDOFF_INTERVAL)
+    await consumer
+    return latencies
+
+
+async def _cross_thread_handoff() -> List[float]:
+    """The old layout: loop thread -> queue.Queue -> worker thread."""
+    inbox: "queue.Queue" = queue.Queue()
+    latencies: List[float] = []
+
+    def worker():
+        for _ in range(HANDOFF_ITEMS):
+            sent = inbox.get()
+            latencies.append(time.perf_counter() - sent)
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    for _ in range(HANDOFF_ITEMS):
+        inbox.put(time.perf_counter())
+        await asyncio.sleep(HANDOFF_INTERVAL)
+    await asyncio.get_running_loop().run_in_executor(None, thread.join)
+    return latencies
+
+
+async def _timer_lateness() -> List[float]:
+    lateness = []
+    for _ in range(TIMER_SAMPLES):
+        start = time.perf_counter()
+        await asyncio.sleep(TIMER_INTERVAL)
+        lateness.append(time.perf_counter() - start - TIMER_INTERVAL)
+    return lateness
+
+
+async def _measure() -> Dict[str, Dict[str, float]]:
+    results = {"switch": {"us_per_switch": await _switch_overhead()}}
+    stop = asyncio.Event()
+    load = [asyncio.create_task(_background_load(stop)) for _ in range(10)]
+    try:
+        results["handoff_same_loop"] = _percentiles(await _same_loop_handoff())
+        results["handoff_cross_thread"] = _percentiles(await _cross_thread_handoff())
+        results["timer_lateness"] = _percentiles(await _timer_lateness())
+    finally:
+        stop.set()
+        await asyncio.gather(*load)
+    return results
+
+
+def run_loop_bench() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Compare loop overhead and tail latency for asyncio and (if installed) uvloop.
+
+    Measures raw task-switch cost, then, under background load, the latency
+    of handing work to a coroutine on the same loop versus to a thread via
+    queue.Queue (the old daemon-thread layout), and timer lateness.
+    """
+    report = {}
+    for name, use_uvloop in (("asyncio", False), ("uvloop", True)):
+        loop = new_event_loop(use_uvloop)
+        if use_uvloop and type(loop).__module__.startswith("asyncio"):
+            loop.close()
+            print("uvloop: not installed, skipped")
+            continue
+        try:
+            report[name] = loop.run_until_complete(_measure())
+        finally:
+            loop.close()
+
+    print(f"{'loop':<8} {'metric':<22} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    for name, results in report.items():
+        print(f"{name:<8} {'task switch':<22} {results['switch']['us_per_switch']:>9.2f}")
+        for metric in ("handoff_same_loop", "handoff_cross_thread", "timer_lateness"):
+            row = results[metric]
+            print(f"{name:<8} {metric:<22} {row['p50_us']:>9.1f} {row['p99_us']:>9.1f} {row['max_us']:>9.1f}")
+    return report
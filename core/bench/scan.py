@@ -0,0 +1,112 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict
+
+from core.mock.mock_http import MockHttpRpc, synthetic_blocks
+from core.mock.mock_rpc import synthetic_frames
+from core.pipeline.pipeline import Pipeline
+from core.scan.scan import Scanner
+from core.sinks.sinks import Sink
+from constants.constants import BENCH_MINT_RATIO, BENCH_SCAN_SLOTS, SCAN_CONCURRENCY, SPL_TOKEN_PROGRAM_ID
+
+FRAMES_PER_SLOT = 10        # synthetic_frames moves to the next slot every ~10 frames
+SKIP_EVERY = 17             # Every Nth slot has no block
+INTERRUPT_AT = 0.5          # Share of the range scanned before the first run is cancelled
+RATE_LIMIT = 100_000        # Effectively unlimited: measure the scanner, not the limiter
+
+
+class _Collector(Sink):
+    def __init__(self):
+        self.detections: Counter = Counter()
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        if event.get("type") == "detection":
+            self.detections[(event["signature"], event["mint"])] += 1
+
+
+def _serve(server: MockHttpRpc, ready: threading.Event, stop: list) -> None:
+    """Run the mock on a loop of its own, so it does not compete with the scanner's."""
+    async def run():
+        await server.start()
+        stop.append((asyncio.get_running_loop(), asyncio.Event()))
+        ready.set()
+        await stop[0][1].wait()
+        await server.stop()
+
+    asyncio.run(run())
+
+
+async def _scan(url: str, start: int, end: int, checkpoint: str, collector: _Collector, interrupt_at=None) -> Dict[str, Any]:
+    pipeline = Pipeline(sinks=[collector])  # A fresh one per run, as after a restart
+    scanner = Scanner(
+        pipeline,
+        start,
+        end,
+        [SPL_TOKEN_PROGRAM_ID],
+        rpc_http_url=url,
+        concurrency=SCAN_CONCURRENCY,
+        rate_limit=RATE_LIMIT,
+        checkpoint_path=checkpoint,
+    )
+    await pipeline.start()
+    task = asyncio.create_task(scanner.run())
+    started = time.monotonic()
+    if interrupt_at is not None:
+        while not task.done() and scanner.checkpoint.finished < interrupt_at:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        report = scanner.report(time.monotonic() - started)
+    else:
+        report = await task
+    await pipeline.stop()
+    return report
+
+
+def run_scan_bench(slots: int = BENCH_SCAN_SLOTS) -> bool:
+    """
+    Scan `slots` slots of synthetic blocks from a local MockHttpRpc (every
+    SKIP_EVERY-th slot skipped), cancel the scan halfway, resume it from its
+    checkpoint with a fresh pipeline, and check that every mint was
+    detected exactly once. Reports slots/s.
+    """
+    frames = synthetic_frames(slots * FRAMES_PER_SLOT, BENCH_MINT_RATIO)
+    start = frames[0]["params"]["result"]["context"]["slot"]
+    end = start + slots - 1
+    skipped = {slot for slot in range(start, end + 1) if (slot - start) % SKIP_EVERY == SKIP_EVERY - 1}
+    blocks = {slot: block for slot, block in synthetic_blocks(frames, skipped).items() if slot <= end}
+    expected = sum(
+        1 for block in blocks.values() for transaction in block["transactions"]
+        if any("InitializeMint" in line for line in transaction["meta"]["logMessages"])
+    )
+
+    server = MockHttpRpc(blocks=blocks)
+    ready, stop = threading.Event(), []
+    thread = threading.Thread(target=_serve, args=(server, ready, stop), daemon=True)
+    thread.start()
+    ready.wait()
+    collector = _Collector()
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint = os.path.join(directory, "scan.checkpoint")
+        print(f"Scanning slots {start}-{end} ({len(blocks)} blocks, {len(skipped)} skipped, {expected} mints)")
+        first = asyncio.run(_scan(server.url, start, end, checkpoint, collector, interrupt_at=int(slots * INTERRUPT_AT)))
+        print(f"  interrupted after {first['slots']} slots ({first['slots_per_second']} slots/s)")
+        second = asyncio.run(_scan(server.url, start, end, checkpoint, collector))
+        print(f"  resumed: {second['slots']} slots in {second['seconds']}s ({second['slots_per_second']} slots/s)")
+    loop, event = stop[0]
+    loop.call_soon_threadsafe(event.set)
+    thread.join()
+
+    duplicates = sum(count - 1 for count in collector.detections.values() if count > 1)
+    found = len(collector.detections)
+    scanned = first["slots"] + second["slots"]
+    passed = found == expected and duplicates == 0 and second["complete"] and scanned == slots
+    print(
+        f"Detections: {found}/{expected}, {duplicates} duplicates, {scanned}/{slots} slots scanned once "
+        f"({second['skipped'] + first['skipped']} skipped): {'PASS' if passed else 'FAIL'}"
+    )
+    return passed
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Optional
+
+from core.engines.websockets_engine import WebsocketsEngine
+from core.mock.mock_rpc import synthetic_frames
+from core.pipeline.pipeline import Pipeline
+from core.runtime.runtime import new_event_loop
+from constants.constants import BENCH_MINT_RATIO, SPL_TOKEN_PROGRAM_ID, SOAK_RATE, SOAK_MAX_GROWTH_MB
+
+CHUNK = 10_000              # Frames generated at a time (each chunk has fresh signatures and mints)
+SAMPLES = 20                # Memory samples over the run
+WARMUP_FRACTION = 0.2       # Bounded structures fill up during this share of the run
+TOP_ALLOCATORS = 10
+# Bounds scaled down so every structure is saturated well within the warm-up
+SOAK_BOUNDS = {"max_mints": 2_000, "max_queued": 500, "max_pending": 2_000}
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux /proc, else peak RSS from getrusage)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _build_pipeline(db_path: str) -> Pipeline:
+    """Every long-lived stage, without anything that needs the network."""
+    from core.confirmation.confirmation import ConfirmationTracker
+    from core.correlation.correlation import PoolCorrelator
+    from core.enrichment.enrichment import Enricher
+    from core.overload.overload import OverloadController
+    from core.sinks.sinks import StoreSink
+
+    pipeline = Pipeline(sinks=[StoreSink(db_path)], parse_instructions=True)
+    pipeline.correlator = PoolCorrelator(on_match=pipeline.on_pool_created, max_mints=SOAK_BOUNDS["max_mints"])
+    # No workers: submissions pile up against the scheduler's bound
+    pipeline.enricher = Enricher(pipeline.emit, workers=0, max_queued=SOAK_BOUNDS["max_queued"])
+    # Never polled: tracked signatures pile up against the tracker's bound
+    pipeline.confirmer = ConfirmationTracker(pipeline.on_status, max_pending=SOAK_BOUNDS["max_pending"])
+    pipeline.overload = OverloadController(pipeline)
+    return pipeline
+
+
+async def _soak(messages: int, warmup: int, db_path: str):
+    """Returns the memory samples and tracemalloc snapshots after warm-up and at the end."""
+    pipeline = _build_pipeline(db_path)
+    # Only what start() needs to run offline: sinks, enricher, overload controller
+    for sink in pipeline.sinks:
+        await sink.start()
+    await pipeline.enricher.start()
+    overload = asyncio.create_task(pipeline.overload.run())
+    engine = WebsocketsEngine([SPL_TOKEN_PROGRAM_ID])
+
+    samples = []
+    baseline = None
+    sample_every = max(messages // SAMPLES, 1)
+    processed = 0
+    started = time.perf_counter()
+    try:
+        while processed < messages:
+            count = min(CHUNK, messages - processed)
+            frames = synthetic_frames(count, BENCH_MINT_RATIO, seed=processed, start_slot=250_000_000 + processed)
+            for frame in frames:
+                event = engine.decode(json.dumps(frame))
+                pipeline.process(event)
+                processed += 1
+                if processed % sample_every == 0:
+                    traced, _peak = tracemalloc.get_traced_memory()
+                    samples.append({
+                        "messages": processed,
+                        "hours": processed / SOAK_RATE / 3600,
+                        "rss_mb": rss_bytes() / 2**20,
+                        "traced_mb": traced / 2**20,
+                        "elapsed_s": time.perf_counter() - started,
+                    })
+            del frames
+            if baseline is None and processed >= warmup:
+                baseline = tracemalloc.take_snapshot()
+            await asyncio.sleep(0)  # Let the store and overload controller run
+    finally:
+        overload.cancel()
+        await asyncio.gather(overload, return_exceptions=True)
+        await pipeline.enricher.stop()
+        for sink in pipeline.sinks:
+            await sink.close()
+    return samples, baseline, tracemalloc.take_snapshot()
+
+
+def run_soak_bench(
+    hours: float = 1.0,
+    messages: Optional[int] = None,
+    max_growth_mb: float = SOAK_MAX_GROWTH_MB,
+) -> bool:
+    """
+    Replay a synthetic stream through every long-lived pipeline structure as
+    fast as possible and check that memory stays flat.
+
+    `hours` of live traffic (at SOAK_RATE notifications/s) are simulated
+    unless `messages` is given. Memory after the warm-up is the baseline;
+    the run fails if RSS at the end is more than `max_growth_mb` above it.
+    The biggest allocation growth sites (tracemalloc) are printed either way.
+
+    :return: True if memory stayed within bounds.
+    """
+    messages = messages or int(hours * SOAK_RATE * 3600)
+    warmup = max(int(messages * WARMUP_FRACTION), 1)
+    print(f"Soaking {messages} messages (~{messages / SOAK_RATE / 3600:.1f}h at {SOAK_RATE}/s), warm-up {warmup}")
+
+    tracemalloc.start(1)
+    loop = new_event_loop()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            samples, baseline, final = loop.run_until_complete(_soak(messages, warmup, os.path.join(tmp, "soak.db")))
+    finally:
+        loop.close()
+        tracemalloc.stop()
+
+    print(f"{'messages':>10} {'sim hours':>10} {'rss MB':>8} {'traced MB':>10} {'elapsed s':>10}")
+    for sample in samples:
+        print(
+            f"{sample['messages']:>10} {sample['hours']:>10.2f} {sample['rss_mb']:>8.1f} "
+            f"{sample['traced_mb']:>10.1f} {sample['elapsed_s']:>10.1f}"
+        )
+
+    if baseline is not None:
+        print(f"Top {TOP_ALLOCATORS} allocation growth sites since warm-up:")
+        for stat in final.compare_to(baseline, "lineno")[:TOP_ALLOCATORS]:
+            print(f"  {stat}")
+
+    after_warmup = [sample for sample in samples if sample["messages"] >= warmup]
+    if len(after_warmup) < 2:
+        print("Too few samples after warm-up to judge growth; run more messages.")
+        return True
+    growth = after_warmup[-1]["rss_mb"] - after_warmup[0]["rss_mb"]
+    passed = growth <= max_growth_mb
+    print(f"RSS growth after warm-up: {growth:+.1f} MB (limit {max_growth_mb} MB): {'PASS' if passed else 'FAIL'}")
+    return passed
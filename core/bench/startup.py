@@ -0,0 +1,99 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from constants.constants import BENCH_STARTUP_RUNS
+
+# What a restarted sniffer imports before it can subscribe, plus the heavy
+# third-party modules that used to be imported eagerly, for comparison.
+STARTUP_MODULES = [
+    "constants.constants",
+    "core.logs.logs",
+    "core.cli.cli",
+    "core.threads.pool_threads",
+    "core.storage.storage",
+    "core.server.server",
+    "core.correlation.correlation",
+]
+REFERENCE_MODULES = [
+    "colorama",
+    "requests",
+    "websockets",
+    "solders.pubkey",
+    "solana.rpc.async_api",
+]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _time_import(module: str, runs: int) -> List[float]:
+    """Wall-clock milliseconds for a fresh interpreter to import `module`."""
+    samples = []
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", f"import {module}"],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            return []
+        samples.append(elapsed)
+    return samples
+
+
+def _heaviest_imports(module: str, top: int = 5) -> List[Tuple[int, str]]:
+    """Largest cumulative import times (microseconds) from `python -X importtime`."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        entries.append((int(parts[1]), parts[2].strip()))
+    entries.sort(reverse=True)
+    return entries[:top]
+
+
+def run_startup_bench(runs: int = BENCH_STARTUP_RUNS) -> Dict[str, Dict[str, float]]:
+    """
+    Measure cold import time of the sniffer's startup path.
+
+    Each module is imported in a fresh interpreter `runs` times; the bare
+    interpreter start-up is measured the same way and subtracted.
+    """
+    baseline = statistics.median(_time_import("sys", runs))
+    print(f"Interpreter start-up: {baseline:.1f} ms (subtracted below)")
+    print(f"{'module':<32} {'median ms':>10} {'min ms':>8}")
+
+    report = {}
+    for module in STARTUP_MODULES + REFERENCE_MODULES:
+        samples = _time_import(module, runs)
+        if not samples:
+            print(f"{module:<32} {'not installed':>10}")
+            continue
+        median = statistics.median(samples) - baseline
+        minimum = min(samples) - baseline
+        report[module] = {"median_ms": median, "min_ms": minimum}
+        print(f"{module:<32} {median:>10.1f} {minimum:>8.1f}")
+
+    print("\nHeaviest imports on the CLI path:")
+    for cumulative, name in _heaviest_imports("core.cli.cli"):
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+    return report
@@ -0,0 +1,670 @@
+import argparse
+import asyncio
+from typing import List, Optional
+
+# Only stdlib and our own light modules are imported here. Subcommands import
+# what they need when they run, so `solsniff run` reaches its subscription
+# without paying for tooling it never uses.
+from core.engines.engine import engine_names
+from core.storage.storage import build_query_parser
+from constants.constants import (
+    RPC_HTTP_URL,
+    RPC_WS_URL,
+    RECONNECT_DELAY,
+    SPL_TOKEN_PROGRAM_ID,
+    RAYDIUM_AMM_PROGRAM_ID,
+    DEFAULT_ENGINE,
+    GEYSER_URL,
+    GEYSER_X_TOKEN,
+    LOGS_COMMITMENT,
+    ENRICHMENT_DEADLINE,
+    ENRICHMENT_EXPIRED_POLICY,
+    ENRICHMENT_LOOKUP_DEADLINE,
+    WATCHED_AUTHORITIES,
+    FANOUT_HOST,
+    FANOUT_PORT,
+    FANOUT_SLOW_POLICY,
+    METRICS_REPORT_INTERVAL,
+    STORAGE_DB_PATH,
+    STATE_PATH,
+    SHUTDOWN_DRAIN_TIMEOUT,
+    USE_UVLOOP,
+    SHM_WORKERS,
+    BENCH_STARTUP_RUNS,
+    BENCH_MESSAGES,
+    BATCH_MAX_FRAMES,
+    INBOX_MAX_FRAMES,
+    INBOX_OVERFLOW_POLICY,
+    SOAK_MAX_GROWTH_MB,
+    CLUSTER_HOST,
+    CLUSTER_PORT,
+    BENCH_CLUSTER_NODES,
+    TRACKING_MAX_MINTS,
+    TRACKING_MAX_AGE,
+    REORDER_MAX_DELAY,
+    SCAN_CONCURRENCY,
+    SCAN_RATE_LIMIT,
+    SCAN_CHECKPOINT_PATH,
+    BENCH_SCAN_SLOTS,
+    BENCH_EXECUTE_MINTS,
+)
+
+
+###############################################################################
+# Subcommands
+###############################################################################
+def build_pipeline(args: argparse.Namespace):
+    """Assemble sinks, enrichment and correlation from the shared options."""
+    from core.pipeline.pipeline import Pipeline
+    from core.sinks.sinks import LogSink, StoreSink, FanoutSink
+
+    sinks = [LogSink()]
+    if args.db:
+        sinks.append(StoreSink(args.db))
+    if args.fanout:
+        sinks.append(FanoutSink(
+            host=args.fanout_host,
+            port=args.fanout_port,
+            socket_path=args.fanout_socket,
+            policy=args.fanout_policy,
+        ))
+    activity = None
+    if args.hot_mints:
+        from core.activity.activity import TransferActivity
+
+        activity = TransferActivity()
+    pipeline = Pipeline(
+        sinks=sinks,
+        parse_instructions=args.parse_instructions,
+        activity=activity,
+        rpc_ws_url=args.rpc_ws_url,
+        rpc_http_url=args.rpc_http_url,
+        metrics_interval=args.metrics_interval,
+    )
+    if args.confirm:
+        from core.confirmation.confirmation import ConfirmationTracker
+
+        pipeline.confirmer = ConfirmationTracker(
+            pipeline.on_status,
+            rpc_http_url=args.rpc_http_url,
+            target=args.confirm,
+        )
+
+    if args.enrich:
+        pipeline.enricher = build_enricher(args, pipeline.emit)
+    if args.execute:
+        from core.execution.execution import TEMPLATES, Executor, load_keypair
+        from core.sinks.sinks import ExecutionSink
+
+        template = TEMPLATES[args.execute](load_keypair(args.keypair))
+        pipeline.sinks.append(ExecutionSink(Executor(
+            template,
+            pipeline.emit,
+            submit_urls=args.submit_url or [args.rpc_http_url],
+            rpc_http_url=args.rpc_http_url,
+        )))
+    if args.shed:
+        from core.overload.overload import OverloadController
+
+        pipeline.overload = OverloadController(pipeline)
+    if args.correlate:
+        from core.correlation.correlation import PoolCorrelator
+
+        pipeline.correlator = PoolCorrelator(on_match=pipeline.on_pool_created)
+    if args.track:
+        from core.tracking.tracking import MintTracker
+
+        pipeline.tracker = MintTracker(
+            pipeline.emit,
+            rpc_ws_url=args.rpc_ws_url,
+            max_tracked=args.track_max,
+            max_age=args.track_max_age,
+        )
+    if args.filter or args.filter_file:
+        from core.filters.filters import FilterSet, Rule
+
+        rules = [Rule(f"filter{i}", text) for i, text in enumerate(args.filter or [], start=1)]
+        pipeline.filters = FilterSet(rules, path=args.filter_file, emit_undecided=args.filter_emit_undecided)
+    return pipeline
+
+
+def build_enricher(args: argparse.Namespace, emit):
+    from core.enrichment.enrichment import Enricher
+
+    return Enricher(
+        emit,
+        rpc_http_url=args.rpc_http_url,
+        check_dex=args.dex,
+        deadline=args.enrich_deadline,
+        expired_policy=args.enrich_expired,
+        watched_authorities=args.watch_authority,
+        lookup_deadline=args.lookup_deadline,
+    )
+
+
+def engine_options(args: argparse.Namespace) -> dict:
+    """Constructor arguments only some engines take."""
+    if args.engine == "geyser":
+        return {"geyser_url": args.geyser_url, "x_token": args.geyser_token}
+    return {}
+
+
+async def _run_sniffer(args: argparse.Namespace) -> None:
+    from core.threads.pool_threads import SolanaSniffer
+
+    if args.join:
+        await _run_node(args)
+        return
+    pipeline = build_pipeline(args)
+    if args.reorder:
+        from core.reorder.reorder import ReorderBuffer
+
+        pipeline.reorder = ReorderBuffer(
+            pipeline.process_ordered,
+            max_delay=args.reorder_delay,
+            rpc_ws_url=args.rpc_ws_url if args.slot_watermark else None,
+            commitment=args.commitment,
+        )
+    await pipeline.start()
+    if args.state:
+        from core.snapshot.snapshot import restore_state
+
+        restore_state(pipeline, args.state)
+    workers = None
+    tasks = []
+    if args.workers:
+        from core.shm.workers import WorkerPool
+
+        workers = WorkerPool(args.workers, args.program)
+        workers.start()
+        tasks.append(asyncio.create_task(workers.collect(pipeline.dispatch)))
+    sniffer = SolanaSniffer(
+        rpc_ws_url=args.rpc_ws_url,
+        reconnect_delay=RECONNECT_DELAY,
+        engine=args.engine,
+        pipeline=pipeline,
+        commitment=args.commitment,
+        workers=workers,
+        batch=args.batch,
+        inbox_size=args.inbox,
+        overflow_policy=args.inbox_overflow,
+        engine_options=engine_options(args),
+    )
+    for program_id in args.program:
+        sniffer.add_sniffer(program_id)
+    try:
+        await asyncio.gather(*sniffer.tasks.values(), *tasks)
+    finally:
+        try:
+            await sniffer.stop_all()
+            for task in tasks:
+                task.cancel()
+            if workers is not None:
+                workers.stop(pipeline.dispatch)
+            await pipeline.drain(args.drain_timeout)
+        finally:
+            # Stop first so nothing changes under the snapshot; in-flight
+            # enrichment is still listed and gets re-queued on restart
+            await pipeline.stop()
+            if args.state:
+                from core.snapshot.snapshot import save_state
+
+                save_state(pipeline, args.state)
+
+
+async def _run_node(args: argparse.Namespace) -> None:
+    """Sniff whatever the coordinator at --join assigns and send it everything found."""
+    from core.cluster.cluster import ClusterNode
+    from core.pipeline.pipeline import Pipeline
+    from core.sinks.sinks import ClusterSink
+    from core.threads.pool_threads import SolanaSniffer
+
+    host, _, port = args.join.rpartition(":")
+    node = ClusterNode(host or CLUSTER_HOST, int(port), node_id=args.node_id)
+    activity = None
+    if args.hot_mints:
+        from core.activity.activity import TransferActivity
+
+        activity = TransferActivity()
+    # Correlation, confirmation and state belong to the coordinator; a node
+    # only detects, parses and enriches the mints routed to it
+    pipeline = Pipeline(sinks=[ClusterSink(node)], parse_instructions=args.parse_instructions, activity=activity)
+    node.enricher = build_enricher(args, node.forward)
+    node.sniffer = SolanaSniffer(
+        rpc_ws_url=args.rpc_ws_url,
+        reconnect_delay=RECONNECT_DELAY,
+        engine=args.engine,
+        pipeline=pipeline,
+        commitment=args.commitment,
+        batch=args.batch,
+        inbox_size=args.inbox,
+        overflow_policy=args.inbox_overflow,
+        engine_options=engine_options(args),
+    )
+    await pipeline.start()
+    await node.enricher.start()
+    try:
+        await node.run()
+    finally:
+        await node.sniffer.stop_all()
+        await node.enricher.stop()
+        await pipeline.stop()
+
+
+async def _run_coordinator(args: argparse.Namespace) -> None:
+    from core.cluster.cluster import Coordinator, RemoteEnricher
+
+    pipeline = build_pipeline(args)
+    coordinator = Coordinator(pipeline, args.program, host=args.listen_host, port=args.listen_port)
+    if args.enrich:
+        pipeline.enricher = RemoteEnricher(coordinator)
+    await pipeline.start()
+    if args.state:
+        from core.snapshot.snapshot import restore_state
+
+        restore_state(pipeline, args.state)
+    await coordinator.start()
+    try:
+        await asyncio.Event().wait()  # Until a stop signal cancels us
+    finally:
+        try:
+            await coordinator.stop()
+        finally:
+            await pipeline.stop()
+            if args.state:
+                from core.snapshot.snapshot import save_state
+
+                save_state(pipeline, args.state)
+
+
+async def _run_scan(args: argparse.Namespace) -> int:
+    from core.logs.logs import log_error
+    from core.scan.scan import Scanner
+
+    pipeline = build_pipeline(args)
+    try:
+        scanner = Scanner(
+            pipeline,
+            args.from_slot,
+            args.to_slot,
+            args.program,
+            rpc_http_url=args.rpc_http_url,
+            concurrency=args.concurrency,
+            rate_limit=args.rate,
+            checkpoint_path=args.checkpoint or None,
+        )
+    except ValueError as e:
+        log_error(str(e))
+        return 1
+    await pipeline.start()
+    try:
+        report = await scanner.run()
+    finally:
+        try:
+            await pipeline.drain(SHUTDOWN_DRAIN_TIMEOUT)
+        finally:
+            await pipeline.stop()
+    return 0 if report["complete"] else 1
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    from core.logs.logs import setup_logging, log_info
+    from core.runtime.runtime import Runtime
+
+    log_path = setup_logging(log_dir=args.log_dir)
+    if log_path:
+        log_info(f"Logging to file: {log_path}")
+    Runtime(use_uvloop=args.uvloop).run(_run_sniffer(args))
+    log_info("Exiting...")
+    return 0
+
+
+def cmd_coordinator(args: argparse.Namespace) -> int:
+    from core.logs.logs import setup_logging, log_info
+    from core.runtime.runtime import Runtime
+
+    log_path = setup_logging(log_dir=args.log_dir)
+    if log_path:
+        log_info(f"Logging to file: {log_path}")
+    Runtime(use_uvloop=args.uvloop).run(_run_coordinator(args))
+    log_info("Exiting...")
+    return 0
+
+
+def cmd_scan(args: argparse.Namespace) -> int:
+    from core.logs.logs import setup_logging, log_info
+    from core.runtime.runtime import Runtime
+
+    log_path = setup_logging(log_dir=args.log_dir)
+    if log_path:
+        log_info(f"Logging to file: {log_path}")
+    code = Runtime(use_uvloop=args.uvloop).run(_run_scan(args))
+    log_info("Exiting...")
+    return 1 if code is None else code  # None: interrupted (the checkpoint has been saved)
+
+
+def cmd_query(args: argparse.Namespace) -> int:
+    from core.storage.storage import run_query
+
+    return run_query(args)
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    if args.suite == "startup":
+        from core.bench.startup import run_startup_bench
+
+        run_startup_bench(runs=args.runs)
+    elif args.suite == "loop":
+        from core.bench.loop import run_loop_bench
+
+        run_loop_bench()
+    elif args.suite == "soak":
+        from core.bench.soak import run_soak_bench
+
+        passed = run_soak_bench(hours=args.hours, messages=args.soak_messages, max_growth_mb=args.max_growth_mb)
+        return 0 if passed else 1
+    elif args.suite == "engines":
+        from core.bench.engines import run_engine_bench
+
+        run_engine_bench(
+            engines=args.engine,
+            messages=args.messages,
+            rate=args.rate,
+            recording=args.recording,
+            batch=args.batch,
+        )
+    elif args.suite == "decode":
+        from core.bench.decode import run_decode_bench
+
+        run_decode_bench(messages=args.messages, transports=args.engine)
+    elif args.suite == "cluster":
+        from core.bench.cluster import run_cluster_bench
+
+        passed = run_cluster_bench(nodes=args.nodes, messages=args.messages, rate=args.rate)
+        return 0 if passed else 1
+    elif args.suite == "scan":
+        from core.bench.scan import run_scan_bench
+
+        passed = run_scan_bench(slots=args.slots)
+        return 0 if passed else 1
+    elif args.suite == "execute":
+        from core.bench.execute import run_execute_bench
+
+        passed = run_execute_bench(mints=args.mints)
+        return 0 if passed else 1
+    return 0
+
+
+###############################################################################
+# Argument Parsing
+###############################################################################
+def add_pipeline_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by every mode that runs the detection pipeline."""
+    parser.add_argument("--rpc-ws-url", default=RPC_WS_URL, help="RPC WebSocket endpoint")
+    parser.add_argument("--rpc-http-url", default=RPC_HTTP_URL, help="RPC HTTP endpoint (enrichment)")
+    parser.add_argument("--enrich", action="store_true", help="Look up on-chain info for detected mints")
+    parser.add_argument("--no-dex", dest="dex", action="store_false", help="Skip DEX listing checks when enriching")
+    parser.add_argument(
+        "--enrich-deadline",
+        type=float,
+        default=ENRICHMENT_DEADLINE,
+        help="Seconds a mint may wait for enrichment before it expires",
+    )
+    parser.add_argument(
+        "--enrich-expired",
+        default=ENRICHMENT_EXPIRED_POLICY,
+        choices=["drop", "downgrade"],
+        help="What to do with expired mints (downgrade = on-chain lookup only, marked stale)",
+    )
+    parser.add_argument(
+        "--lookup-deadline",
+        type=float,
+        default=ENRICHMENT_LOOKUP_DEADLINE,
+        help="Seconds to wait for a mint's lookups before emitting what has arrived (the rest follow as updates)",
+    )
+    parser.add_argument(
+        "--watch-authority",
+        action="append",
+        default=list(WATCHED_AUTHORITIES),
+        help="Enrich mints from this authority first (repeatable)",
+    )
+    parser.add_argument("--parse-instructions", action="store_true", help="Pass every log line to InstructionParser")
+    parser.add_argument(
+        "--hot-mints",
+        action="store_true",
+        help=(
+            "Report the most transferred mints from parsed instructions (implies --parse-instructions). "
+            "Logs carry no account lists: only lines that name their mint count, the rest are metric activity.unattributed"
+        ),
+    )
+    parser.add_argument(
+        "--no-shed",
+        dest="shed",
+        action="store_false",
+        help="Never shed logging, DEX checks or parsing under overload",
+    )
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=None,
+        metavar="EXPR",
+        help="Only report mints matching this rule, e.g. 'decimals == 6 and not mintable' (repeatable, any may match)",
+    )
+    parser.add_argument(
+        "--filter-file",
+        default=None,
+        help="Rules file, one per line as 'name: expression', reloaded when it changes",
+    )
+    parser.add_argument(
+        "--filter-emit-undecided",
+        action="store_true",
+        help="Emit detections no rule has decided on yet instead of holding them until one matches "
+        "(they are not retracted if the mint is rejected later)",
+    )
+    parser.add_argument("--db", default=STORAGE_DB_PATH, help="SQLite detection store ('' to disable)")
+    parser.add_argument("--fanout", action="store_true", help="Stream events to local subscribers")
+    parser.add_argument("--fanout-host", default=FANOUT_HOST)
+    parser.add_argument("--fanout-port", type=int, default=FANOUT_PORT)
+    parser.add_argument("--fanout-socket", default=None, help="Serve on this Unix socket instead of TCP")
+    parser.add_argument("--fanout-policy", default=FANOUT_SLOW_POLICY, choices=["drop", "coalesce", "disconnect"])
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=METRICS_REPORT_INTERVAL,
+        help="Seconds between counter/gauge snapshots to the log and fan-out subscribers (0 to disable)",
+    )
+
+
+def add_live_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options that act on the live chain (subscriptions, transactions): not for replaying the past."""
+    parser.add_argument("--correlate", action="store_true", help="Report Raydium pool launches for new mints")
+    parser.add_argument(
+        "--confirm",
+        choices=["confirmed", "finalized"],
+        default=None,
+        help="Subscribe at processed, then report each detection's confirmation or retraction",
+    )
+    parser.add_argument(
+        "--execute",
+        default=None,
+        choices=["create-ata"],
+        help="Sign and send this pre-built transaction for every detected mint (needs --keypair)",
+    )
+    parser.add_argument("--keypair", default=None, help="Solana CLI keypair file that pays for and signs --execute")
+    parser.add_argument(
+        "--submit-url",
+        action="append",
+        default=None,
+        help="Send --execute transactions to this RPC endpoint too (repeatable, default: --rpc-http-url)",
+    )
+    parser.add_argument(
+        "--track",
+        action="store_true",
+        help="Push supply and authority changes of detected mints (accountSubscribe, no polling)",
+    )
+    parser.add_argument("--track-max", type=int, default=TRACKING_MAX_MINTS, help="Mints tracked at once, least recent evicted")
+    parser.add_argument(
+        "--track-max-age",
+        type=float,
+        default=TRACKING_MAX_AGE,
+        help="Seconds a mint stays tracked after its detection",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="solsniff", description="Solana token creation event sniffer.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Sniff program logs")
+    run.add_argument("--engine", default=DEFAULT_ENGINE, choices=engine_names(), help="Transport engine")
+    run.add_argument(
+        "--program",
+        action="append",
+        default=None,
+        help="Program ID to sniff (repeatable, default: SPL Token and Raydium AMM)",
+    )
+    run.add_argument("--geyser-url", default=GEYSER_URL, help="Yellowstone gRPC endpoint (geyser engine)")
+    run.add_argument("--geyser-token", default=GEYSER_X_TOKEN, help="x-token for the gRPC endpoint (geyser engine)")
+    run.add_argument("--commitment", default=LOGS_COMMITMENT, choices=["processed", "confirmed", "finalized"])
+    run.add_argument("--log-dir", default="logs", help="Directory for per-run log files ('' for console only)")
+    run.add_argument(
+        "--workers",
+        type=int,
+        default=SHM_WORKERS,
+        help="Decode and detect in N processes fed through shared memory (websockets engine)",
+    )
+    run.add_argument(
+        "--batch",
+        type=int,
+        default=BATCH_MAX_FRAMES,
+        help="Decode up to N already-buffered frames together (1 = one at a time)",
+    )
+    run.add_argument(
+        "--inbox",
+        type=int,
+        default=INBOX_MAX_FRAMES,
+        help="Frames a dedicated reader task may queue ahead of processing (0 = read and process in one task)",
+    )
+    run.add_argument(
+        "--inbox-overflow",
+        default=INBOX_OVERFLOW_POLICY,
+        choices=["drop-oldest", "drop-newest", "block"],
+        help="What the reader does with a full inbox",
+    )
+    run.add_argument(
+        "--reorder",
+        action="store_true",
+        help="Process notifications from all subscriptions in slot order (adds up to --reorder-delay of latency)",
+    )
+    run.add_argument(
+        "--reorder-delay",
+        type=float,
+        default=REORDER_MAX_DELAY,
+        help="Seconds a notification may be held back for ordering",
+    )
+    run.add_argument(
+        "--no-slot-watermark",
+        dest="slot_watermark",
+        action="store_false",
+        help="Order by the subscriptions' own slots and --reorder-delay only, without slotSubscribe",
+    )
+    run.add_argument("--uvloop", action="store_true", default=USE_UVLOOP, help="Run on uvloop if installed")
+    run.add_argument("--state", default=STATE_PATH, help="Snapshot file for warm restarts ('' to start cold)")
+    run.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=SHUTDOWN_DRAIN_TIMEOUT,
+        help="Seconds queued enrichment gets to finish on shutdown before the snapshot",
+    )
+    run.add_argument("--join", default=None, metavar="HOST:PORT", help="Run as a node of the coordinator at HOST:PORT")
+    run.add_argument("--node-id", default=None, help="Name of this node in the cluster (default: hostname-pid)")
+    add_pipeline_arguments(run)
+    add_live_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    coordinator = subparsers.add_parser("coordinator", help="Spread subscriptions and enrichment over joined nodes")
+    coordinator.add_argument(
+        "--program",
+        action="append",
+        default=None,
+        help="Program ID to have sniffed (repeatable, default: SPL Token and Raydium AMM)",
+    )
+    coordinator.add_argument("--listen-host", default=CLUSTER_HOST, help="Address nodes connect to")
+    coordinator.add_argument("--listen-port", type=int, default=CLUSTER_PORT)
+    coordinator.add_argument("--log-dir", default="logs", help="Directory for per-run log files ('' for console only)")
+    coordinator.add_argument("--uvloop", action="store_true", default=USE_UVLOOP, help="Run on uvloop if installed")
+    coordinator.add_argument("--state", default=STATE_PATH, help="Snapshot file for warm restarts ('' to start cold)")
+    add_pipeline_arguments(coordinator)
+    add_live_arguments(coordinator)
+    coordinator.set_defaults(func=cmd_coordinator)
+
+    scan = subparsers.add_parser("scan", help="Detect mints in a past slot range from getBlock")
+    scan.add_argument("--from-slot", type=int, required=True, help="First slot to scan")
+    scan.add_argument("--to-slot", type=int, required=True, help="Last slot to scan (inclusive)")
+    scan.add_argument(
+        "--program",
+        action="append",
+        default=None,
+        help="Program ID whose transactions to replay (repeatable, default: SPL Token and Raydium AMM)",
+    )
+    scan.add_argument("--concurrency", type=int, default=SCAN_CONCURRENCY, help="getBlock requests in flight")
+    scan.add_argument("--rate", type=int, default=SCAN_RATE_LIMIT, help="getBlock requests per second")
+    scan.add_argument(
+        "--checkpoint",
+        default=SCAN_CHECKPOINT_PATH,
+        help="Progress file; an interrupted scan of the same range resumes from it ('' to disable)",
+    )
+    scan.add_argument("--log-dir", default="logs", help="Directory for per-run log files ('' for console only)")
+    scan.add_argument("--uvloop", action="store_true", default=USE_UVLOOP, help="Run on uvloop if installed")
+    add_pipeline_arguments(scan)
+    # Nothing that subscribes to today's chain or sends transactions while replaying the past
+    scan.set_defaults(func=cmd_scan, correlate=False, confirm=None, execute=None, track=False)
+
+    query = subparsers.add_parser("query", help="Query stored detections")
+    build_query_parser(query)
+    query.set_defaults(func=cmd_query)
+
+    bench = subparsers.add_parser("bench", help="Run a built-in benchmark")
+    bench.add_argument("suite", nargs="?", default="engines", choices=["engines", "decode", "loop", "startup", "soak", "cluster", "scan", "execute"], help="Benchmark to run")
+    bench.add_argument("--runs", type=int, default=BENCH_STARTUP_RUNS, help="Repetitions per measurement (startup)")
+    bench.add_argument("--engine", action="append", choices=engine_names(), help="Engine to include (repeatable, default: all)")
+    bench.add_argument("--messages", type=int, default=BENCH_MESSAGES, help="Synthetic frames to replay (engines, decode)")
+    bench.add_argument("--rate", type=float, default=None, help="Replay rate in frames/s (engines, default: max)")
+    bench.add_argument("--batch", type=int, default=1, help="Drain and decode up to N frames together (engines)")
+    bench.add_argument("--recording", default=None, help="Replay captured frames from this JSON-lines file (engines)")
+    bench.add_argument("--hours", type=float, default=1.0, help="Live traffic to simulate (soak)")
+    bench.add_argument("--soak-messages", type=int, default=None, help="Exact message count, overrides --hours (soak)")
+    bench.add_argument("--max-growth-mb", type=float, default=SOAK_MAX_GROWTH_MB, help="RSS growth that fails the run (soak)")
+    bench.add_argument("--nodes", type=int, default=BENCH_CLUSTER_NODES, help="Node processes to start (cluster)")
+    bench.add_argument("--slots", type=int, default=BENCH_SCAN_SLOTS, help="Slots to scan from the mock RPC (scan)")
+    bench.add_argument("--mints", type=int, default=BENCH_EXECUTE_MINTS, help="Mints to execute against the mock RPC (execute)")
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command in ("run", "coordinator", "scan") and args.program is None:
+        args.program = [SPL_TOKEN_PROGRAM_ID, RAYDIUM_AMM_PROGRAM_ID]
+    if args.command == "run" and args.confirm:
+        args.commitment = "processed"  # Emit at the earliest commitment, reconcile later
+    if args.command in ("run", "coordinator") and args.execute and not args.keypair:
+        build_parser().error("--execute needs --keypair")
+    if args.command == "scan" and args.to_slot < args.from_slot:
+        build_parser().error("--to-slot is before --from-slot")
+    if args.command in ("run", "coordinator", "scan") and args.filter:
+        from core.filters.filters import compile_expression
+
+        for text in args.filter:
+            try:
+                compile_expression(text)
+            except ValueError as e:
+                build_parser().error(str(e))
+    if args.command == "run" and args.reorder and (args.workers or args.join):
+        build_parser().error("--reorder cannot be combined with --workers or --join")
+    if args.command == "run" and args.workers and args.engine != "websockets":
+        build_parser().error("--workers needs the websockets engine (raw frames)")
+    if args.command == "run" and args.workers and (args.parse_instructions or args.hot_mints):
+        # Workers only detect; parsing happens in the main process, which never sees their frames
+        build_parser().error("--parse-instructions and --hot-mints cannot be combined with --workers")
+    return args.func(args)
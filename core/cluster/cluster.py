@@ -0,0 +1,352 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from core.cluster.hashring import HashRing
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from core.server.server import encode_event
+from constants.constants import (
+    CLUSTER_HOST,
+    CLUSTER_PORT,
+    CLUSTER_VNODES,
+    CLUSTER_HEARTBEAT_INTERVAL,
+    CLUSTER_NODE_TIMEOUT,
+    CLUSTER_HANDOFF_GRACE,
+    CLUSTER_MAX_BUFFERED,
+    CLUSTER_BATCH_EVENTS,
+    RECONNECT_DELAY,
+)
+
+# Protocol: one compact JSON object per line in both directions, keyed by "op".
+#   node -> coordinator: join {node}, heartbeat, events {events: [...]}
+#   coordinator -> node: assign {epoch, programs, members}, enrich {mint, authority, priority}, promote {mint, priority}
+
+
+###############################################################################
+# Coordinator
+###############################################################################
+class Member:
+    """One connected sniffer node, as the coordinator sees it."""
+    __slots__ = ("node_id", "writer", "last_seen", "programs")
+
+    def __init__(self, node_id: str, writer: asyncio.StreamWriter):
+        self.node_id = node_id
+        self.writer = writer
+        self.last_seen = time.monotonic()
+        self.programs: List[str] = []
+
+    def send(self, message: Dict[str, Any]) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(encode_event(message))
+
+
+class RemoteEnricher:
+    """
+    Takes the Enricher's place in the coordinator's Pipeline: every mint is
+    sent to the node that owns it on the hash ring, which enriches it and
+    sends the results back like any other event.
+    """
+    queue = ()  # Nothing waits here (the overload controller and snapshots look)
+    busy = False
+
+    def __init__(self, coordinator: "Coordinator"):
+        self.coordinator = coordinator
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def submit(self, mint_address: str, authority: Optional[str] = None, priority: Optional[int] = None) -> None:
+        self.coordinator.route(mint_address, {"op": "enrich", "mint": mint_address, "authority": authority, "priority": priority})
+
+    def promote(self, mint_address: str, priority: Optional[int] = None) -> bool:
+        return self.coordinator.route(mint_address, {"op": "promote", "mint": mint_address, "priority": priority})
+
+    def snapshot(self) -> List[list]:
+        return []
+
+    def restore(self, items: Iterable[list], downtime: float = 0.0) -> None:
+        for mint_address, priority, _age in items:
+            self.submit(mint_address, priority=priority)
+
+
+class Coordinator:
+    """
+    Spreads program subscriptions and mint-keyed enrichment over sniffer
+    nodes and merges what they find into one stream.
+
+    Nodes connect over TCP and heartbeat; one that disconnects or stays
+    silent for `node_timeout` seconds is dropped. Every membership change
+    re-hashes the program IDs onto the ring and sends each node its new
+    assignment. Events from every node go through `pipeline`, whose
+    dedupe window drops the repeats that overlapping subscriptions produce
+    while a program moves between nodes.
+    """
+    def __init__(
+        self,
+        pipeline,
+        program_ids: Iterable,
+        host: str = CLUSTER_HOST,
+        port: int = CLUSTER_PORT,
+        node_timeout: float = CLUSTER_NODE_TIMEOUT,
+        vnodes: int = CLUSTER_VNODES,
+    ):
+        self.pipeline = pipeline
+        self.program_ids: List[str] = [str(p) for p in program_ids]
+        self.host = host
+        self.port = port
+        self.node_timeout = node_timeout
+        self.vnodes = vnodes
+        self.members: Dict[str, Member] = {}
+        self.ring = HashRing((), vnodes)
+        self.epoch = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._monitor: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_node, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._monitor = asyncio.create_task(self._evict_silent())
+        log_info(f"Cluster coordinator listening on {self.host}:{self.port} for {len(self.program_ids)} programs.")
+
+    async def stop(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+        if self._server is not None:
+            self._server.close()
+            for member in list(self.members.values()):
+                member.writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.members.clear()
+
+    def owner(self, key: str) -> Optional[str]:
+        return self.ring.owner(key)
+
+    def route(self, key: str, message: Dict[str, Any]) -> bool:
+        """Send `message` to the node that owns `key`. Returns False if there is none."""
+        member = self.members.get(self.ring.owner(key))
+        if member is None:
+            metrics.incr("cluster.unrouted")
+            return False
+        member.send(message)
+        return True
+
+    def _rebalance(self, reason: str) -> None:
+        self.ring = HashRing(self.members, self.vnodes)
+        self.epoch += 1
+        assignment = self.ring.assign(self.program_ids)
+        for node_id, member in self.members.items():
+            member.programs = assignment[node_id]
+            member.send({"op": "assign", "epoch": self.epoch, "programs": member.programs, "members": self.ring.nodes})
+        metrics.set_gauge("cluster.members", len(self.members))
+        metrics.incr("cluster.rebalances")
+        log_info(
+            f"Cluster epoch {self.epoch} ({reason}): "
+            + (", ".join(f"{node_id}={len(member.programs)}" for node_id, member in self.members.items()) or "no nodes")
+        )
+
+    def _leave(self, member: Member, reason: str) -> None:
+        if self.members.get(member.node_id) is not member:
+            return
+        del self.members[member.node_id]
+        member.writer.close()
+        self._rebalance(f"{member.node_id} {reason}")
+
+    async def _evict_silent(self) -> None:
+        while True:
+            await asyncio.sleep(CLUSTER_HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            for member in list(self.members.values()):
+                if now - member.last_seen > self.node_timeout:
+                    log_warning(f"Node {member.node_id} missed its heartbeats.")
+                    self._leave(member, "timed out")
+
+    async def _handle_node(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        member = None
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if hello.get("op") != "join" or not hello.get("node"):
+                log_warning(f"Ignoring cluster connection without a join: {writer.get_extra_info('peername')}")
+                return
+            member = Member(str(hello["node"]), writer)
+            previous = self.members.get(member.node_id)
+            if previous is not None:
+                previous.writer.close()  # Same node reconnecting: the new connection wins
+            self.members[member.node_id] = member
+            self._rebalance(f"{member.node_id} joined")
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                member.last_seen = time.monotonic()
+                message = json.loads(line)
+                if message.get("op") == "events":
+                    self._ingest(message["events"])
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            log_error(f"Malformed message from node {member.node_id if member else '?'}: {e}")
+        finally:
+            if member is not None:
+                self._leave(member, "left")
+            else:
+                writer.close()
+
+    def _ingest(self, events: List[Dict[str, Any]]) -> None:
+        """Feed node events into the pipeline in order; detections go through its dedupe window."""
+        metrics.incr("cluster.events", len(events))
+        detections = []
+        for event in events:
+            if event.get("type") == "detection":
+                detections.append(event)
+                continue
+            if detections:
+                self.pipeline.dispatch_batch(detections)
+                detections = []
+            self.pipeline.emit(event)
+        if detections:
+            self.pipeline.dispatch_batch(detections)
+
+
+###############################################################################
+# Node
+###############################################################################
+class ClusterNode:
+    """
+    A sniffer process taking orders from a Coordinator.
+
+    It subscribes to the programs it is assigned (through `sniffer`, a
+    SolanaSniffer whose pipeline sends everything to `forward` via a
+    ClusterSink), enriches the mints routed to it with `enricher`, and
+    keeps reconnecting if the coordinator goes away. Events produced while
+    disconnected are buffered up to `max_buffered`, oldest dropped first.
+    """
+    def __init__(
+        self,
+        host: str = CLUSTER_HOST,
+        port: int = CLUSTER_PORT,
+        node_id: Optional[str] = None,
+        sniffer=None,
+        enricher=None,
+        heartbeat_interval: float = CLUSTER_HEARTBEAT_INTERVAL,
+        handoff_grace: float = CLUSTER_HANDOFF_GRACE,
+        max_buffered: int = CLUSTER_MAX_BUFFERED,
+    ):
+        self.host = host
+        self.port = port
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.sniffer = sniffer
+        self.enricher = enricher
+        self.heartbeat_interval = heartbeat_interval
+        self.handoff_grace = handoff_grace
+        self.max_buffered = max_buffered
+        self.programs: Set[str] = set()
+        self.members: List[str] = []
+        self.epoch = 0
+        self._outbox: "deque[Dict[str, Any]]" = deque()
+        self._wakeup = asyncio.Event()
+
+    def forward(self, event: Dict[str, Any]) -> None:
+        """Queue an event for the coordinator. Never blocks."""
+        if len(self._outbox) >= self.max_buffered:
+            self._outbox.popleft()
+            metrics.incr("cluster.dropped")
+        self._outbox.append(event)
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Stay connected to the coordinator until cancelled."""
+        while True:
+            writer = None
+            tasks: List[asyncio.Task] = []
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                writer.write(encode_event({"op": "join", "node": self.node_id}))
+                log_info(f"Node {self.node_id} joined the cluster at {self.host}:{self.port}.")
+                tasks = [asyncio.create_task(self._heartbeat(writer)), asyncio.create_task(self._send(writer))]
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        raise ConnectionError("coordinator closed the connection")
+                    self._handle(json.loads(line))
+            except asyncio.CancelledError:
+                raise
+            except (OSError, ConnectionError, ValueError) as e:
+                log_warning(f"Node {self.node_id} lost the coordinator: {e}. Reconnecting in {RECONNECT_DELAY}s...")
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _handle(self, message: Dict[str, Any]) -> None:
+        op = message.get("op")
+        if op == "assign":
+            self.epoch = message["epoch"]
+            self.members = message["members"]
+            self._assign(message["programs"])
+        elif op in ("enrich", "promote"):
+            if self.enricher is None:
+                metrics.incr("cluster.unenriched")
+                return
+            if op == "enrich":
+                self.enricher.submit(message["mint"], authority=message.get("authority"), priority=message.get("priority"))
+            elif message.get("priority") is None:
+                self.enricher.promote(message["mint"])
+            else:
+                self.enricher.promote(message["mint"], message["priority"])
+        else:
+            log_debug(f"Node {self.node_id} ignoring {op!r} message")
+
+    def _assign(self, programs: Iterable[str]) -> None:
+        assigned = set(programs)
+        for program_id in sorted(assigned - self.programs):
+            self.sniffer.add_sniffer(program_id)
+        loop = asyncio.get_running_loop()
+        for program_id in self.programs - assigned:
+            # Keep it until the new owner has had time to subscribe
+            loop.call_later(self.handoff_grace, self._release, program_id)
+        self.programs = assigned
+        log_info(f"Node {self.node_id} epoch {self.epoch}: {len(assigned)} programs, {len(self.members)} nodes.")
+
+    def _release(self, program_id: str) -> None:
+        if program_id not in self.programs:
+            self.sniffer.remove_sniffer(program_id)
+
+    async def _heartbeat(self, writer: asyncio.StreamWriter) -> None:
+        while True:
+            writer.write(encode_event({"op": "heartbeat"}))
+            await writer.drain()
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _send(self, writer: asyncio.StreamWriter) -> None:
+        outbox = self._outbox
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while outbox:
+                batch = [outbox.popleft() for _ in range(min(len(outbox), CLUSTER_BATCH_EVENTS))]
+                try:
+                    writer.write(encode_event({"op": "events", "events": batch}))
+                    await writer.drain()
+                except BaseException:
+                    # Resend it first after reconnecting, oldest dropped first as in `forward`
+                    outbox.extendleft(reversed(batch))
+                    while len(outbox) > self.max_buffered:
+                        outbox.popleft()
+                        metrics.incr("cluster.dropped")
+                    self._wakeup.set()
+                    raise
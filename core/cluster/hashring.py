@@ -0,0 +1,46 @@
+import bisect
+from typing import Dict, Iterable, List, Optional
+
+from core.activity.sketches import hash64
+from constants.constants import CLUSTER_VNODES
+
+
+class HashRing:
+    """
+    Consistent hashing of keys (program IDs, mints) onto node ids.
+
+    Each node owns `vnodes` points on a 64-bit ring and a key belongs to the
+    first point at or after its hash. When a node joins or leaves, only the
+    keys next to its points move (about 1/N of them); every other key keeps
+    its owner. The hash is stable across processes, so the coordinator and
+    every node compute the same owners from the same member list.
+    """
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = CLUSTER_VNODES):
+        self.vnodes = vnodes
+        self.nodes: List[str] = sorted(set(nodes))
+        points = sorted(
+            (hash64(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(vnodes)
+        )
+        self._hashes = [point for point, _node in points]
+        self._owners = [node for _point, node in points]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def owner(self, key: str) -> Optional[str]:
+        """The node `key` belongs to (None on an empty ring)."""
+        if not self._hashes:
+            return None
+        index = bisect.bisect_left(self._hashes, hash64(key))
+        return self._owners[index % len(self._owners)]
+
+    def assign(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Node id -> the keys it owns (every node present, possibly with none)."""
+        assignment: Dict[str, List[str]] = {node: [] for node in self.nodes}
+        for key in keys:
+            owner = self.owner(key)
+            if owner is not None:
+                assignment[owner].append(key)
+        return assignment
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from core.runtime.runtime import run_sync
+from constants.constants import (
+    RPC_HTTP_URL,
+    CONFIRMATION_TARGET,
+    CONFIRMATION_POLL_INTERVAL,
+    CONFIRMATION_TIMEOUT,
+    CONFIRMATION_MAX_PENDING,
+)
+
+# getSignatureStatuses accepts at most this many signatures per call
+STATUS_BATCH_SIZE = 256
+COMMITMENT_RANK = {"processed": 0, "confirmed": 1, "finalized": 2}
+
+
+def fetch_signature_statuses(
+    signatures: List[str],
+    rpc_http_url: str = RPC_HTTP_URL,
+    search_history: bool = False,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Look up the status of up to STATUS_BATCH_SIZE signatures in one call:
+    in the node's recent status cache only, or also in the ledger with
+    `search_history` (slower, but finds transactions of any age).
+
+    :return: One entry per signature: None if the node does not know it,
+             else a dict with slot, err and confirmationStatus.
+    """
+    import requests
+
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getSignatureStatuses",
+        "params": [signatures, {"searchTransactionHistory": search_history}],
+    }
+    headers = {"Content-Type": "application/json"}
+    response = requests.post(rpc_http_url, json=payload, headers=headers, timeout=10)
+    result = response.json().get("result")
+    if not result:
+        raise ValueError(f"getSignatureStatuses failed: {response.text[:200]}")
+    return result["value"]
+
+
+class ConfirmationTracker:
+    """
+    Follows detections emitted at `processed` until they reach `target`.
+
+    Tracked signatures are polled in batches with getSignatureStatuses.
+    Every step up in commitment is passed to `emit` as a "confirmation"
+    event. A transaction that failed, or that the node still does not know
+    `timeout` seconds after detection (its fork was dropped and its
+    blockhash has expired), is passed on as a "retraction" event so
+    downstream consumers can undo what they did with it. Before a
+    signature is given up on, it is looked up once more with the
+    transaction history searched: the recent status cache misses
+    transactions that landed while we were down (restored entries) or
+    that aged out of it.
+    """
+    def __init__(
+        self,
+        emit: Callable[[Dict[str, Any]], None],
+        rpc_http_url: str = RPC_HTTP_URL,
+        target: str = CONFIRMATION_TARGET,
+        poll_interval: float = CONFIRMATION_POLL_INTERVAL,
+        timeout: float = CONFIRMATION_TIMEOUT,
+        max_pending: int = CONFIRMATION_MAX_PENDING,
+    ):
+        if target not in ("confirmed", "finalized"):
+            raise ValueError(f"Unknown confirmation target {target!r}, expected 'confirmed' or 'finalized'")
+        self.emit = emit
+        self.rpc_http_url = rpc_http_url
+        self.target = target
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.max_pending = max_pending
+        # signature -> {"detections": [...], "status": ..., "first_seen": monotonic}
+        self.pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.confirmed = 0
+        self.retracted = 0
+
+    def track(self, detection: Dict[str, Any]) -> None:
+        signature = detection.get("signature")
+        if not signature:
+            return
+        entry = self.pending.get(signature)
+        if entry is not None:
+            entry["detections"].append(detection)
+            return
+        self.pending[signature] = {
+            "detections": [detection],
+            "status": detection.get("status") or "processed",
+            "first_seen": time.monotonic(),
+        }
+        while len(self.pending) > self.max_pending:
+            self.pending.popitem(last=False)
+            metrics.incr("confirmation.evicted")
+        metrics.set_gauge("confirmation.pending", len(self.pending))
+
+    def snapshot(self) -> List[list]:
+        """[signature, status, seconds pending, detections] per pending signature, oldest first."""
+        now = time.monotonic()
+        return [
+            [signature, entry["status"], now - entry["first_seen"], entry["detections"]]
+            for signature, entry in self.pending.items()
+        ]
+
+    def restore(self, items: Iterable[list], downtime: float = 0.0) -> None:
+        """Track `snapshot()` items again; the downtime counts towards their timeout."""
+        now = time.monotonic()
+        for signature, status, age, detections in items:
+            if signature in self.pending:
+                continue
+            self.pending[signature] = {"detections": detections, "status": status, "first_seen": now - age - downtime}
+        while len(self.pending) > self.max_pending:
+            self.pending.popitem(last=False)
+            metrics.incr("confirmation.evicted")
+        metrics.set_gauge("confirmation.pending", len(self.pending))
+
+    async def run(self) -> None:
+        """Poll pending signatures until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_warning(f"Signature status check failed: {e}")
+
+    async def check(self) -> None:
+        """Fetch the status of every pending signature once and act on it."""
+        expired = []
+        signatures = list(self.pending)
+        for start in range(0, len(signatures), STATUS_BATCH_SIZE):
+            batch = signatures[start: start + STATUS_BATCH_SIZE]
+            statuses = await run_sync(fetch_signature_statuses, batch, self.rpc_http_url)
+            now = time.monotonic()
+            for signature, status in zip(batch, statuses):
+                entry = self.pending.get(signature)
+                if status is None and entry is not None and now - entry["first_seen"] > self.timeout:
+                    expired.append(signature)
+                else:
+                    self._apply(signature, status)
+        # Unseen past the timeout: search the ledger before calling them dropped
+        for start in range(0, len(expired), STATUS_BATCH_SIZE):
+            batch = expired[start: start + STATUS_BATCH_SIZE]
+            statuses = await run_sync(fetch_signature_statuses, batch, self.rpc_http_url, True)
+            metrics.incr("confirmation.history_lookups", len(batch))
+            for signature, status in zip(batch, statuses):
+                if status is None:
+                    if signature in self.pending:
+                        self._retract(signature, "dropped")
+                else:
+                    self._apply(signature, status)
+        metrics.set_gauge("confirmation.pending", len(self.pending))
+
+    def _apply(self, signature: str, status: Optional[Dict[str, Any]]) -> None:
+        entry = self.pending.get(signature)
+        if entry is None or status is None:
+            return
+        if status.get("err") is not None:
+            self._retract(signature, "failed")
+            return
+
+        level = status.get("confirmationStatus") or "processed"
+        if COMMITMENT_RANK.get(level, 0) <= COMMITMENT_RANK[entry["status"]]:
+            return
+        entry["status"] = level
+        for detection in entry["detections"]:
+            self.emit({
+                "type": "confirmation",
+                "signature": signature,
+                "mint": detection.get("mint"),
+                "slot": status.get("slot", detection.get("slot")),
+                "status": level,
+            })
+        if COMMITMENT_RANK[level] >= COMMITMENT_RANK[self.target]:
+            del self.pending[signature]
+            self.confirmed += 1
+            metrics.incr("confirmation.confirmed")
+
+    def _retract(self, signature: str, reason: str) -> None:
+        entry = self.pending.pop(signature)
+        self.retracted += 1
+        metrics.incr(f"confirmation.{reason}")
+        for detection in entry["detections"]:
+            self.emit({
+                "type": "retraction",
+                "signature": signature,
+                "mint": detection.get("mint"),
+                "slot": detection.get("slot"),
+                "reason": reason,
+            })
@@ -0,0 +1,319 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.logtree.logtree import LogTree, build_log_tree, mentions_any
+from core.metrics.metrics import metrics
+from core.runtime.runtime import run_sync
+from constants.constants import (
+    RPC_HTTP_URL,
+    RPC_WS_URL,
+    RAYDIUM_AMM_PROGRAM_ID,
+    RAYDIUM_POOL_PROGRAM_ID,
+    RECONNECT_DELAY,
+    CORRELATION_MINT_TTL,
+    CORRELATION_MAX_MINTS,
+    CORRELATION_MAX_LOOKUPS,
+    RAYDIUM_POOL_INIT_MARKERS,
+)
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# Raydium AMM `initialize2`: instruction tag (first data byte) and account layout
+INITIALIZE2_TAG = 1
+AMM_ID_INDEX = 4
+COIN_MINT_INDEX = 8
+PC_MINT_INDEX = 9
+
+
+###############################################################################
+# Recent Mint Index
+###############################################################################
+class RecentMintIndex:
+    """
+    Mints seen in the last `ttl` seconds, capped at `max_size` entries.
+
+    Entries are kept in insertion (= arrival) order, so expiry only ever pops
+    from the front and lookups stay a single dict probe regardless of size.
+    """
+    def __init__(self, ttl: float = CORRELATION_MINT_TTL, max_size: int = CORRELATION_MAX_MINTS):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, mint: str) -> bool:
+        return self.get(mint) is not None
+
+    def add(self, mint: str, info: Dict[str, Any], now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._entries.pop(mint, None)
+        self._entries[mint] = (now, info)
+        self.expire(now)
+
+    def get(self, mint: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(mint)
+        if entry is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if now - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def pop(self, mint: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.pop(mint, None)
+        return entry[1] if entry else None
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop expired and over-capacity entries from the front. Returns how many."""
+        now = time.monotonic() if now is None else now
+        removed = 0
+        entries = self._entries
+        while entries:
+            added_at = next(iter(entries.values()))[0]
+            if now - added_at <= self.ttl and len(entries) <= self.max_size:
+                break
+            entries.popitem(last=False)
+            removed += 1
+        return removed
+
+    def items(self):
+        return ((mint, entry[1]) for mint, entry in self._entries.items())
+
+    def snapshot(self) -> List[Tuple[str, Optional[str], int, float, float]]:
+        """(mint, signature, slot, detected_at, seconds since indexed) per entry, oldest first."""
+        now = time.monotonic()
+        return [
+            (mint, info.get("signature"), info.get("slot") or 0, info.get("detected_at") or 0.0, now - added_at)
+            for mint, (added_at, info) in self._entries.items()
+        ]
+
+    def restore(self, rows: Iterable[tuple], downtime: float = 0.0) -> int:
+        """Re-add `snapshot()` rows, counting `downtime` against their TTL. Returns how many are still live."""
+        now = time.monotonic()
+        for mint, signature, slot, detected_at, age in rows:
+            if mint is None or mint in self._entries:
+                continue
+            self._entries[mint] = (now - age - downtime, {"slot": slot, "signature": signature, "detected_at": detected_at})
+        self.expire(now)
+        return len(self._entries)
+
+
+###############################################################################
+# Correlator
+###############################################################################
+class PoolCorrelator:
+    """
+    Matches Raydium pool launches against recently created mints.
+
+    Feed it mints with `add_mint` and pool initializations with `add_pool`;
+    `on_match` is called with a "pool_created" event as soon as a pool's base
+    or quote mint is in the recent-mint index.
+    """
+    def __init__(
+        self,
+        on_match: Optional[Callable[[Dict[str, Any]], None]] = None,
+        ttl: float = CORRELATION_MINT_TTL,
+        max_mints: int = CORRELATION_MAX_MINTS,
+    ):
+        self.index = RecentMintIndex(ttl=ttl, max_size=max_mints)
+        self.on_match = on_match or (lambda event: None)
+
+    def add_mint(self, mint: str, slot: int, signature: Optional[str] = None) -> None:
+        self.index.add(mint, {"slot": slot, "signature": signature, "detected_at": time.time()})
+        metrics.set_gauge("correlation.index_size", len(self.index))
+
+    def add_pool(
+        self,
+        pool_id: str,
+        base_mint: str,
+        quote_mint: str,
+        slot: int,
+        signature: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Record a pool initialization and emit an event per matching new mint.
+
+        :return: The emitted events (empty if neither side is a recent mint).
+        """
+        metrics.incr("correlation.pools_seen")
+        events = []
+        for mint, paired_with in ((base_mint, quote_mint), (quote_mint, base_mint)):
+            mint_info = self.index.get(mint)
+            if mint_info is None:
+                continue
+            event = {
+                "type": "pool_created",
+                "mint": mint,
+                "paired_with": paired_with,
+                "pool_id": pool_id,
+                "slot": slot,
+                "signature": signature,
+                "mint_slot": mint_info["slot"],
+                "mint_signature": mint_info["signature"],
+                "seconds_since_mint": round(time.time() - mint_info["detected_at"], 3),
+            }
+            metrics.incr("correlation.matches")
+            events.append(event)
+            self.on_match(event)
+        return events
+
+
+###############################################################################
+# Raydium Pool Initialization Source
+###############################################################################
+def is_pool_initialization(tree: LogTree, program_ids: Iterable[str]) -> bool:
+    """True if one of the Raydium `program_ids` logged a pool initialization in this transaction."""
+    for line in tree.logs(program_ids):
+        for marker in RAYDIUM_POOL_INIT_MARKERS:
+            if marker in line:
+                return True
+    return False
+
+
+def fetch_pool_mints(signature: str, program_ids: Iterable[str], rpc_http_url: str = RPC_HTTP_URL):
+    """
+    Fetch a pool-initialization transaction and read its AMM id and mints.
+
+    The mints are not in the log text, only in the accounts of the
+    `initialize2` instruction, which is top-level or, when another program
+    (a launchpad, a router) creates the pool, one of its inner instructions.
+
+    :return: (pool_id, base_mint, quote_mint) or None if not found.
+    """
+    import requests
+
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getTransaction",
+        "params": [
+            signature,
+            {"encoding": "json", "maxSupportedTransactionVersion": 0, "commitment": "confirmed"},
+        ],
+    }
+    headers = {"Content-Type": "application/json"}
+    response = requests.post(rpc_http_url, json=payload, headers=headers, timeout=10)
+    result = response.json().get("result")
+    if not result:
+        return None
+
+    message = result["transaction"]["message"]
+    account_keys = list(message["accountKeys"])
+    loaded = (result.get("meta") or {}).get("loadedAddresses") or {}
+    account_keys += loaded.get("writable", []) + loaded.get("readonly", [])
+
+    program_ids = {str(p) for p in program_ids}
+    instructions = list(message["instructions"])
+    for inner in (result.get("meta") or {}).get("innerInstructions") or []:
+        instructions += inner["instructions"]
+    for instruction in instructions:
+        if account_keys[instruction["programIdIndex"]] not in program_ids:
+            continue
+        accounts = instruction["accounts"]
+        if len(accounts) <= PC_MINT_INDEX or _instruction_tag(instruction["data"]) != INITIALIZE2_TAG:
+            continue
+        return (
+            account_keys[accounts[AMM_ID_INDEX]],
+            account_keys[accounts[COIN_MINT_INDEX]],
+            account_keys[accounts[PC_MINT_INDEX]],
+        )
+    return None
+
+
+def _instruction_tag(data: str) -> Optional[int]:
+    """First byte of base58 instruction data (None if empty or not base58)."""
+    number = 0
+    for char in data:
+        digit = BASE58_ALPHABET.find(char)
+        if digit < 0:
+            return None
+        number = number * 58 + digit
+    if data.startswith("1"):
+        return 0  # Leading "1"s are leading zero bytes
+    if not number:
+        return None
+    return number >> (8 * ((number.bit_length() - 1) // 8))
+
+
+async def watch_raydium_pools(
+    correlator: PoolCorrelator,
+    program_ids: Iterable = (RAYDIUM_AMM_PROGRAM_ID, RAYDIUM_POOL_PROGRAM_ID),
+    rpc_ws_url: str = RPC_WS_URL,
+    rpc_http_url: str = RPC_HTTP_URL,
+    max_lookups: int = CORRELATION_MAX_LOOKUPS,
+) -> None:
+    """
+    Subscribe to Raydium program logs and feed pool initializations to
+    `correlator`. At most `max_lookups` pool transactions are fetched at
+    once; the rest wait their turn.
+    """
+    import websockets
+
+    program_ids = [str(p) for p in program_ids]
+    lookups: set = set()
+    slots = asyncio.Semaphore(max_lookups)
+
+    async def resolve(signature: str, slot: int) -> None:
+        try:
+            async with slots:
+                pool = await run_sync(fetch_pool_mints, signature, program_ids, rpc_http_url)
+        except Exception as e:
+            log_debug(f"Pool lookup failed for {signature}: {e}")
+            return
+        if pool is None:
+            log_debug(f"No Raydium pool accounts found in {signature}")
+            return
+        pool_id, base_mint, quote_mint = pool
+        log_debug(f"Raydium pool {pool_id} initialized: {base_mint} / {quote_mint}")
+        correlator.add_pool(pool_id, base_mint, quote_mint, slot, signature)
+
+    while True:
+        try:
+            async with websockets.connect(rpc_ws_url, ping_interval=None, close_timeout=10) as websocket:
+                log_info("Connected to Solana WebSocket endpoint (Raydium pools).")
+                for request_id, program_id in enumerate(program_ids, start=1):
+                    await websocket.send(json.dumps({
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": "logsSubscribe",
+                        "params": [{"mentions": [program_id]}, {"commitment": "confirmed"}],
+                    }))
+                log_info(f"Subscribed to {len(program_ids)} Raydium programs.")
+
+                while True:
+                    data = json.loads(await websocket.recv())
+                    if data.get("method") != "logsNotification":
+                        if "error" in data:
+                            log_error(f"Received error from Solana: {data['error']}")
+                        continue
+
+                    notification = data["params"]["result"]
+                    value = notification["value"]
+                    logs = value["logs"]
+                    if (
+                        value.get("err") is None
+                        and mentions_any(logs, RAYDIUM_POOL_INIT_MARKERS)
+                        and is_pool_initialization(build_log_tree(logs), program_ids)
+                    ):
+                        lookup = asyncio.create_task(resolve(value["signature"], notification["context"]["slot"]))
+                        lookups.add(lookup)
+                        lookup.add_done_callback(lookups.discard)
+                        metrics.set_gauge("correlation.lookups", len(lookups))
+
+        except asyncio.CancelledError:
+            for lookup in list(lookups):
+                lookup.cancel()
+            await asyncio.gather(*lookups, return_exceptions=True)
+            raise
+        except websockets.exceptions.ConnectionClosed as e:
+            log_warning(f"(Raydium pools) Connection closed: {e}. Reconnecting in {RECONNECT_DELAY}s...")
+            await asyncio.sleep(RECONNECT_DELAY)
+        except Exception as e:
+            log_error(f"(Raydium pools) Unexpected error: {e}. Reconnecting in {RECONNECT_DELAY}s...")
+            await asyncio.sleep(RECONNECT_DELAY)
@@ -0,0 +1,82 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from core.engines.engine import LogsEvent
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.logtree.logtree import mentions_any
+
+INITIALIZE_MINT_MARKER = "Program log: Instruction: InitializeMint"
+MINT_INSTRUCTIONS = frozenset({"InitializeMint", "InitializeMint2"})
+
+
+class MintDetector:
+    """
+    Finds new SPL token mints (InitializeMint / InitializeMint2) in a
+    transaction's invoke tree and turns each into a detection event.
+    """
+    # A notification without any of these substrings cannot produce a detection
+    markers = (INITIALIZE_MINT_MARKER,)
+
+    def detect(self, event: LogsEvent) -> List[Dict[str, Any]]:
+        if event.err is not None or not mentions_any(event.logs, self.markers):
+            return []
+
+        detections = []
+        for instruction in event.tree.instructions:
+            if instruction.name not in MINT_INSTRUCTIONS:
+                continue
+            log_info(f"[Token Creation] Found {instruction.name} in slot {event.slot}")
+            # Only the lines the token program itself logged for this instruction
+            logs, i = instruction.invocation.logs, instruction.index
+            mint_address = self._parse_mint(logs, i)
+            authority = self._parse_authority(logs, i)
+            if mint_address:
+                log_info(f"  Found mint address: {mint_address}")
+            else:
+                log_warning("  Could not parse the mint address from logs.")
+            detections.append({
+                "type": "detection",
+                "slot": event.slot,
+                "signature": event.signature,
+                "mint": mint_address,
+                "authority": authority,
+                "program_id": event.program_id,
+                "detected_at": time.time(),
+            })
+        return detections
+
+    def _parse_mint(self, logs: List[str], index: int) -> Optional[str]:
+        line = logs[index]
+
+        # Option 1: If the Mint address is in the same line
+        # e.g. "Program log: Instruction: InitializeMint: Mint <pubkey> Authority <pubkey>"
+        if "Mint " in line:
+            parts = line.split("Mint ", 1)
+            candidate = parts[1].strip().split()[0] if parts[1].strip() else ""
+            if len(candidate) >= 32:
+                return candidate
+
+        # Option 2: If the Mint address is on a subsequent line
+        # e.g. "Program log: Mint: <SomePublicKey>"
+        for later in logs[index + 1:]:
+            if "Mint:" in later:
+                parts = later.split("Mint:", 1)[1].split()
+                if parts and len(parts[0]) >= 32:
+                    return parts[0]
+        return None
+
+    def _parse_authority(self, logs: List[str], index: int) -> Optional[str]:
+        # Same layouts as the mint: "... Authority <pubkey>" on the marker line,
+        # or "Program log: Authority: <pubkey>" further down
+        line = logs[index]
+        if "Authority " in line:
+            parts = line.split("Authority ", 1)[1].split()
+            if parts and len(parts[0]) >= 32:
+                return parts[0]
+
+        for later in logs[index + 1:]:
+            if "Authority:" in later:
+                parts = later.split("Authority:", 1)[1].split()
+                if parts and len(parts[0]) >= 32:
+                    return parts[0]
+        return None
@@ -0,0 +1,223 @@
+import asyncio
+import contextlib
+import functools
+import importlib
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence
+
+from core.engines.inbox import Inbox
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.logtree.logtree import LogTree, build_log_tree
+from core.metrics.metrics import metrics
+from constants.constants import RPC_WS_URL, RECONNECT_DELAY, HEARTBEAT_INTERVAL, LOGS_COMMITMENT, BATCH_MAX_FRAMES
+
+# Engine name -> "module:Class", imported only when selected
+ENGINES = {
+    "websockets": "core.engines.websockets_engine:WebsocketsEngine",
+    "solana-py": "core.engines.solana_py_engine:SolanaPyEngine",
+    "geyser": "core.engines.geyser_engine:GeyserEngine",
+}
+
+
+class LogsEvent:
+    """One logsNotification, independent of the engine that received it."""
+    __slots__ = ("program_id", "slot", "_signature", "err", "logs", "received_at", "_tree")
+
+    def __init__(self, program_id, slot, signature, err, logs, received_at=None):
+        self.program_id = program_id
+        self.slot = slot
+        self._signature = signature
+        self.err = err
+        self.logs = logs
+        self.received_at = received_at if received_at is not None else time.monotonic()
+        self._tree = None
+
+    @property
+    def signature(self) -> Optional[str]:
+        """Base58 text. Engines receiving raw bytes (geyser) pass those, encoded on first use."""
+        signature = self._signature
+        if isinstance(signature, bytes):
+            from solders.signature import Signature
+
+            signature = self._signature = str(Signature.from_bytes(signature))
+        return signature
+
+    @property
+    def tree(self) -> LogTree:
+        """The logs structured by invocation, built on first use and shared by every stage."""
+        if self._tree is None:
+            self._tree = build_log_tree(self.logs)
+        return self._tree
+
+    def __repr__(self):
+        return f"LogsEvent(slot={self.slot}, signature={self.signature}, program_id={self.program_id})"
+
+
+class Engine:
+    """
+    A transport that subscribes to program logs and yields LogsEvents.
+
+    Subclasses implement `_session()`, an async generator covering one
+    connection, and `decode()`, which turns one raw frame into a LogsEvent
+    (or None). Engines whose frames can be decoded in another process also
+    implement `_frames()` (and set `raw_frames`), and engines that can
+    drain their socket implement `_batch_session()`. Reconnecting is
+    handled here.
+    """
+    name = "base"
+    raw_frames = False
+
+    def __init__(
+        self,
+        program_ids: Iterable,
+        rpc_ws_url: str = RPC_WS_URL,
+        reconnect_delay: float = RECONNECT_DELAY,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+        commitment: Optional[str] = LOGS_COMMITMENT,
+    ):
+        self.program_ids: List[str] = [str(p) for p in program_ids]
+        self.rpc_ws_url = rpc_ws_url
+        self.reconnect_delay = reconnect_delay
+        self.heartbeat_interval = heartbeat_interval
+        self.commitment = commitment
+        # Subscription id -> program id, filled from subscription confirmations
+        self.subscriptions: Dict[int, str] = {}
+        self.received = 0
+
+    async def notifications(self) -> AsyncIterator[LogsEvent]:
+        """Yield events forever, reconnecting after errors."""
+        async for event in self._reconnecting(self._session):
+            yield event
+
+    async def frames(self) -> AsyncIterator:
+        """
+        Yield undecoded frames forever, reconnecting after errors, for
+        callers that decode elsewhere (see core/shm/workers.py).
+        """
+        async for raw in self._reconnecting(self._frames):
+            yield raw
+
+    async def batches(
+        self,
+        max_batch: int = BATCH_MAX_FRAMES,
+        prefilter: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[List[LogsEvent]]:
+        """
+        Yield lists of events forever, reconnecting after errors.
+
+        Each list holds every frame that had already arrived when the first
+        one was read (up to `max_batch`), decoded together, so a lone frame
+        is never held back waiting for company. Notifications containing
+        none of the `prefilter` substrings may be dropped before decoding.
+        """
+        session = functools.partial(self._batch_session, max_batch, prefilter)
+        async for events in self._reconnecting(session):
+            if events:
+                yield events
+
+    async def read_into(self, inbox: Inbox) -> None:
+        """
+        The reader task: receive forever into `inbox` and do nothing else.
+        Engines with raw frames queue them undecoded, so decoding happens
+        on the processing side (see `inbox_batches`).
+        """
+        source = self.frames() if self.raw_frames else self.notifications()
+        async with contextlib.aclosing(source) as items:
+            async for item in items:
+                await inbox.put(item, not self.raw_frames or self.is_notification(item))
+
+    async def inbox_batches(
+        self,
+        inbox: Inbox,
+        max_batch: int = BATCH_MAX_FRAMES,
+        prefilter: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[List[LogsEvent]]:
+        """
+        Yield what the reader task has queued, up to `max_batch` at a time,
+        decoded together. A batch that fails to decode is logged, counted
+        (decode.errors) and skipped; the reader is never interrupted.
+        """
+        while True:
+            items = await inbox.get_batch(max_batch)
+            if self.raw_frames:
+                try:
+                    events = self.decode_batch(items, prefilter)
+                except Exception as e:
+                    metrics.incr("decode.errors", len(items))
+                    log_error(f"({self.name}) Could not decode {len(items)} frames: {e}")
+                    continue
+            else:
+                events = items
+            if events:
+                yield events
+
+    async def _reconnecting(self, session) -> AsyncIterator:
+        while True:
+            try:
+                async for item in session():
+                    yield item
+                log_warning(f"({self.name}) Stream ended. Reconnecting in {self.reconnect_delay}s...")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_error(f"({self.name}) Unexpected error: {e}. Reconnecting in {self.reconnect_delay}s...")
+            self.subscriptions.clear()
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _session(self) -> AsyncIterator[LogsEvent]:
+        raise NotImplementedError
+
+    def _frames(self) -> AsyncIterator:
+        raise NotImplementedError(f"The {self.name} engine does not expose raw frames")
+
+    async def _batch_session(self, max_batch: int, prefilter: Optional[Sequence[str]]) -> AsyncIterator[List[LogsEvent]]:
+        # Engines that can drain their socket override this; by default every event is its own batch
+        async for event in self._session():
+            yield [event]
+
+    def decode(self, raw) -> Optional[LogsEvent]:
+        raise NotImplementedError
+
+    def is_notification(self, raw) -> bool:
+        """Whether a raw frame is a notification (droppable under overload) rather than a reply to a request."""
+        return True
+
+    def decode_batch(self, frames: List, prefilter: Optional[Sequence[str]] = None) -> List[LogsEvent]:
+        events = []
+        for raw in frames:
+            event = self.decode(raw)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _program_for(self, subscription: Optional[int]) -> Optional[str]:
+        program_id = self.subscriptions.get(subscription)
+        if program_id is None and len(self.program_ids) == 1:
+            program_id = self.program_ids[0]
+        return program_id
+
+
+async def keepalive(websocket, interval: float = HEARTBEAT_INTERVAL) -> None:
+    """Send heartbeats periodically to keep the WebSocket alive."""
+    while True:
+        try:
+            await websocket.ping()
+            await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log_warning(f"Heartbeat failed: {e}")
+            break
+
+
+def engine_names() -> List[str]:
+    return list(ENGINES)
+
+
+def get_engine(name: str):
+    """Return the engine class registered as `name`."""
+    try:
+        module_name, class_name = ENGINES[name].split(":")
+    except KeyError:
+        raise ValueError(f"Unknown engine {name!r}, expected one of {engine_names()}")
+    return getattr(importlib.import_module(module_name), class_name)
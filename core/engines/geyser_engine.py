@@ -0,0 +1,122 @@
+import asyncio
+from typing import AsyncIterator, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from core.engines.engine import Engine, LogsEvent
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from constants.constants import GEYSER_URL, GEYSER_X_TOKEN
+
+
+class GeyserEngine(Engine):
+    """
+    A Yellowstone-style Geyser gRPC stream instead of JSON over WebSocket:
+    one `Subscribe` call with a transaction filter per program (votes
+    excluded on the server), protobuf frames decoded with the C parser.
+
+    The filter is named after its program ID, so each update says which
+    program it matched. Frames are handed over as raw bytes (see
+    `raw_frames`); log lines are plain UTF-8 inside them, so the substring
+    prefilter runs before anything is parsed. A client ping goes out every
+    `heartbeat_interval` seconds to keep proxies from closing the stream.
+    """
+    name = "geyser"
+    raw_frames = True
+
+    def __init__(self, *args, geyser_url: str = GEYSER_URL, x_token: Optional[str] = GEYSER_X_TOKEN, **kwargs):
+        super().__init__(*args, **kwargs)
+        # grpcio and protobuf are only needed once this engine is selected
+        import grpc
+        from core.engines import geyser_proto
+
+        self._grpc = grpc
+        self._proto = geyser_proto
+        self.geyser_url = geyser_url
+        self.x_token = x_token
+
+    async def _session(self) -> AsyncIterator[LogsEvent]:
+        async for raw in self._frames():
+            event = self.decode(raw)
+            if event is not None:
+                yield event
+
+    async def _frames(self) -> AsyncIterator[bytes]:
+        grpc = self._grpc
+        url = urlsplit(self.geyser_url if "://" in self.geyser_url else f"http://{self.geyser_url}")
+        target = url.netloc or url.path
+        options = [("grpc.max_receive_message_length", -1)]
+        if url.scheme == "https":
+            channel = grpc.aio.secure_channel(target, grpc.ssl_channel_credentials(), options=options)
+        else:
+            channel = grpc.aio.insecure_channel(target, options=options)
+        async with channel:
+            subscribe = channel.stream_stream(
+                self._proto.SUBSCRIBE_METHOD,
+                request_serializer=self._proto.SubscribeRequest.SerializeToString,
+                response_deserializer=None,  # Raw bytes: decoded by whoever processes them
+            )
+            metadata = (("x-token", self.x_token),) if self.x_token else None
+            call = subscribe(self._requests(), metadata=metadata)
+            log_info(f"Subscribed to {len(self.program_ids)} programs over gRPC ({target}).")
+            try:
+                async for raw in call:
+                    yield raw
+            finally:
+                call.cancel()
+
+    async def _requests(self):
+        """The subscription, then a ping every heartbeat interval for as long as the stream lives."""
+        yield self.subscribe_request()
+        ping = 0
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            ping += 1
+            request = self._proto.SubscribeRequest()
+            request.ping.id = ping
+            yield request
+
+    def subscribe_request(self):
+        request = self._proto.SubscribeRequest()
+        for program_id in self.program_ids:
+            transactions = request.transactions[program_id]
+            transactions.vote = False
+            transactions.account_include.append(program_id)
+        if self.commitment:
+            request.commitment = self._proto.COMMITMENT_LEVELS[self.commitment]
+        return request
+
+    def decode(self, raw) -> Optional[LogsEvent]:
+        update = self._proto.SubscribeUpdate.FromString(raw)
+        if not update.HasField("transaction"):
+            if not update.HasField("ping") and not update.HasField("pong"):
+                log_debug(f"Sniffer received update: {update}")
+            return None
+        self.received += 1
+        transaction = update.transaction
+        info = transaction.transaction
+        meta = info.meta
+        return LogsEvent(
+            update.filters[0] if update.filters else self._program_for(None),
+            transaction.slot,
+            info.signature,  # Raw bytes: LogsEvent base58-encodes them if a stage asks
+            meta.err.err.hex() if meta.HasField("err") else None,
+            list(meta.log_messages),
+        )
+
+    def decode_batch(self, frames: List, prefilter: Optional[Sequence[str]] = None) -> List[LogsEvent]:
+        """Decode frames, skipping (but counting) transactions that contain none of the `prefilter` substrings."""
+        markers = [marker.encode() for marker in prefilter] if prefilter else None
+        events = []
+        skipped = 0
+        for raw in frames:
+            # Skipped pings are counted as received too, but there is one every few seconds
+            if markers and not any(marker in raw for marker in markers):
+                self.received += 1
+                skipped += 1
+                continue
+            event = self.decode(raw)
+            if event is not None:
+                events.append(event)
+        if skipped:
+            metrics.incr("batch.prefiltered", skipped)
+        return events
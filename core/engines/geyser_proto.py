@@ -0,0 +1,108 @@
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+# The subset of Yellowstone's geyser.proto / solana-storage.proto this
+# engine reads or writes, with the upstream field numbers, built at import
+# time instead of generated by protoc. Anything else the server sends is
+# carried as unknown fields and never decoded. Declared as proto2 so that
+# explicitly set defaults (vote = false) still go on the wire, as proto3
+# `optional` does upstream.
+SUBSCRIBE_METHOD = "/geyser.Geyser/Subscribe"
+
+FieldDescriptor = descriptor_pb2.FieldDescriptorProto
+OPTIONAL, REPEATED = FieldDescriptor.LABEL_OPTIONAL, FieldDescriptor.LABEL_REPEATED
+
+# message -> [(field, number, label, type or message/enum name)]
+MESSAGES = {
+    # Requests
+    "SubscribeRequestFilterTransactions": [
+        ("vote", 1, OPTIONAL, FieldDescriptor.TYPE_BOOL),
+        ("failed", 2, OPTIONAL, FieldDescriptor.TYPE_BOOL),
+        ("account_include", 3, REPEATED, FieldDescriptor.TYPE_STRING),
+        ("account_exclude", 4, REPEATED, FieldDescriptor.TYPE_STRING),
+        ("signature", 5, OPTIONAL, FieldDescriptor.TYPE_STRING),
+        ("account_required", 6, REPEATED, FieldDescriptor.TYPE_STRING),
+    ],
+    "SubscribeRequestPing": [
+        ("id", 1, OPTIONAL, FieldDescriptor.TYPE_INT32),
+    ],
+    "SubscribeRequest": [
+        ("transactions", 3, REPEATED, "SubscribeRequest.TransactionsEntry"),
+        ("commitment", 6, OPTIONAL, "CommitmentLevel"),
+        ("ping", 9, OPTIONAL, "SubscribeRequestPing"),
+    ],
+    # Updates
+    "TransactionError": [
+        ("err", 1, OPTIONAL, FieldDescriptor.TYPE_BYTES),
+    ],
+    "TransactionStatusMeta": [
+        ("err", 1, OPTIONAL, "TransactionError"),
+        ("fee", 2, OPTIONAL, FieldDescriptor.TYPE_UINT64),
+        ("log_messages", 6, REPEATED, FieldDescriptor.TYPE_STRING),
+        ("log_messages_none", 11, OPTIONAL, FieldDescriptor.TYPE_BOOL),
+    ],
+    "SubscribeUpdateTransactionInfo": [
+        ("signature", 1, OPTIONAL, FieldDescriptor.TYPE_BYTES),
+        ("is_vote", 2, OPTIONAL, FieldDescriptor.TYPE_BOOL),
+        ("meta", 4, OPTIONAL, "TransactionStatusMeta"),
+        ("index", 5, OPTIONAL, FieldDescriptor.TYPE_UINT64),
+    ],
+    "SubscribeUpdateTransaction": [
+        ("transaction", 1, OPTIONAL, "SubscribeUpdateTransactionInfo"),
+        ("slot", 2, OPTIONAL, FieldDescriptor.TYPE_UINT64),
+    ],
+    "SubscribeUpdatePing": [],
+    "SubscribeUpdatePong": [
+        ("id", 1, OPTIONAL, FieldDescriptor.TYPE_INT32),
+    ],
+    "SubscribeUpdate": [
+        ("filters", 1, REPEATED, FieldDescriptor.TYPE_STRING),
+        ("transaction", 4, OPTIONAL, "SubscribeUpdateTransaction"),
+        ("ping", 6, OPTIONAL, "SubscribeUpdatePing"),
+        ("pong", 9, OPTIONAL, "SubscribeUpdatePong"),
+    ],
+}
+COMMITMENT_LEVELS = {"processed": 0, "confirmed": 1, "finalized": 2}
+
+
+def _build_pool() -> descriptor_pool.DescriptorPool:
+    proto = descriptor_pb2.FileDescriptorProto(name="solsniff/geyser.proto", package="geyser", syntax="proto2")
+    enum = proto.enum_type.add(name="CommitmentLevel")
+    for name, number in COMMITMENT_LEVELS.items():
+        enum.value.add(name=name.upper(), number=number)
+
+    for message_name, fields in MESSAGES.items():
+        message = proto.message_type.add(name=message_name)
+        for name, number, label, kind in fields:
+            field = message.field.add(name=name, number=number, label=label)
+            if isinstance(kind, int):
+                field.type = kind
+            else:
+                field.type_name = f".geyser.{kind}"
+                field.type = FieldDescriptor.TYPE_ENUM if kind == "CommitmentLevel" else FieldDescriptor.TYPE_MESSAGE
+
+    # map<string, SubscribeRequestFilterTransactions> transactions = 3
+    entry = proto.message_type[list(MESSAGES).index("SubscribeRequest")].nested_type.add(name="TransactionsEntry")
+    entry.options.map_entry = True
+    entry.field.add(name="key", number=1, label=OPTIONAL, type=FieldDescriptor.TYPE_STRING)
+    entry.field.add(
+        name="value",
+        number=2,
+        label=OPTIONAL,
+        type=FieldDescriptor.TYPE_MESSAGE,
+        type_name=".geyser.SubscribeRequestFilterTransactions",
+    )
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(proto)
+    return pool
+
+
+_pool = _build_pool()
+
+
+def message_class(name: str):
+    return message_factory.GetMessageClass(_pool.FindMessageTypeByName(f"geyser.{name}"))
+
+
+SubscribeRequest = message_class("SubscribeRequest")
+SubscribeUpdate = message_class("SubscribeUpdate")
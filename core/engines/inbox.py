@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, List, Tuple
+
+from core.metrics.metrics import metrics
+from constants.constants import INBOX_MAX_FRAMES, INBOX_OVERFLOW_POLICY
+
+OVERFLOW_POLICIES = ("drop-oldest", "drop-newest", "block")
+
+
+class Inbox:
+    """
+    Bounded hand-off between a connection's reader task and its processing.
+
+    The reader only receives and `put`s, so a slow pipeline never stops
+    socket reads (which is what gets a subscriber dropped by the RPC node).
+    Each item is stamped on arrival; `get_batch` reports how long the oldest
+    one waited. When the inbox is full the policy decides: "drop-oldest"
+    keeps the freshest frames, "drop-newest" keeps the backlog in order,
+    "block" stops reading (the old behaviour, bounded by the socket).
+    Only items `put` as evictable are ever dropped: replies such as a
+    subscription confirmation are kept (past `maxsize` if need be), since
+    losing one loses every notification of that subscription.
+
+    Metrics, suffixed with the inbox name: "inbox.depth", "inbox.lag_ms"
+    (gauges) and "inbox.dropped" (counter).
+    """
+    def __init__(self, name: str, maxsize: int = INBOX_MAX_FRAMES, policy: str = INBOX_OVERFLOW_POLICY):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of {list(OVERFLOW_POLICIES)}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self._items: "deque[Tuple[float, Any, bool]]" = deque()  # (arrived, item, evictable)
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: Any, evictable: bool = True) -> None:
+        """Add an item; only waits under the "block" policy."""
+        items = self._items
+        if len(items) >= self.maxsize:
+            if self.policy == "block":
+                while len(items) >= self.maxsize:
+                    self._writable.clear()
+                    await self._writable.wait()
+            elif self.policy == "drop-newest":
+                if evictable:
+                    self._drop()
+                    return
+            else:
+                self._drop_oldest()
+        items.append((time.monotonic(), item, evictable))
+        self._readable.set()
+
+    def _drop_oldest(self) -> None:
+        items = self._items
+        # The oldest is almost always a notification; skip the odd reply in front of it
+        for index, (_, _, evictable) in enumerate(items):
+            if evictable:
+                del items[index]
+                self._drop()
+                return
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        metrics.incr(f"inbox.dropped.{self.name}")
+
+    async def get_batch(self, max_items: int) -> List[Any]:
+        """Wait for at least one item, then take up to `max_items` in arrival order."""
+        items = self._items
+        while not items:
+            self._readable.clear()
+            await self._readable.wait()
+        count = min(len(items), max_items)
+        oldest = items[0][0]
+        batch = [items.popleft()[1] for _ in range(count)]
+        self._writable.set()
+        metrics.set_gauge(f"inbox.depth.{self.name}", len(items))
+        metrics.set_gauge(f"inbox.lag_ms.{self.name}", round((time.monotonic() - oldest) * 1000, 2))
+        return batch
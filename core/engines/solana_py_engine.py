@@ -0,0 +1,77 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Optional
+
+from core.engines.engine import Engine, LogsEvent, keepalive
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+
+
+class SolanaPyEngine(Engine):
+    """
+    solana-py's `websocket_api.connect` (formerly main1.py): typed requests,
+    frames decoded into solders objects by the library.
+    """
+    name = "solana-py"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # solders is only needed once this engine is selected
+        from solders.rpc import responses
+
+        self._responses = responses
+        # Program ids awaiting a subscription confirmation, in request order
+        self._pending = deque()
+
+    async def _session(self) -> AsyncIterator[LogsEvent]:
+        from solana.rpc.websocket_api import connect
+        from solders.pubkey import Pubkey
+        from solders.rpc.config import RpcTransactionLogsFilterMentions
+
+        async with connect(self.rpc_ws_url, ping_interval=None, max_size=None) as websocket:
+            log_info(f"Connected to Solana WebSocket endpoint ({self.name}).")
+            heartbeat = asyncio.create_task(keepalive(websocket, self.heartbeat_interval))
+            try:
+                self._pending.clear()
+                for program_id in self.program_ids:
+                    self._pending.append(program_id)
+                    await websocket.logs_subscribe(
+                        filter_=RpcTransactionLogsFilterMentions(Pubkey.from_string(program_id)),
+                        commitment=self.commitment,
+                    )
+                log_info(f"Subscription requests sent for {len(self.program_ids)} programs.")
+
+                async for messages in websocket:
+                    for message in messages:
+                        event = self._convert(message)
+                        if event is not None:
+                            yield event
+            finally:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+
+    def decode(self, raw) -> Optional[LogsEvent]:
+        event = None
+        for message in self._responses.parse_websocket_message(raw):
+            event = self._convert(message) or event
+        return event
+
+    def _convert(self, message) -> Optional[LogsEvent]:
+        if isinstance(message, self._responses.LogsNotification):
+            self.received += 1
+            result = message.result
+            value = result.value
+            return LogsEvent(
+                self._program_for(message.subscription),
+                result.context.slot,
+                str(value.signature),
+                value.err,
+                value.logs,
+            )
+        if isinstance(message, self._responses.SubscriptionResult):
+            program_id = self._pending.popleft() if self._pending else None
+            if program_id is not None:
+                self.subscriptions[message.result] = program_id
+            log_info(f"Subscribed to {program_id}. ID: {message.result}")
+        else:
+            log_debug(f"Sniffer received message: {message}")
+        return None
@@ -0,0 +1,168 @@
+import asyncio
+import contextlib
+import json
+from typing import AsyncIterator, List, Optional, Sequence
+
+from core.engines.engine import Engine, LogsEvent, keepalive
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+
+NOTIFICATION_METHOD = "logsNotification"
+NOTIFICATION_BYTES = NOTIFICATION_METHOD.encode()
+
+
+def buffered_frames(websocket) -> Optional[int]:
+    """Frames received but not read yet, if this websockets version exposes it."""
+    assembler = getattr(websocket, "recv_messages", None)  # websockets >= 13, asyncio API
+    if assembler is not None and hasattr(assembler, "frames"):
+        return len(assembler.frames)
+    messages = getattr(websocket, "messages", None)  # Legacy API
+    if messages is not None:
+        return len(messages)
+    return None
+
+
+class WebsocketsEngine(Engine):
+    """
+    Raw JSON-RPC over the `websockets` library (formerly main_01.py,
+    main_o1_2.py and main_o1_3.py): hand-built requests, json.loads per frame
+    (or per drained batch of frames, see `batches`).
+    """
+    name = "websockets"
+    raw_frames = True
+
+    async def _session(self) -> AsyncIterator[LogsEvent]:
+        async for raw in self._frames():
+            event = self.decode(raw)
+            if event is not None:
+                yield event
+
+    async def _frames(self) -> AsyncIterator:
+        async with self._connection() as websocket:
+            while True:
+                yield await websocket.recv()
+
+    async def _batch_session(self, max_batch: int, prefilter: Optional[Sequence[str]]) -> AsyncIterator[List[LogsEvent]]:
+        async with self._connection() as websocket:
+            while True:
+                # Wait for one frame, then take whatever else is already buffered
+                batch = [await websocket.recv()]
+                while len(batch) < max_batch:
+                    buffered = buffered_frames(websocket)
+                    if buffered == 0:
+                        break
+                    if buffered is not None:
+                        batch.append(await websocket.recv())
+                        continue
+                    try:
+                        # Expires on the next loop iteration, i.e. only if recv() would wait
+                        async with asyncio.timeout(0):
+                            batch.append(await websocket.recv())
+                    except TimeoutError:
+                        break
+                yield self.decode_batch(batch, prefilter)
+
+    @contextlib.asynccontextmanager
+    async def _connection(self):
+        """Connect, subscribe and keep the socket alive for one session."""
+        import websockets
+
+        async with websockets.connect(
+            self.rpc_ws_url,
+            ping_interval=None,
+            close_timeout=10,
+            max_size=None,
+        ) as websocket:
+            log_info(f"Connected to Solana WebSocket endpoint ({self.name}).")
+            heartbeat = asyncio.create_task(keepalive(websocket, self.heartbeat_interval))
+            try:
+                for request_id, program_id in enumerate(self.program_ids, start=1):
+                    await websocket.send(json.dumps(self.subscribe_request(request_id, program_id)))
+                log_info(f"Subscription requests sent for {len(self.program_ids)} programs.")
+                yield websocket
+            finally:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+
+    def subscribe_request(self, request_id: int, program_id: str) -> dict:
+        params = [{"mentions": [program_id]}]
+        if self.commitment:
+            params.append({"commitment": self.commitment})
+        return {"jsonrpc": "2.0", "id": request_id, "method": "logsSubscribe", "params": params}
+
+    def decode(self, raw) -> Optional[LogsEvent]:
+        return self._from_message(json.loads(raw))
+
+    def is_notification(self, raw) -> bool:
+        return (NOTIFICATION_BYTES if isinstance(raw, bytes) else NOTIFICATION_METHOD) in raw
+
+    def decode_batch(self, frames: List, prefilter: Optional[Sequence[str]] = None) -> List[LogsEvent]:
+        """
+        Decode many frames with a single json.loads.
+
+        Notifications containing none of the `prefilter` substrings are
+        counted but never parsed. If the batch does not parse, its frames
+        are parsed one by one and only the bad ones are dropped (counted in
+        decode.errors), so one corrupt frame costs neither the batch nor
+        the connection.
+        """
+        wanted = []
+        bad = 0
+        for raw in frames:
+            if isinstance(raw, bytes):
+                try:
+                    raw = raw.decode()
+                except UnicodeDecodeError:
+                    bad += 1
+                    continue
+            if prefilter and NOTIFICATION_METHOD in raw and not any(marker in raw for marker in prefilter):
+                self.received += 1
+                continue
+            wanted.append(raw)
+        skipped = len(frames) - len(wanted) - bad
+        if skipped:
+            metrics.incr("batch.prefiltered", skipped)
+
+        try:
+            messages = json.loads("[" + ",".join(wanted) + "]") if wanted else []
+        except ValueError:
+            messages = []
+            for raw in wanted:
+                try:
+                    messages.append(json.loads(raw))
+                except ValueError:
+                    bad += 1
+        if bad:
+            metrics.incr("decode.errors", bad)
+            log_warning(f"({self.name}) Dropped {bad} undecodable frames of a batch of {len(frames)}.")
+
+        events = []
+        for message in messages:
+            event = self._from_message(message)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _from_message(self, data: dict) -> Optional[LogsEvent]:
+        if data.get("method") == NOTIFICATION_METHOD:
+            self.received += 1
+            params = data["params"]
+            result = params["result"]
+            value = result["value"]
+            return LogsEvent(
+                self._program_for(params.get("subscription")),
+                result["context"]["slot"],
+                value.get("signature"),
+                value.get("err"),
+                value["logs"],
+            )
+
+        if "error" in data:
+            log_error(f"Received error from Solana: {data['error']}")
+        elif "result" in data and isinstance(data.get("id"), int) and 0 < data["id"] <= len(self.program_ids):
+            program_id = self.program_ids[data["id"] - 1]
+            self.subscriptions[data["result"]] = program_id
+            log_info(f"Subscribed to {program_id}. ID: {data['result']}")
+        else:
+            log_debug(f"Sniffer received message: {data}")
+        return None
@@ -0,0 +1,455 @@
+import asyncio
+import base64
+import heapq
+import itertools
+import struct
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from core.runtime.runtime import run_sync
+from core.utils.rate_limiter import RateLimiter
+from constants.constants import (
+    RPC_HTTP_URL,
+    RATE_LIMIT,
+    ENRICHMENT_WORKERS,
+    ENRICHMENT_DEADLINE,
+    ENRICHMENT_EXPIRED_POLICY,
+    WATCHED_AUTHORITIES,
+    ENRICHMENT_LOOKUPS,
+    ENRICHMENT_LOOKUP_DEADLINE,
+    ENRICHMENT_MAX_QUEUED,
+    METAPLEX_METADATA_PROGRAM_ID,
+)
+
+RAYDIUM_TOKEN_LIST_URL = "https://api.raydium.io/v2/sdk/token/solana"
+
+# Enrichment priorities (lower goes first)
+PRIORITY_WATCHED = 0    # Minted by a watched authority
+PRIORITY_POOL = 1       # Already has a Raydium pool
+PRIORITY_NORMAL = 2
+
+
+###############################################################################
+# Metaplex Metadata
+###############################################################################
+# Metadata account (Borsh): key u8 | update authority [32] | mint [32] |
+# name, symbol, uri as u32 length + bytes (NUL padded to a fixed size) | ...
+METADATA_STRINGS_OFFSET = 1 + 32 + 32
+BORSH_U32 = struct.Struct("<I")
+
+
+def metadata_address(mint_address: str) -> str:
+    """Derive the Metaplex metadata PDA of a mint."""
+    from solders.pubkey import Pubkey
+
+    program_id = Pubkey.from_string(METAPLEX_METADATA_PROGRAM_ID)
+    seeds = [b"metadata", bytes(program_id), bytes(Pubkey.from_string(mint_address))]
+    address, _bump = Pubkey.find_program_address(seeds, program_id)
+    return str(address)
+
+
+def decode_metadata(data) -> Dict[str, str]:
+    """
+    Read name, symbol and uri from a metadata account's raw bytes.
+
+    Works on a memoryview; only the three strings are copied out.
+    """
+    view = memoryview(data)
+    offset = METADATA_STRINGS_OFFSET
+    fields = {}
+    for field in ("name", "symbol", "uri"):
+        (length,) = BORSH_U32.unpack_from(view, offset)
+        offset += 4
+        if offset + length > len(view):
+            raise ValueError(f"Metadata {field} runs past the end of the account")
+        fields[field] = str(view[offset: offset + length], "utf-8", "replace").rstrip("\0")
+        offset += length
+    return fields
+
+
+###############################################################################
+# Extended Token Info
+###############################################################################
+class ExtendedTokenInfo:
+    """
+    Stores extended info about a token:
+      - decimals
+      - supply
+      - is_mintable (if there's a mintAuthority)
+      - token_name, symbol, uri (Metaplex metadata)
+      - dex_listings
+
+    Each lookup fills its own attributes (see LOOKUPS), so they can run
+    concurrently on one instance.
+    """
+    # Lookup name -> (method, fields it fills in to_dict())
+    LOOKUPS = {
+        "mint": ("fetch_on_chain_info", ("decimals", "supply", "is_mintable")),
+        "metadata": ("fetch_metadata", ("name", "symbol", "uri")),
+        "dex": ("find_dex_listings", ("dex_listings",)),
+    }
+
+    def __init__(self, mint_address: str, rpc_http_url: str = RPC_HTTP_URL):
+        self.mint_address = mint_address
+        self.rpc_http_url = rpc_http_url
+        self.decimals = None
+        self.supply = None
+        self.is_mintable = None
+        self.token_name = None
+        self.symbol = None
+        self.uri = None
+        self.dex_listings = []
+
+    def fetch_on_chain_info(self):
+        """Get decimals, supply, and mint authority presence from on-chain data."""
+        import requests
+
+        try:
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getAccountInfo",
+                "params": [
+                    self.mint_address,
+                    {"encoding": "jsonParsed"}
+                ]
+            }
+            headers = {"Content-Type": "application/json"}
+            response = requests.post(self.rpc_http_url, json=payload, headers=headers, timeout=10)
+            result_json = response.json()
+
+            account_info = result_json.get("result", {}).get("value")
+            if not account_info:
+                log_debug(f"No account info found for {self.mint_address}")
+                return
+
+            data = account_info.get("data", {})
+            if not isinstance(data, dict):
+                return
+
+            parsed = data.get("parsed", {})
+            if parsed.get("type") != "mint":
+                return
+
+            info = parsed.get("info", {})
+            self.decimals = info.get("decimals")
+            raw_supply = info.get("supply")  # string
+            self.supply = float(raw_supply) if raw_supply else 0.0
+            mint_authority = info.get("mintAuthority")
+            self.is_mintable = (mint_authority is not None)
+
+        except Exception as e:
+            log_error(f"Error fetching on-chain info for {self.mint_address}: {e}")
+
+    def fetch_metadata(self):
+        """Get name, symbol and uri from the mint's Metaplex metadata account."""
+        import requests
+
+        try:
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getAccountInfo",
+                "params": [
+                    metadata_address(self.mint_address),
+                    {"encoding": "base64"}
+                ]
+            }
+            headers = {"Content-Type": "application/json"}
+            response = requests.post(self.rpc_http_url, json=payload, headers=headers, timeout=10)
+            account_info = response.json().get("result", {}).get("value")
+            if not account_info:
+                log_debug(f"No metadata account found for {self.mint_address}")
+                return
+
+            fields = decode_metadata(base64.b64decode(account_info["data"][0]))
+            self.token_name = fields["name"] or None
+            self.symbol = fields["symbol"] or None
+            self.uri = fields["uri"] or None
+
+        except Exception as e:
+            log_error(f"Error fetching metadata for {self.mint_address}: {e}")
+
+    def find_dex_listings(self):
+        """
+        For demonstration, only checks Raydium.
+        You can add more DEX checks here in the future (Serum, Orca, etc.).
+        """
+        import requests
+
+        self.dex_listings.clear()
+
+        try:
+            raydium_response = requests.get(RAYDIUM_TOKEN_LIST_URL, timeout=10)
+            if raydium_response.ok:
+                tokens_list = raydium_response.json()
+                if self.mint_address in tokens_list.get("official", []):
+                    self.dex_listings.append("Raydium")
+        except Exception as e:
+            log_debug(f"Raydium check error: {e}")
+
+    def to_dict(self, lookups: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Return the fetched details as a plain dict (for sinks), optionally only those of `lookups`."""
+        fields = {
+            "name": self.token_name,
+            "symbol": self.symbol,
+            "uri": self.uri,
+            "decimals": self.decimals,
+            "supply": self.supply,
+            "is_mintable": self.is_mintable,
+            "dex_listings": list(self.dex_listings),
+        }
+        if lookups is None:
+            return fields
+        wanted = {name for lookup in lookups for name in self.LOOKUPS[lookup][1]}
+        return {name: value for name, value in fields.items() if name in wanted}
+
+
+###############################################################################
+# Scheduler
+###############################################################################
+class EnrichmentScheduler:
+    """
+    Mints waiting for enrichment, most urgent first.
+
+    Lower priority values go first and, within a priority, the oldest
+    submission (earliest deadline). A queued mint can be moved up with
+    `promote`; it keeps its original submission time, so promotion never
+    extends its deadline. At most `max_size` mints are queued; `put` rejects
+    the rest.
+    """
+    def __init__(self, max_size: int = ENRICHMENT_MAX_QUEUED):
+        self.max_size = max_size
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}    # mint -> live heap entry
+        self._counter = itertools.count()
+        self._available = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, mint_address: str) -> bool:
+        return mint_address in self._entries
+
+    def put(self, mint_address: str, priority: int = PRIORITY_NORMAL, submitted_at: Optional[float] = None) -> bool:
+        """Queue a mint. Returns False if the queue is full."""
+        if mint_address in self._entries:
+            self.promote(mint_address, priority)
+            return True
+        if len(self._entries) >= self.max_size:
+            return False
+        if submitted_at is None:
+            submitted_at = time.monotonic()
+        self._push([priority, submitted_at, next(self._counter), mint_address])
+        return True
+
+    def promote(self, mint_address: str, priority: int) -> bool:
+        """Raise a queued mint to `priority`. Returns False if it is not queued or already higher."""
+        entry = self._entries.get(mint_address)
+        if entry is None or entry[0] <= priority:
+            return False
+        entry[-1] = None  # Leave the old entry in the heap as a tombstone
+        self._push([priority, entry[1], next(self._counter), mint_address])
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            # Mostly tombstones: rebuild so promotions cannot grow the heap forever
+            self._heap = [item for item in self._heap if item[-1] is not None]
+            heapq.heapify(self._heap)
+        return True
+
+    async def get(self) -> Tuple[str, int, float]:
+        """Wait for the most urgent mint. Returns (mint, priority, seconds queued)."""
+        while True:
+            while self._heap:
+                priority, submitted_at, _, mint_address = heapq.heappop(self._heap)
+                if mint_address is None:
+                    continue
+                del self._entries[mint_address]
+                return mint_address, priority, time.monotonic() - submitted_at
+            self._available.clear()
+            await self._available.wait()
+
+    def items(self) -> List[Tuple[str, int, float]]:
+        """(mint, priority, submitted_at) for every queued mint, most urgent first."""
+        return [(entry[-1], entry[0], entry[1]) for entry in sorted(self._entries.values())]
+
+    def _push(self, entry: list) -> None:
+        heapq.heappush(self._heap, entry)
+        self._entries[entry[-1]] = entry
+        self._available.set()
+
+
+###############################################################################
+# Enricher
+###############################################################################
+class Enricher:
+    """
+    Looks up on-chain info, Metaplex metadata and DEX listings for detected mints.
+
+    Mints are queued with `submit` on an EnrichmentScheduler; `workers`
+    tasks take the most urgent one and start all of its `lookups` at once
+    (RPC lookups wait for the shared rate limiter, and the blocking HTTP
+    calls run on the runtime's executor). Whatever has finished after
+    `lookup_deadline` seconds is emitted as an "enrichment" event listing
+    the lookups still `pending`; each of those is emitted as an
+    "enrichment_update" when it lands.
+
+    A mint still queued `deadline` seconds after submission has expired:
+    with the "drop" policy it is skipped, with "downgrade" it only gets the
+    on-chain lookups and is emitted with `stale` set. Both are counted.
+    """
+    def __init__(
+        self,
+        emit: Callable[[Dict[str, Any]], None],
+        rpc_http_url: str = RPC_HTTP_URL,
+        rate_limit: int = RATE_LIMIT,
+        workers: int = ENRICHMENT_WORKERS,
+        check_dex: bool = True,
+        deadline: float = ENRICHMENT_DEADLINE,
+        expired_policy: str = ENRICHMENT_EXPIRED_POLICY,
+        watched_authorities: Iterable[str] = WATCHED_AUTHORITIES,
+        lookups: Iterable[str] = ENRICHMENT_LOOKUPS,
+        lookup_deadline: float = ENRICHMENT_LOOKUP_DEADLINE,
+        max_queued: int = ENRICHMENT_MAX_QUEUED,
+    ):
+        if expired_policy not in ("drop", "downgrade"):
+            raise ValueError(f"Unknown expired policy {expired_policy!r}, expected 'drop' or 'downgrade'")
+        unknown = set(lookups) - set(ExtendedTokenInfo.LOOKUPS)
+        if unknown:
+            raise ValueError(f"Unknown lookups {sorted(unknown)}, expected some of {list(ExtendedTokenInfo.LOOKUPS)}")
+        self.emit = emit
+        self.rpc_http_url = rpc_http_url
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.workers = workers
+        self.check_dex = check_dex
+        self.deadline = deadline
+        self.expired_policy = expired_policy
+        self.watched_authorities = set(watched_authorities)
+        self.lookups = [name for name in lookups if check_dex or name != "dex"]
+        self.lookup_deadline = lookup_deadline
+        self.max_queued = max_queued
+        self.queue: Optional[EnrichmentScheduler] = None
+        self.expired = 0
+        # Lookups skipped while the sniffer is overloaded (see core/overload/overload.py)
+        self.shed_lookups: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._follow_ups: Set[asyncio.Task] = set()
+        # mint -> (priority, submitted_at) while a worker enriches it
+        self.active: Dict[str, Tuple[int, float]] = {}
+
+    async def start(self) -> None:
+        self.queue = EnrichmentScheduler(self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def submit(self, mint_address: str, authority: Optional[str] = None, priority: Optional[int] = None) -> None:
+        if priority is None:
+            priority = PRIORITY_WATCHED if authority in self.watched_authorities else PRIORITY_NORMAL
+        if not self.queue.put(mint_address, priority):
+            metrics.incr("enrichment.rejected")
+        metrics.set_gauge("enrichment.queued", len(self.queue))
+
+    def promote(self, mint_address: str, priority: int = PRIORITY_POOL) -> bool:
+        """Move a mint that is still waiting up the queue (e.g. it just got a pool)."""
+        return self.queue.promote(mint_address, priority)
+
+    @property
+    def busy(self) -> bool:
+        """True while mints are queued or being enriched."""
+        return bool(self.active) or (self.queue is not None and len(self.queue) > 0)
+
+    def snapshot(self) -> List[list]:
+        """[mint, priority, seconds since submission] for queued and in-flight mints."""
+        now = time.monotonic()
+        items = [(mint, priority, submitted_at) for mint, (priority, submitted_at) in self.active.items()]
+        items += self.queue.items() if self.queue is not None else []
+        return [[mint, priority, now - submitted_at] for mint, priority, submitted_at in items]
+
+    def restore(self, items: Iterable[list], downtime: float = 0.0) -> None:
+        """Queue `snapshot()` items again; the downtime counts towards their deadline."""
+        now = time.monotonic()
+        for mint_address, priority, age in items:
+            if not self.queue.put(mint_address, priority, submitted_at=now - age - downtime):
+                metrics.incr("enrichment.rejected")
+        metrics.set_gauge("enrichment.queued", len(self.queue))
+
+    async def stop(self) -> None:
+        tasks = self._tasks + list(self._follow_ups)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._follow_ups.clear()
+
+    async def enrich(self, mint_address: str, lookups: Optional[Iterable[str]] = None) -> ExtendedTokenInfo:
+        """Run every lookup for one mint concurrently and wait for all of them."""
+        token_info = ExtendedTokenInfo(mint_address, self.rpc_http_url)
+        await asyncio.gather(*(self._lookup(token_info, name) for name in (lookups or self.lookups)))
+        return token_info
+
+    async def _lookup(self, token_info: ExtendedTokenInfo, name: str) -> str:
+        if name != "dex":  # The DEX list is not an RPC call
+            await self.rate_limiter.wait()
+        method, _fields = ExtendedTokenInfo.LOOKUPS[name]
+        await run_sync(getattr(token_info, method))
+        return name
+
+    async def _worker(self) -> None:
+        while True:
+            mint_address, priority, waited = await self.queue.get()
+            metrics.set_gauge("enrichment.queued", len(self.queue))
+            stale = waited > self.deadline
+            lookups = self.lookups
+            if stale:
+                self.expired += 1
+                metrics.incr("enrichment.expired")
+                if self.expired_policy == "drop":
+                    log_debug(f"Enrichment for {mint_address} expired after {waited:.1f}s, dropped")
+                    continue
+                metrics.incr("enrichment.downgraded")
+                lookups = [name for name in lookups if name != "dex"]
+            if self.shed_lookups:
+                shed = [name for name in lookups if name in self.shed_lookups]
+                if shed:
+                    metrics.incr("shed.lookups", len(shed))
+                    lookups = [name for name in lookups if name not in self.shed_lookups]
+            self.active[mint_address] = (priority, time.monotonic() - waited)
+            try:
+                await self._enrich_and_emit(mint_address, lookups, stale)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_error(f"Enrichment failed for {mint_address}: {e}")
+            # Left in place on cancellation, so a shutdown snapshot still has the mint
+            del self.active[mint_address]
+
+    async def _enrich_and_emit(self, mint_address: str, lookups: List[str], stale: bool) -> None:
+        token_info = ExtendedTokenInfo(mint_address, self.rpc_http_url)
+        tasks = [asyncio.create_task(self._lookup(token_info, name)) for name in lookups]
+        done, pending = await asyncio.wait(tasks, timeout=self.lookup_deadline)
+
+        event = {"type": "enrichment", "mint": mint_address, **token_info.to_dict(task.result() for task in done)}
+        if pending:
+            event["pending"] = sorted(lookups[tasks.index(task)] for task in pending)
+            metrics.incr("enrichment.late_lookups", len(pending))
+            follow_up = asyncio.create_task(self._emit_late(token_info, pending))
+            self._follow_ups.add(follow_up)
+            follow_up.add_done_callback(self._follow_ups.discard)
+        if stale:
+            event["stale"] = True
+        self.emit(event)
+
+    async def _emit_late(self, token_info: ExtendedTokenInfo, pending: Set[asyncio.Task]) -> None:
+        """Emit each lookup that missed the deadline as it finishes."""
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    self.emit({
+                        "type": "enrichment_update",
+                        "mint": token_info.mint_address,
+                        **token_info.to_dict([task.result()]),
+                    })
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,380 @@
+import asyncio
+import base64
+import json
+import struct
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from core.runtime.runtime import run_sync
+from constants.constants import (
+    RPC_HTTP_URL,
+    EXECUTION_BLOCKHASH_REFRESH,
+    EXECUTION_MAX_BLOCKHASH_AGE,
+    EXECUTION_SLOT_DURATION,
+    EXECUTION_POOL_SIZE,
+    EXECUTION_SUBMIT_TIMEOUT,
+    EXECUTION_COMPUTE_UNIT_LIMIT,
+    EXECUTION_COMPUTE_UNIT_PRICE,
+)
+
+# Placeholders compiled into templates and patched per transaction. Account
+# keys and the blockhash sit at fixed places in a legacy message (after the
+# 3-byte header and the key count), so their offsets come from the layout;
+# the amount, inside instruction data, is found by searching for its pattern.
+PLACEHOLDER_MINT = bytes([0xA1]) * 32
+PLACEHOLDER_TOKEN_ACCOUNT = bytes([0xA2]) * 32
+PLACEHOLDER_BLOCKHASH = bytes([0xA3]) * 32
+AMOUNT = struct.Struct("<Q")
+PLACEHOLDER_AMOUNT = 0xA4A4A4A4A4A4A4A4
+
+
+def load_keypair(path: str):
+    """A Solana CLI keypair file (JSON array of 64 bytes)."""
+    from solders.keypair import Keypair
+
+    with open(path) as f:
+        return Keypair.from_bytes(bytes(json.load(f)))
+
+
+def rpc_call(session, url: str, method: str, params: Optional[list] = None, timeout: float = EXECUTION_SUBMIT_TIMEOUT) -> Any:
+    """One JSON-RPC call over a pooled requests.Session. Returns `result` or raises."""
+    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []}
+    response = session.post(url, json=payload, timeout=timeout)
+    body = response.json()
+    if "error" in body:
+        raise ValueError(f"{method} failed: {body['error']}")
+    return body["result"]
+
+
+def new_session(pool_size: int = EXECUTION_POOL_SIZE):
+    """A requests.Session whose connections are kept alive and reused."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Content-Type"] = "application/json"
+    return session
+
+
+###############################################################################
+# Blockhash & Slot Clock
+###############################################################################
+class BlockhashCache:
+    """
+    The latest blockhash and a slot clock, refreshed in the background so
+    nothing on the execution path waits for an RPC round trip.
+
+    Between refreshes the current slot is extrapolated from the last
+    observed one at `slot_duration` seconds per slot.
+    """
+    def __init__(
+        self,
+        rpc_http_url: str = RPC_HTTP_URL,
+        refresh_interval: float = EXECUTION_BLOCKHASH_REFRESH,
+        max_age: float = EXECUTION_MAX_BLOCKHASH_AGE,
+        slot_duration: float = EXECUTION_SLOT_DURATION,
+    ):
+        self.rpc_http_url = rpc_http_url
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.slot_duration = slot_duration
+        self.blockhash: Optional[bytes] = None
+        self.last_valid_block_height: Optional[int] = None
+        self.slot: Optional[int] = None
+        self.fetched_at = 0.0
+        self._session = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._session = new_session(1)
+        await self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def refresh(self) -> None:
+        try:
+            blockhash, last_valid, slot = await run_sync(self._fetch)
+        except Exception as e:
+            metrics.incr("execution.blockhash_errors")
+            log_warning(f"Blockhash refresh failed: {e}")
+            return
+        from solders.hash import Hash
+
+        self.blockhash = bytes(Hash.from_string(blockhash))
+        self.last_valid_block_height = last_valid
+        self.slot = slot
+        self.fetched_at = time.monotonic()
+        metrics.set_gauge("execution.slot", slot)
+
+    def _fetch(self) -> Tuple[str, int, int]:
+        latest = rpc_call(self._session, self.rpc_http_url, "getLatestBlockhash", [{"commitment": "confirmed"}])
+        value = latest["value"]
+        return value["blockhash"], value["lastValidBlockHeight"], latest["context"]["slot"]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def current(self) -> bytes:
+        """The cached blockhash; raises if there is none young enough to land."""
+        if self.blockhash is None or self.age > self.max_age:
+            raise RuntimeError(f"No blockhash fresher than {self.max_age}s")
+        return self.blockhash
+
+    def current_slot(self) -> Optional[int]:
+        if self.slot is None:
+            return None
+        return self.slot + int(self.age / self.slot_duration)
+
+
+###############################################################################
+# Templates
+###############################################################################
+class TransactionTemplate:
+    """
+    A transaction compiled and serialized once, with the per-trade parts
+    left as placeholders at known offsets.
+
+    `instructions` (solders Instructions, signed by `payer` alone) may use
+    PLACEHOLDER_MINT and PLACEHOLDER_TOKEN_ACCOUNT as account keys and
+    PLACEHOLDER_AMOUNT as a u64 in instruction data. `build` copies the
+    message, writes the mint, the payer's associated token account for it,
+    the amount and the blockhash over the placeholders, signs it and
+    returns the wire transaction; nothing is compiled or re-serialized.
+    """
+    def __init__(self, name: str, payer, instructions: Iterable):
+        from solders.hash import Hash
+        from solders.message import Message
+
+        self.name = name
+        self.payer = payer
+        compiled = Message.new_with_blockhash(list(instructions), payer.pubkey(), Hash(PLACEHOLDER_BLOCKHASH))
+        message = bytes(compiled)
+        if message[0] != 1:
+            raise ValueError(f"Template {name!r} needs {message[0]} signatures; only the payer can sign")
+        self.message = message
+        # Searching for a key's bytes could also match across the edge of a
+        # neighbouring key that happens to end in the same byte
+        keys = [bytes(key) for key in compiled.account_keys]
+        keys_offset = 3 + (1 if len(keys) < 0x80 else 2)  # Header, then the key count as a compact-u16
+        self.mint_offset = self._key_offset(keys, keys_offset, PLACEHOLDER_MINT)
+        self.token_account_offset = self._key_offset(keys, keys_offset, PLACEHOLDER_TOKEN_ACCOUNT)
+        self.blockhash_offset = keys_offset + 32 * len(keys)
+        self.amount_offset = self._offset(AMOUNT.pack(PLACEHOLDER_AMOUNT))
+        if self.mint_offset is None:
+            raise ValueError(f"Template {name!r} does not reference the mint placeholder")
+        if message[self.blockhash_offset: self.blockhash_offset + 32] != PLACEHOLDER_BLOCKHASH:
+            raise ValueError(f"Template {name!r} did not compile to a legacy message")
+
+    def _key_offset(self, keys: List[bytes], keys_offset: int, placeholder: bytes) -> Optional[int]:
+        if placeholder not in keys:
+            return None
+        return keys_offset + 32 * keys.index(placeholder)
+
+    def _offset(self, pattern: bytes) -> Optional[int]:
+        offset = self.message.find(pattern)
+        if offset != -1 and self.message.find(pattern, offset + 1) != -1:
+            raise ValueError(f"Template {self.name!r} uses a placeholder more than once")
+        return offset if offset != -1 else None
+
+    def build(self, mint: str, blockhash: bytes, amount: Optional[int] = None) -> Tuple[bytes, bytes]:
+        """Patch and sign. Returns (wire transaction, signature bytes)."""
+        from solders.pubkey import Pubkey
+        from spl.token.instructions import get_associated_token_address
+
+        mint_key = Pubkey.from_string(mint)
+        message = bytearray(self.message)
+        message[self.mint_offset: self.mint_offset + 32] = bytes(mint_key)
+        if self.token_account_offset is not None:
+            token_account = get_associated_token_address(self.payer.pubkey(), mint_key)
+            message[self.token_account_offset: self.token_account_offset + 32] = bytes(token_account)
+        if self.amount_offset is not None:
+            if amount is None:
+                raise ValueError(f"Template {self.name!r} needs an amount")
+            AMOUNT.pack_into(message, self.amount_offset, amount)
+        message[self.blockhash_offset: self.blockhash_offset + 32] = blockhash
+        message = bytes(message)
+        signature = bytes(self.payer.sign_message(message))
+        return b"\x01" + signature + message, signature
+
+
+def create_ata_template(
+    payer,
+    compute_unit_limit: int = EXECUTION_COMPUTE_UNIT_LIMIT,
+    compute_unit_price: int = EXECUTION_COMPUTE_UNIT_PRICE,
+) -> TransactionTemplate:
+    """Open the payer's token account for the new mint (the first leg of any buy), with a priority fee."""
+    from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+    from solders.pubkey import Pubkey
+    from spl.token.instructions import create_idempotent_associated_token_account
+
+    instruction = create_idempotent_associated_token_account(payer.pubkey(), payer.pubkey(), Pubkey(PLACEHOLDER_MINT))
+    # The library derives the token account from the placeholder mint: swap in the placeholder
+    accounts = list(instruction.accounts)
+    accounts[1] = type(accounts[1])(Pubkey(PLACEHOLDER_TOKEN_ACCOUNT), accounts[1].is_signer, accounts[1].is_writable)
+    instruction = type(instruction)(instruction.program_id, instruction.data, accounts)
+    return TransactionTemplate(
+        "create-ata",
+        payer,
+        [set_compute_unit_limit(compute_unit_limit), set_compute_unit_price(compute_unit_price), instruction],
+    )
+
+
+TEMPLATES: Dict[str, Callable[..., TransactionTemplate]] = {
+    "create-ata": create_ata_template,
+}
+
+
+###############################################################################
+# Submission
+###############################################################################
+class Submitter:
+    """
+    Sends a signed transaction to every endpoint at once over kept-alive
+    connections (one pooled session per endpoint). The first endpoint to
+    accept it wins; the others are duplicates the cluster deduplicates.
+
+    At most `pool_size` transactions are in flight at once, one connection
+    per endpoint each, until every endpoint has answered; the rest wait for
+    a free connection here rather than in the executor's queue.
+    """
+    def __init__(self, endpoints: Iterable[str], pool_size: int = EXECUTION_POOL_SIZE, timeout: float = EXECUTION_SUBMIT_TIMEOUT):
+        self.endpoints = list(endpoints)
+        if not self.endpoints:
+            raise ValueError("At least one submission endpoint is needed")
+        self.timeout = timeout
+        self.sessions = {url: new_session(pool_size) for url in self.endpoints}
+        self._slots = asyncio.Semaphore(pool_size)
+        self._stragglers: set = set()  # Sends still running after another endpoint won
+
+    async def close(self) -> None:
+        await asyncio.gather(*self._stragglers, return_exceptions=True)
+        for session in self.sessions.values():
+            session.close()
+
+    def _send(self, url: str, encoded: str) -> Tuple[str, str]:
+        params = [encoded, {"encoding": "base64", "skipPreflight": True, "maxRetries": 0}]
+        return url, rpc_call(self.sessions[url], url, "sendTransaction", params, self.timeout)
+
+    async def submit(self, transaction: bytes) -> Tuple[str, str, float]:
+        """
+        Returns (endpoint, signature) from the first endpoint that accepted
+        it, and the seconds spent waiting for a free connection.
+        """
+        encoded = base64.b64encode(transaction).decode("ascii")
+        queued = time.monotonic()
+        await self._slots.acquire()
+        waited = time.monotonic() - queued
+        pending = {asyncio.ensure_future(run_sync(self._send, url, encoded)) for url in self.endpoints}
+        unanswered = [len(pending)]
+
+        def answered(_: asyncio.Future) -> None:
+            unanswered[0] -= 1
+            if not unanswered[0]:
+                self._slots.release()
+        for future in pending:
+            future.add_done_callback(answered)
+        errors = []
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        self._stragglers.add(other)
+                        other.add_done_callback(self._straggler_done)
+                    return future.result() + (waited,)
+                errors.append(future.exception())
+                metrics.incr("execution.submit_errors")
+        raise RuntimeError(f"Every endpoint rejected the transaction: {errors}")
+
+    def _straggler_done(self, future: asyncio.Future) -> None:
+        self._stragglers.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            metrics.incr("execution.submit_errors")
+
+
+###############################################################################
+# Executor
+###############################################################################
+class Executor:
+    """
+    Turns detections into signed, submitted transactions off the detection
+    path: the blockhash is already cached and the template already
+    serialized, so the only work left per mint is patch, sign and send.
+    Each attempt is reported as an "execution" event.
+    """
+    def __init__(
+        self,
+        template: TransactionTemplate,
+        emit: Callable[[Dict[str, Any]], None],
+        submit_urls: Iterable[str] = (RPC_HTTP_URL,),
+        rpc_http_url: str = RPC_HTTP_URL,
+        amount: Optional[int] = None,
+        blockhash: Optional[BlockhashCache] = None,
+    ):
+        self.template = template
+        self.emit = emit
+        self.amount = amount
+        self.blockhash = blockhash or BlockhashCache(rpc_http_url)
+        self.submitter = Submitter(submit_urls)
+        self.executed = 0
+        self._inflight: set = set()
+
+    async def start(self) -> None:
+        await self.blockhash.start()
+        log_info(
+            f"Executing {self.template.name!r} for {self.template.payer.pubkey()} "
+            f"through {len(self.submitter.endpoints)} endpoints."
+        )
+
+    async def stop(self) -> None:
+        await asyncio.gather(*self._inflight, return_exceptions=True)
+        await self.blockhash.stop()
+        await self.submitter.close()
+
+    def execute(self, mint: str, detected_at: Optional[float] = None) -> asyncio.Task:
+        """Build, sign and submit for `mint` in the background."""
+        task = asyncio.create_task(self._execute(mint, detected_at))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        return task
+
+    async def _execute(self, mint: str, detected_at: Optional[float]) -> None:
+        started = time.monotonic()
+        event = {"type": "execution", "mint": mint, "template": self.template.name, "slot": self.blockhash.current_slot()}
+        try:
+            transaction, signature = self.template.build(mint, self.blockhash.current(), self.amount)
+            built = time.monotonic()
+            endpoint, event["signature"], waited = await self.submitter.submit(transaction)
+        except Exception as e:
+            metrics.incr("execution.failed")
+            log_error(f"Execution for {mint} failed: {e}")
+            event["error"] = str(e)
+        else:
+            self.executed += 1
+            metrics.incr("execution.submitted")
+            event["endpoint"] = endpoint
+            event["build_us"] = round((built - started) * 1e6)
+            event["queue_ms"] = round(waited * 1000, 2)
+            event["submit_ms"] = round((time.monotonic() - built - waited) * 1000, 2)
+        if detected_at is not None:
+            event["since_detection_ms"] = round((time.time() - detected_at) * 1000, 2)
+        self.emit(event)
@@ -0,0 +1,433 @@
+import ast
+import asyncio
+import io
+import operator
+import os
+import time
+import tokenize
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from constants.constants import FILTER_RELOAD_INTERVAL, FILTER_MAX_TRACKED, FILTER_HOLD_TIMEOUT
+
+# Filter field -> (event type it comes from, key in that event). Detection
+# fields are known when the mint is found; the rest arrive with enrichment
+# or a pool launch and are unknown until then.
+FIELDS = {
+    "mint": ("detection", "mint"),
+    "authority": ("detection", "authority"),
+    "program_id": ("detection", "program_id"),
+    "slot": ("detection", "slot"),
+    "signature": ("detection", "signature"),
+    "decimals": ("enrichment", "decimals"),
+    "supply": ("enrichment", "supply"),
+    "mintable": ("enrichment", "is_mintable"),
+    "name": ("enrichment", "name"),
+    "symbol": ("enrichment", "symbol"),
+    "uri": ("enrichment", "uri"),
+    "dex_listings": ("enrichment", "dex_listings"),
+    "stale": ("enrichment", "stale"),
+    "pool_id": ("pool_created", "pool_id"),
+    "pool_created_within": ("pool_created", "seconds_since_mint"),
+}
+# Event types that can carry each source's fields
+SOURCES = {
+    "detection": ("detection",),
+    "enrichment": ("enrichment", "enrichment_update"),
+    "pool_created": ("pool_created",),
+}
+
+DURATION_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+CONSTANTS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+
+class _Unknown:
+    """A field whose value has not arrived yet; comparisons with it are unknown too."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "UNKNOWN"
+
+
+UNKNOWN = _Unknown()
+Predicate = Callable[[Dict[str, Any]], Any]  # True, False or UNKNOWN
+
+
+###############################################################################
+# Compiler
+###############################################################################
+def compile_expression(text: str) -> Tuple[Predicate, frozenset]:
+    """
+    Parse a filter such as `decimals == 6 and not mintable and
+    pool_created_within < 30s` into a predicate over a field dict, once.
+
+    Supported: and / or / not, == != < <= > >= in / not in (chains too),
+    numbers, durations (500ms, 30s, 5m, 1h: in seconds), strings, lists,
+    true / false / null, and the names in FIELDS. Evaluation is
+    three-valued: a missing field makes what depends on it UNKNOWN, so
+    `authority == "X" and decimals == 6` is already False at detection
+    when the authority differs.
+
+    :return: (predicate, names of the fields it reads)
+    :raises ValueError: On syntax errors and unknown names.
+    """
+    try:
+        tree = ast.parse(_durations_to_seconds(text.strip()), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid filter {text!r}: {e.msg}")
+    except tokenize.TokenError as e:
+        raise ValueError(f"Invalid filter {text!r}: {e.args[0]}")
+    fields = set()
+    return _compile(tree.body, text, fields), frozenset(fields)
+
+
+def _durations_to_seconds(source: str) -> str:
+    """
+    Rewrite durations as plain seconds (`30s` -> `30.0`) at the token level:
+    a number token directly followed by a unit name. Strings such as "5m"
+    are single tokens and stay as they are.
+    """
+    tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    rewritten = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        unit = tokens[i + 1] if i + 1 < len(tokens) else None
+        if (
+            token.type == tokenize.NUMBER
+            and unit is not None
+            and unit.type == tokenize.NAME
+            and unit.string in DURATION_SECONDS
+            and unit.start == token.end
+        ):
+            seconds = float(ast.literal_eval(token.string)) * DURATION_SECONDS[unit.string]
+            rewritten.append((tokenize.NUMBER, repr(seconds)))
+            i += 2
+            continue
+        rewritten.append((token.type, token.string))
+        i += 1
+    return tokenize.untokenize(rewritten)
+
+
+def _compile(node: ast.AST, text: str, fields: set) -> Predicate:
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(value, text, fields) for value in node.values]
+        return _all(parts) if isinstance(node.op, ast.And) else _any(parts)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = _compile(node.operand, text, fields)
+
+        def negate(values):
+            value = operand(values)
+            return value if value is UNKNOWN else not value
+        return negate
+
+    if isinstance(node, ast.Compare):
+        operands = [_compile(node.left, text, fields)] + [_compile(right, text, fields) for right in node.comparators]
+        pairs = []
+        for i, op in enumerate(node.ops):
+            if type(op) not in COMPARISONS:
+                raise ValueError(f"Invalid filter {text!r}: unsupported comparison {type(op).__name__}")
+            pairs.append(_comparison(COMPARISONS[type(op)], operands[i], operands[i + 1]))
+        return pairs[0] if len(pairs) == 1 else _all(pairs)
+
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            constant = CONSTANTS[node.id]
+            return lambda values: constant
+        if node.id not in FIELDS:
+            raise ValueError(f"Invalid filter {text!r}: unknown field {node.id!r}, expected one of {sorted(FIELDS)}")
+        fields.add(node.id)
+        name = node.id
+        return lambda values: values.get(name, UNKNOWN)
+
+    try:
+        # Numbers, strings, lists and negative numbers
+        constant = ast.literal_eval(node)
+    except ValueError:
+        raise ValueError(f"Invalid filter {text!r}: unsupported expression {ast.dump(node)[:60]}")
+    if isinstance(constant, list):
+        constant = tuple(constant)
+    return lambda values: constant
+
+
+def _comparison(compare, left: Predicate, right: Predicate) -> Predicate:
+    def evaluate(values):
+        a, b = left(values), right(values)
+        if a is UNKNOWN or b is UNKNOWN:
+            return UNKNOWN
+        try:
+            return compare(a, b)
+        except TypeError:
+            return False  # e.g. a null field compared with a number
+    return evaluate
+
+
+def _all(parts: List[Predicate]) -> Predicate:
+    def evaluate(values):
+        result = True
+        for part in parts:
+            value = part(values)
+            if value is UNKNOWN:
+                result = UNKNOWN
+            elif not value:
+                return False
+        return result
+    return evaluate
+
+
+def _any(parts: List[Predicate]) -> Predicate:
+    def evaluate(values):
+        result = False
+        for part in parts:
+            value = part(values)
+            if value is UNKNOWN:
+                result = UNKNOWN
+            elif value:
+                return True
+        return result
+    return evaluate
+
+
+class Rule:
+    """One named, compiled filter expression."""
+    __slots__ = ("name", "text", "predicate", "fields")
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        self.predicate, self.fields = compile_expression(text)
+
+    def __call__(self, values: Dict[str, Any]):
+        value = self.predicate(values)
+        return value if value is UNKNOWN else bool(value)
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.text!r})"
+
+
+def parse_rules(text: str) -> List[Rule]:
+    """
+    Rules from a filter file: one per line, optionally named (`name: expr`);
+    blank lines and `#` comments are ignored.
+    """
+    rules = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, sep, expression = line.partition(":")
+        if not sep or not name.strip().isidentifier():
+            name, expression = f"rule{number}", line
+        try:
+            rules.append(Rule(name.strip(), expression.strip()))
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}")
+    return rules
+
+
+###############################################################################
+# Pipeline Stage
+###############################################################################
+class FilterSet:
+    """
+    Decides which mints the pipeline reports, as early as their fields allow.
+
+    A mint passes if any rule holds. Detections go through `admit_detection`
+    before they are emitted, correlated or enriched: one no rule can still
+    hold for is dropped there and costs no RPC calls. Enrichment, update
+    and pool events go through `admit` with everything known about the mint
+    so far; once no rule can hold, that event and every later one for the
+    mint are dropped, and the first event that makes a rule hold is tagged
+    with `matched` (the rule names).
+
+    A detection no rule has decided on yet still goes on to correlation and
+    enrichment, but is held back from the sinks: it is released (tagged
+    with `matched`) just before the event that makes a rule hold, and
+    dropped if the mint is rejected or no verdict arrives within
+    `hold_timeout` seconds. With `emit_undecided`, undecided detections are
+    emitted straight away instead, and nothing retracts them if the mint is
+    rejected later.
+
+    With `path`, the rules in that file are added to `rules` and re-read
+    whenever it changes (`run`); a file that fails to parse keeps the
+    previous ones.
+    """
+    def __init__(
+        self,
+        rules: Iterable[Rule] = (),
+        path: Optional[str] = None,
+        max_tracked: int = FILTER_MAX_TRACKED,
+        emit_undecided: bool = False,
+        hold_timeout: float = FILTER_HOLD_TIMEOUT,
+    ):
+        self.fixed: List[Rule] = list(rules)
+        self.rules: List[Rule] = list(self.fixed)
+        self.path = path
+        self.max_tracked = max_tracked
+        self.emit_undecided = emit_undecided
+        self.hold_timeout = hold_timeout
+        # mint -> fields known so far (undecided or matched mints), oldest first
+        self.known: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.matched: "OrderedDict[str, None]" = OrderedDict()
+        self.rejected: "OrderedDict[str, None]" = OrderedDict()
+        # mint -> (undecided detection, monotonic deadline), oldest first
+        self.held: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        # Held detections whose mint just matched, for the pipeline to emit
+        self.released: List[Dict[str, Any]] = []
+        self._mtime: Optional[float] = None
+        if path:
+            self.reload()
+
+    def reload(self) -> bool:
+        """Re-read `path` if it changed. Returns True if the rules were replaced."""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as e:
+            if self._mtime is not None or len(self.rules) == len(self.fixed):
+                log_warning(f"Cannot read filter file {self.path}: {e}")
+            self._mtime = None
+            return False
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            with open(self.path) as f:
+                rules = parse_rules(f.read())
+        except (OSError, ValueError) as e:
+            metrics.incr("filter.reload_errors")
+            log_error(f"Keeping the previous filters, {self.path} is invalid: {e}")
+            return False
+        self.rules = self.fixed + rules
+        # Earlier verdicts were made with other rules
+        self.matched.clear()
+        self.rejected.clear()
+        metrics.incr("filter.reloads")
+        log_info(f"Loaded {len(rules)} filters from {self.path}: " + "; ".join(rule.text for rule in rules))
+        return True
+
+    async def run(self, interval: float = FILTER_RELOAD_INTERVAL) -> None:
+        """Reload the filter file whenever it changes, until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.reload()
+
+    def verdict(self, values: Dict[str, Any]) -> Tuple[Any, List[str]]:
+        """(True, matching rule names), (False, []) or (UNKNOWN, [])."""
+        if not self.rules:
+            return True, []
+        result = False
+        matched = []
+        for rule in self.rules:
+            value = rule(values)
+            if value is True:
+                matched.append(rule.name)
+            elif value is UNKNOWN:
+                result = UNKNOWN
+        return (True, matched) if matched else (result, [])
+
+    def admit_detection(self, detection: Dict[str, Any]) -> bool:
+        """Whether to hand a detection on; an undecided one is also held back from the sinks (`is_held`)."""
+        mint = detection.get("mint")
+        if not mint or not self.rules:
+            return True
+        values = self._fields("detection", detection)
+        verdict, matched = self.verdict(values)
+        if verdict is False:
+            self._remember(self.rejected, mint)
+            metrics.incr("filter.rejected.detection")
+            return False
+        self.known[mint] = values
+        self.known.move_to_end(mint)
+        if len(self.known) > self.max_tracked:
+            self.known.popitem(last=False)
+        if matched:
+            self._match(mint, detection, matched)
+        elif not self.emit_undecided:
+            self._hold(mint, detection)
+        return True
+
+    def is_held(self, detection: Dict[str, Any]) -> bool:
+        """Whether `detection` waits for a verdict instead of being emitted now."""
+        held = self.held.get(detection.get("mint"))
+        return held is not None and held[0] is detection
+
+    def take_released(self) -> List[Dict[str, Any]]:
+        """Held detections released by the last `admit`, in the order they were detected."""
+        released, self.released = self.released, []
+        return released
+
+    def admit(self, event: Dict[str, Any]) -> bool:
+        """Whether to pass on a non-detection event (events about other things always pass)."""
+        kind = event.get("type")
+        mint = event.get("mint")
+        if not self.rules or not mint or kind not in ("enrichment", "enrichment_update", "pool_created"):
+            return True
+        if mint in self.rejected:
+            metrics.incr(f"filter.rejected.{kind}")
+            return False
+        if mint in self.matched:
+            return True
+        values = self.known.get(mint, {"mint": mint})
+        values.update(self._fields(kind, event))
+        verdict, matched = self.verdict(values)
+        if verdict is False:
+            self.known.pop(mint, None)
+            if self.held.pop(mint, None) is not None:
+                metrics.incr("filter.held_rejected")
+            self._remember(self.rejected, mint)
+            metrics.incr(f"filter.rejected.{kind}")
+            return False
+        if matched:
+            self._match(mint, event, matched)
+        return True
+
+    def _fields(self, kind: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            name: event[key]
+            for name, (source, key) in FIELDS.items()
+            if kind in SOURCES[source] and key in event
+        }
+
+    def _hold(self, mint: str, detection: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        while self.held:
+            oldest, (_, deadline) = next(iter(self.held.items()))
+            if deadline > now and len(self.held) < self.max_tracked:
+                break
+            del self.held[oldest]
+            metrics.incr("filter.held_expired")
+        self.held[mint] = (detection, now + self.hold_timeout)
+        metrics.incr("filter.held")
+
+    def _match(self, mint: str, event: Dict[str, Any], matched: List[str]) -> None:
+        event["matched"] = matched
+        held = self.held.pop(mint, None)
+        if held is not None and event is not held[0]:
+            detection, deadline = held
+            if deadline < time.monotonic():
+                metrics.incr("filter.held_expired")
+            else:
+                detection["matched"] = matched
+                self.released.append(detection)
+                metrics.incr("filter.held_released")
+        self.known.pop(mint, None)
+        self._remember(self.matched, mint)
+        metrics.incr("filter.matched")
+
+    def _remember(self, verdicts: "OrderedDict[str, None]", mint: str) -> None:
+        verdicts[mint] = None
+        if len(verdicts) > self.max_tracked:
+            verdicts.popitem(last=False)
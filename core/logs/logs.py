@@ -1,54 +1,104 @@
-from colorama import init, Fore, Style
 import datetime
+import glob
 import os
 import sys
 import logging
+import logging.handlers
+from typing import Optional
+
+from constants.constants import LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_KEEP_RUNS
 
 ###############################################################################
-# Setup Logging to File + Console
+# Logging to File + Console
 ###############################################################################
-init(autoreset=True)
-
-# Create logs directory if it doesn't exist
+# Nothing happens at import time: entry points call setup_logging() once.
+# Until then log_* calls go through the root logger without handlers.
 LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-# Generate a new logfile name for each program start
-LOG_FILENAME = datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + ".log"
-LOG_PATH = os.path.join(LOG_DIR, LOG_FILENAME)
+# ANSI colors (same codes as colorama's Fore/Style, without importing it)
+WHITE = "\x1b[37m"
+GREEN = "\x1b[32m"
+YELLOW = "\x1b[33m"
+RED = "\x1b[31m"
+RESET_ALL = "\x1b[0m"
 
-# Configure logging
 logger = logging.getLogger()  # root logger
-logger.setLevel(logging.DEBUG)
-
-# File handler (writes debug and above to a file)
-file_handler = logging.FileHandler(LOG_PATH, mode="w")
-file_handler.setLevel(logging.DEBUG)
-file_formatter = logging.Formatter(
-    fmt="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
-
-# Console handler (info and above to console, can adjust if you want debug in console too)
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.INFO)
-console_formatter = logging.Formatter(
-    fmt="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
-console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
+
+LOG_PATH: Optional[str] = None
+_configured = False
+
+
+def setup_logging(
+    log_dir: Optional[str] = LOG_DIR,
+    file_level: int = logging.DEBUG,
+    console_level: int = logging.INFO,
+) -> Optional[str]:
+    """
+    Configure the root logger to write to a new per-run file and the console.
+
+    Safe to call more than once; only the first call has an effect.
+
+    :param log_dir: Directory for the log file, or None for console only.
+    :return: Path of the log file (None when logging to console only).
+    """
+    global LOG_PATH, _configured
+    if _configured:
+        return LOG_PATH
+    _configured = True
+
+    # Windows consoles need colorama to translate the ANSI codes
+    if sys.platform == "win32":
+        from colorama import just_fix_windows_console
+        just_fix_windows_console()
+
+    logger.setLevel(min(file_level, console_level))
+
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        _prune_old_logs(log_dir, LOG_KEEP_RUNS - 1)
+        # Generate a new logfile name for each program start
+        log_filename = datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + ".log"
+        LOG_PATH = os.path.join(log_dir, log_filename)
+
+        # File handler (writes debug and above to a file, rotated so a
+        # weeks-long run cannot fill the disk)
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOG_PATH, mode="w", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+        )
+        file_handler.setLevel(file_level)
+        file_handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+        logger.addHandler(file_handler)
+
+    # Console handler (info and above to console, can adjust if you want debug in console too)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    logger.addHandler(console_handler)
+
+    return LOG_PATH
+
+
+def _prune_old_logs(log_dir: str, keep: int) -> None:
+    """Delete all but the newest `keep` runs' log files (and their rotations)."""
+    runs = sorted(glob.glob(os.path.join(log_dir, "*.log")))
+    for path in runs[:max(len(runs) - keep, 0)]:
+        for old_file in [path] + glob.glob(path + ".*"):
+            try:
+                os.remove(old_file)
+            except OSError:
+                pass
+
 
 def log_debug(msg):
-    logger.debug(f"{Fore.WHITE}{msg}{Style.RESET_ALL}")
+    logger.debug(f"{WHITE}{msg}{RESET_ALL}")
 
 def log_info(msg):
-    logger.info(f"{Fore.GREEN}{msg}{Style.RESET_ALL}")
+    logger.info(f"{GREEN}{msg}{RESET_ALL}")
 
 def log_warning(msg):
-    logger.warning(f"{Fore.YELLOW}{msg}{Style.RESET_ALL}")
+    logger.warning(f"{YELLOW}{msg}{RESET_ALL}")
 
 def log_error(msg):
-    logger.error(f"{Fore.RED}{msg}{Style.RESET_ALL}")
\ No newline at end of file
+    logger.error(f"{RED}{msg}{RESET_ALL}")
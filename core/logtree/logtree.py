@@ -0,0 +1,171 @@
+from typing import Iterable, Iterator, List, Optional
+
+INVOKE = "invoke ["
+CONSUMED = "consumed "
+FAILED = "failed"
+LOG_PREFIX = "Program log: "
+INSTRUCTION_PREFIX = "Program log: Instruction: "
+TRUNCATED = "Log truncated"
+
+
+class Invocation:
+    """
+    One program invocation in a transaction: the lines it logged itself,
+    the programs it called (CPI) and the compute units it reported.
+    """
+    __slots__ = ("program_id", "depth", "parent", "children", "logs", "consumed", "budget", "status", "error")
+
+    def __init__(self, program_id: str, depth: int, parent: Optional["Invocation"] = None):
+        self.program_id = program_id
+        self.depth = depth
+        self.parent = parent
+        self.children: List["Invocation"] = []
+        self.logs: List[str] = []
+        self.consumed: Optional[int] = None  # Compute units used, from the "consumed" line
+        self.budget: Optional[int] = None    # Compute units left when it was invoked
+        self.status: Optional[str] = None    # "success", "failed", or None if the logs stop first
+        self.error: Optional[str] = None
+
+    def walk(self) -> Iterator["Invocation"]:
+        """This invocation and everything it called, in log order."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def __repr__(self):
+        return f"Invocation({self.program_id}, depth={self.depth}, logs={len(self.logs)}, children={len(self.children)})"
+
+
+class LoggedInstruction:
+    """A "Program log: Instruction: <name>" line and the invocation that logged it."""
+    __slots__ = ("name", "invocation", "index")
+
+    def __init__(self, name: str, invocation: Invocation, index: int):
+        self.name = name
+        self.invocation = invocation
+        self.index = index  # Position in invocation.logs
+
+    @property
+    def line(self) -> str:
+        return self.invocation.logs[self.index]
+
+    @property
+    def program_id(self) -> str:
+        return self.invocation.program_id
+
+    @property
+    def depth(self) -> int:
+        return self.invocation.depth
+
+
+class LogTree:
+    """
+    A transaction's log lines structured by invocation.
+
+    `roots` are the top-level instructions in order, `instructions` every
+    "Instruction: <name>" line in log order with the program that emitted
+    it, and `orphans` lines logged outside any invocation.
+    """
+    __slots__ = ("roots", "instructions", "orphans", "truncated")
+
+    def __init__(self):
+        self.roots: List[Invocation] = []
+        self.instructions: List[LoggedInstruction] = []
+        self.orphans: List[str] = []
+        self.truncated = False
+
+    def invocations(self, program_ids: Optional[Iterable[str]] = None) -> Iterator[Invocation]:
+        """Every invocation (optionally only those of `program_ids`), in log order."""
+        wanted = None if program_ids is None else set(program_ids)
+        for root in self.roots:
+            for invocation in root.walk():
+                if wanted is None or invocation.program_id in wanted:
+                    yield invocation
+
+    def logs(self, program_ids: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """The lines logged by `program_ids` themselves (not by programs they called)."""
+        for invocation in self.invocations(program_ids):
+            yield from invocation.logs
+
+    @property
+    def compute_units(self) -> int:
+        return sum(root.consumed or 0 for root in self.roots)
+
+
+def mentions_any(logs: Iterable[str], markers: Iterable[str]) -> bool:
+    """
+    Cheap gate before building a tree: one search of the joined text per
+    marker, all in C. Most transactions contain nothing a detector wants,
+    and for those structuring the logs would cost more than the detection.
+    """
+    text = "\n".join(logs)
+    for marker in markers:
+        if marker in text:
+            return True
+    return False
+
+
+def build_log_tree(logs: Iterable[str]) -> LogTree:
+    """
+    Structure a transaction's log lines in one pass.
+
+    "Program <id> invoke [n]" opens an invocation at depth n under the one
+    currently open, "Program <id> consumed <x> of <y> compute units"
+    records its compute units and "Program <id> success" / "failed: ..."
+    closes it. Every other line belongs to the innermost open invocation.
+    """
+    tree = LogTree()
+    stack: List[Invocation] = []
+    for line in logs:
+        if line.startswith(LOG_PREFIX):
+            # By far the most common line: skip the marker checks below
+            if not stack:
+                tree.orphans.append(line)
+                continue
+            current = stack[-1]
+            if line.startswith(INSTRUCTION_PREFIX):
+                tree.instructions.append(LoggedInstruction(line[len(INSTRUCTION_PREFIX):].strip(), current, len(current.logs)))
+            current.logs.append(line)
+            continue
+
+        if line.startswith("Program "):
+            program_id, _, tail = line[8:].partition(" ")
+            if tail.startswith(INVOKE):
+                try:
+                    depth = int(tail[len(INVOKE):tail.index("]")])
+                except ValueError:
+                    depth = len(stack) + 1
+                # Lines can be missing (truncated logs): never nest deeper than the stated depth
+                del stack[max(depth - 1, 0):]
+                parent = stack[-1] if stack else None
+                invocation = Invocation(program_id, depth, parent)
+                (parent.children if parent is not None else tree.roots).append(invocation)
+                stack.append(invocation)
+                continue
+            if stack and stack[-1].program_id == program_id:
+                current = stack[-1]
+                if tail == "success":
+                    current.status = "success"
+                    stack.pop()
+                    continue
+                if tail.startswith(FAILED):
+                    current.status = "failed"
+                    current.error = tail[len(FAILED):].lstrip(": ") or None
+                    stack.pop()
+                    continue
+                if tail.startswith(CONSUMED):
+                    parts = tail.split()
+                    try:
+                        current.consumed, current.budget = int(parts[1]), int(parts[3])
+                    except (IndexError, ValueError):
+                        pass
+                    continue
+
+        if line.startswith(TRUNCATED):
+            tree.truncated = True
+        # "Program data: ...", "Program return: ...", anything else
+        if stack:
+            stack[-1].logs.append(line)
+        else:
+            tree.orphans.append(line)
+    return tree
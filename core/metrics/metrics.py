@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Union
+
+from constants.constants import METRICS_REPORT_INTERVAL
+
+Number = Union[int, float]
+
+
+class Metrics:
+    """
+    Process-wide counters and gauges.
+
+    Counters only ever go up (drops, sheds, expirations...); gauges hold the
+    latest observed value (queue depths, lag...). Reads return a copy.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.gauges: Dict[str, Number] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increase the counter `name` by `value`."""
+        with self._lock:
+            self.counters[name] += value
+
+    def set_gauge(self, name: str, value: Number) -> None:
+        """Record the latest value of the gauge `name`."""
+        self.gauges[name] = value
+
+    def get(self, name: str) -> Number:
+        """Return a counter or gauge value (0 if never recorded)."""
+        if name in self.gauges:
+            return self.gauges[name]
+        return self.counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Number]:
+        """Return every counter and gauge in one flat dict."""
+        with self._lock:
+            result: Dict[str, Number] = dict(self.counters)
+        result.update(self.gauges)
+        return result
+
+    def reset(self) -> None:
+        """Clear everything (benchmarks and soak runs start from zero)."""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+
+
+# Shared registry used by every subsystem
+metrics = Metrics()
+
+
+async def report_metrics(emit: Callable[[Dict[str, Any]], None], interval: float = METRICS_REPORT_INTERVAL) -> None:
+    """Emit a "metrics" event with a snapshot of the registry every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        emit({"type": "metrics", "metrics": metrics.snapshot(), "reported_at": time.time()})
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from typing import Iterable, List, Optional
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.mock.mock_rpc import BASE58_ALPHABET, SENT_AT_PREFIX
+
+
+def b58decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        number = number * 58 + BASE58_ALPHABET.index(char)
+    raw = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return b"\0" * (len(text) - len(text.lstrip("1"))) + raw
+
+
+def to_geyser_update(frame: dict, filters: Iterable[str] = ()) -> bytes:
+    """Serialize one logsNotification payload as the equivalent SubscribeUpdate."""
+    from core.engines.geyser_proto import SubscribeUpdate
+
+    result = frame["params"]["result"]
+    value = result["value"]
+    update = SubscribeUpdate(filters=list(filters))
+    update.transaction.slot = result["context"]["slot"]
+    info = update.transaction.transaction
+    info.signature = b58decode(value["signature"])
+    if value.get("err") is not None:
+        info.meta.err.err = str(value["err"]).encode()
+    info.meta.log_messages.extend(value["logs"])
+    return update.SerializeToString()
+
+
+def _sent_at_suffix() -> bytes:
+    # Serialized messages concatenate as a merge, and repeated fields append:
+    # this adds one log line to whatever update it follows
+    from core.engines.geyser_proto import SubscribeUpdate
+
+    marker = SubscribeUpdate()
+    marker.transaction.transaction.meta.log_messages.append(f"{SENT_AT_PREFIX}{time.monotonic()}")
+    return marker.SerializeToString()
+
+
+class MockGeyserServer:
+    """
+    A local stand-in for a Yellowstone gRPC endpoint.
+
+    Answers every `Subscribe` call by replaying `frames` (logsNotification
+    payloads, as for MockRpcServer) as transaction updates tagged with the
+    call's transaction filter names, optionally paced at `rate` per second.
+    Each update gets a send-time marker appended to its logs. Client pings
+    are answered with pongs.
+    """
+    def __init__(self, frames: Iterable[dict], host: str = "127.0.0.1", port: int = 0, rate: Optional[float] = None):
+        self.frames = list(frames)
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.requests: List = []  # Every SubscribeRequest received (tests check the filters)
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        import grpc
+        from core.engines.geyser_proto import SubscribeRequest
+
+        self._server = grpc.aio.server()
+        handler = grpc.stream_stream_rpc_method_handler(
+            self._subscribe,
+            request_deserializer=SubscribeRequest.FromString,
+            response_serializer=None,  # Updates are serialized up front
+        )
+        self._server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler("geyser.Geyser", {"Subscribe": handler}),))
+        self.port = self._server.add_insecure_port(f"{self.host}:{self.port}")
+        await self._server.start()
+        log_debug(f"Mock Geyser listening on {self.url}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            await self._server.stop(grace=None)
+            self._server = None
+
+    async def _subscribe(self, request_iterator, context):
+        from core.engines.geyser_proto import SubscribeUpdate
+
+        first = await request_iterator.__anext__()
+        self.requests.append(first)
+        filters = list(first.transactions)
+        updates = [to_geyser_update(frame, filters) for frame in self.frames]
+        pongs: asyncio.Queue = asyncio.Queue()
+
+        async def read_pings():
+            async for request in request_iterator:
+                self.requests.append(request)
+                if request.HasField("ping"):
+                    pong = SubscribeUpdate()
+                    pong.pong.id = request.ping.id
+                    pongs.put_nowait(pong.SerializeToString())
+
+        reader = asyncio.create_task(read_pings())
+        try:
+            interval = 1 / self.rate if self.rate else 0
+            next_send = time.monotonic()
+            for i, update in enumerate(updates):
+                while not pongs.empty():
+                    yield pongs.get_nowait()
+                yield update + _sent_at_suffix()
+                if interval:
+                    next_send += interval
+                    delay = next_send - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                elif i % 256 == 0:
+                    await asyncio.sleep(0)
+            while True:
+                yield await pongs.get()
+        finally:
+            reader.cancel()
+
+
+def serve_geyser_forever(frames: List[dict], rate: Optional[float], port_queue) -> None:
+    """Process entry point: run a MockGeyserServer and report its port."""
+    async def run():
+        server = MockGeyserServer(frames, rate=rate)
+        await server.start()
+        port_queue.put(server.port)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
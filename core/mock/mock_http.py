@@ -0,0 +1,186 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.mock.mock_rpc import b58encode
+
+SLOT_DURATION = 0.4
+BLOCKHASH_VALIDITY = 150  # Blocks
+SLOT_SKIPPED = -32007     # JSON-RPC error code for a slot without a block
+
+
+def synthetic_blocks(frames: Iterable[dict], skipped: Iterable[int] = ()) -> Dict[int, dict]:
+    """
+    Group logsNotification payloads (see synthetic_frames) into getBlock
+    results by slot, one transaction per frame. Slots in `skipped` get no
+    block, as if their leader had missed them.
+    """
+    blocks: Dict[int, dict] = {}
+    skipped = set(skipped)
+    for frame in frames:
+        result = frame["params"]["result"]
+        slot = result["context"]["slot"]
+        if slot in skipped:
+            continue
+        block = blocks.get(slot)
+        if block is None:
+            block = blocks[slot] = {
+                "blockhash": MockHttpRpc.blockhash(slot),
+                "previousBlockhash": MockHttpRpc.blockhash(slot - 1),
+                "parentSlot": slot - 1,
+                "blockHeight": slot,
+                "blockTime": int(time.time()),
+                "transactions": [],
+            }
+        value = result["value"]
+        block["transactions"].append({
+            "transaction": {"signatures": [value["signature"]], "message": {"accountKeys": [], "instructions": []}},
+            "meta": {"err": value["err"], "fee": 5000, "logMessages": value["logs"]},
+            "version": 0,
+        })
+    return blocks
+
+
+class RpcError(ValueError):
+    """A JSON-RPC error with its own code (plain ValueErrors answer -32602)."""
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class MockHttpRpc:
+    """
+    A local stand-in for the RPC HTTP endpoint (JSON-RPC over HTTP/1.1
+    with keep-alive), driven by a simulated slot clock.
+
+    Answers getSlot, getBlockHeight, getLatestBlockhash (a new blockhash
+    every slot), sendTransaction (recorded in `transactions`) and getBlock
+    (from `blocks`, e.g. synthetic_blocks; other slots were skipped). Other
+    methods can be added through `methods`: name -> callable(params, server)
+    returning the result, or raising ValueError (RpcError for a specific
+    code) for a JSON-RPC error.
+    """
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        start_slot: int = 250_000_000,
+        methods: Optional[Dict[str, Callable]] = None,
+        blocks: Optional[Dict[int, dict]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.start_slot = start_slot
+        self.started_at = time.monotonic()
+        self.methods: Dict[str, Callable] = {
+            "getSlot": lambda params, server: server.slot,
+            "getBlockHeight": lambda params, server: server.slot,
+            "getLatestBlockhash": MockHttpRpc._latest_blockhash,
+            "sendTransaction": MockHttpRpc._send_transaction,
+            "getBlock": MockHttpRpc._get_block,
+        }
+        self.blocks: Dict[int, dict] = blocks or {}
+        self.methods.update(methods or {})
+        self.transactions: List[bytes] = []
+        self.calls: Dict[str, int] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def slot(self) -> int:
+        return self.start_slot + int((time.monotonic() - self.started_at) / SLOT_DURATION)
+
+    @staticmethod
+    def blockhash(slot: int) -> str:
+        return b58encode(hashlib.sha256(slot.to_bytes(8, "little")).digest())
+
+    @staticmethod
+    def _latest_blockhash(params, server: "MockHttpRpc") -> dict:
+        slot = server.slot
+        return {
+            "context": {"slot": slot},
+            "value": {"blockhash": server.blockhash(slot), "lastValidBlockHeight": slot + BLOCKHASH_VALIDITY},
+        }
+
+    @staticmethod
+    def _send_transaction(params, server: "MockHttpRpc") -> str:
+        raw = base64.b64decode(params[0])
+        server.transactions.append(raw)
+        return b58encode(raw[1:65])  # The first signature
+
+    @staticmethod
+    def _get_block(params, server: "MockHttpRpc") -> dict:
+        slot = params[0]
+        block = server.blocks.get(slot)
+        if block is None:
+            raise RpcError(SLOT_SKIPPED, f"Slot {slot} was skipped, or missing due to ledger jump to recent snapshot")
+        return block
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log_debug(f"Mock HTTP RPC listening on {self.url}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()  # Kept-alive connections would keep their handlers waiting
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method")
+        self.calls[method] = self.calls.get(method, 0) + 1
+        handler = self.methods.get(method)
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        try:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": handler(request.get("params") or [], self)}
+        except RpcError as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": e.code, "message": str(e)}}
+        except ValueError as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32602, "message": str(e)}}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b"{}"
+                payload = json.loads(body)
+                if isinstance(payload, list):
+                    response = [self.call(request) for request in payload]
+                else:
+                    response = self.call(payload)
+                encoded = json.dumps(response).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(encoded)).encode() + b"\r\n\r\n" + encoded
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
@@ -0,0 +1,266 @@
+import asyncio
+import base64
+import json
+import random
+import struct
+import time
+from typing import Dict, Iterable, List, Optional
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from constants.constants import SPL_TOKEN_PROGRAM_ID
+
+# Marker line appended to every replayed transaction: the send time lets the
+# consumer measure end-to-end latency (time.monotonic is host-wide on Linux).
+SENT_AT_PREFIX = "Program log: bench-sent-at "
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def b58encode(raw: bytes) -> str:
+    number = int.from_bytes(raw, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    padding = len(raw) - len(raw.lstrip(b"\0"))
+    return "1" * padding + encoded
+
+
+def random_base58(size: int, rng: random.Random) -> str:
+    """A valid base58 key (size=32) or signature (size=64)."""
+    return b58encode(bytes(rng.getrandbits(8) for _ in range(size)))
+
+
+###############################################################################
+# Synthetic Stream
+###############################################################################
+def synthetic_logs(rng: random.Random, with_mint: bool) -> List[str]:
+    """Log lines shaped like real SPL Token transactions."""
+    token = SPL_TOKEN_PROGRAM_ID
+    logs = [
+        "Program ComputeBudget111111111111111111111111111111 invoke [1]",
+        "Program ComputeBudget111111111111111111111111111111 success",
+    ]
+    if with_mint:
+        mint = random_base58(32, rng)
+        logs += [
+            "Program 11111111111111111111111111111111 invoke [1]",
+            "Program 11111111111111111111111111111111 success",
+            f"Program {token} invoke [1]",
+            "Program log: Instruction: InitializeMint2",
+            f"Program log: Mint: {mint}",
+            f"Program {token} consumed 2919 of 199700 compute units",
+            f"Program {token} success",
+        ]
+    else:
+        logs += [
+            f"Program {token} invoke [1]",
+            "Program log: Instruction: TransferChecked",
+            f"Program {token} consumed 6200 of 199700 compute units",
+            f"Program {token} success",
+        ]
+    return logs
+
+
+def synthetic_frames(count: int, mint_ratio: float, seed: int = 7, start_slot: int = 250_000_000) -> List[dict]:
+    """Build `count` logsNotification payloads (without the send marker)."""
+    rng = random.Random(seed)
+    frames = []
+    slot = start_slot
+    for i in range(count):
+        if rng.random() < 0.1:
+            slot += 1
+        frames.append({
+            "jsonrpc": "2.0",
+            "method": "logsNotification",
+            "params": {
+                "result": {
+                    "context": {"slot": slot},
+                    "value": {
+                        "signature": random_base58(64, rng),
+                        "err": None,
+                        "logs": synthetic_logs(rng, rng.random() < mint_ratio),
+                    },
+                },
+                "subscription": 1,
+            },
+        })
+    return frames
+
+
+def load_recording(path: str) -> List[dict]:
+    """Read captured logsNotification frames (one JSON object per line)."""
+    frames = []
+    with open(path) as recording:
+        for line in recording:
+            line = line.strip()
+            if line:
+                frame = json.loads(line)
+                if frame.get("method") == "logsNotification":
+                    frames.append(frame)
+    return frames
+
+
+def mint_account_data(
+    supply: int,
+    decimals: int,
+    mint_authority: Optional[bytes] = None,
+    freeze_authority: Optional[bytes] = None,
+) -> bytes:
+    """Raw SPL Token mint account bytes (authorities as 32-byte keys or None)."""
+    def optional_key(key: Optional[bytes]) -> bytes:
+        return struct.pack("<I", 1) + key if key else bytes(36)
+
+    return optional_key(mint_authority) + struct.pack("<QBB", supply, decimals, 1) + optional_key(freeze_authority)
+
+
+###############################################################################
+# Mock WebSocket RPC
+###############################################################################
+class MockRpcServer:
+    """
+    A local stand-in for the RPC WebSocket endpoint.
+
+    Confirms every logsSubscribe request, then replays `frames` to the
+    connection (optionally paced at `rate` frames per second). Each frame
+    gets a send-time marker appended to its logs.
+
+    accountSubscribe / accountUnsubscribe are answered too; `set_account`
+    pushes an accountNotification to every subscriber of that account.
+    slotSubscribe connections get a slotNotification whenever a replayed
+    frame moves to a new slot.
+    """
+    def __init__(self, frames: Iterable[dict], host: str = "127.0.0.1", port: int = 0, rate: Optional[float] = None):
+        self.frames = list(frames)
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self._server = None
+        self.account_subscriptions: Dict[int, tuple] = {}  # Subscription id -> (websocket, account)
+        self._account_ids = 0
+        self.slot_subscribers: Dict[object, int] = {}  # websocket -> subscription id
+        self.slot = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def set_account(self, account: str, data: bytes, slot: int) -> int:
+        """Notify the subscribers of `account` of its new data. Returns how many were notified."""
+        notified = 0
+        for subscription, (websocket, subscribed) in list(self.account_subscriptions.items()):
+            if subscribed != account:
+                continue
+            await websocket.send(json.dumps({
+                "jsonrpc": "2.0",
+                "method": "accountNotification",
+                "params": {
+                    "result": {
+                        "context": {"slot": slot},
+                        "value": {
+                            "data": [base64.b64encode(data).decode(), "base64"],
+                            "executable": False,
+                            "lamports": 1461600,
+                            "owner": SPL_TOKEN_PROGRAM_ID,
+                            "rentEpoch": 0,
+                        },
+                    },
+                    "subscription": subscription,
+                },
+            }))
+            notified += 1
+        return notified
+
+    async def start(self) -> None:
+        from websockets.asyncio.server import serve
+
+        self._server = await serve(self._handle, self.host, self.port, max_size=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log_debug(f"Mock RPC listening on {self.url}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, websocket) -> None:
+        streaming = None
+        subscription_id = 0
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                if request.get("method") == "logsSubscribe":
+                    subscription_id += 1
+                    await websocket.send(json.dumps({"jsonrpc": "2.0", "result": subscription_id, "id": request["id"]}))
+                    if streaming is None:
+                        streaming = asyncio.create_task(self._stream(websocket))
+                elif request.get("method") == "accountSubscribe":
+                    self._account_ids += 1
+                    self.account_subscriptions[self._account_ids] = (websocket, request["params"][0])
+                    await websocket.send(json.dumps({"jsonrpc": "2.0", "result": self._account_ids, "id": request["id"]}))
+                elif request.get("method") == "slotSubscribe":
+                    self._account_ids += 1
+                    self.slot_subscribers[websocket] = self._account_ids
+                    await websocket.send(json.dumps({"jsonrpc": "2.0", "result": self._account_ids, "id": request["id"]}))
+                elif request.get("method") == "accountUnsubscribe":
+                    found = self.account_subscriptions.pop(request["params"][0], None) is not None
+                    await websocket.send(json.dumps({"jsonrpc": "2.0", "result": found, "id": request["id"]}))
+                else:
+                    await websocket.send(json.dumps({
+                        "jsonrpc": "2.0",
+                        "error": {"code": -32601, "message": "Method not found"},
+                        "id": request.get("id"),
+                    }))
+        finally:
+            self.slot_subscribers.pop(websocket, None)
+            for subscription, (subscriber, _account) in list(self.account_subscriptions.items()):
+                if subscriber is websocket:
+                    del self.account_subscriptions[subscription]
+            if streaming is not None:
+                streaming.cancel()
+
+    async def _stream(self, websocket) -> None:
+        interval = 1 / self.rate if self.rate else 0
+        next_send = time.monotonic()
+        for i, frame in enumerate(self.frames):
+            slot = frame["params"]["result"]["context"]["slot"]
+            if slot > self.slot:
+                self.slot = slot
+                await self._notify_slot(slot)
+            logs = frame["params"]["result"]["value"]["logs"]
+            logs.append(f"{SENT_AT_PREFIX}{time.monotonic()}")
+            await websocket.send(json.dumps(frame))
+            logs.pop()
+            if interval:
+                next_send += interval
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif i % 256 == 0:
+                await asyncio.sleep(0)
+
+    async def _notify_slot(self, slot: int) -> None:
+        for websocket, subscription in list(self.slot_subscribers.items()):
+            try:
+                await websocket.send(json.dumps({
+                    "jsonrpc": "2.0",
+                    "method": "slotNotification",
+                    "params": {"result": {"parent": slot - 1, "root": slot - 32, "slot": slot}, "subscription": subscription},
+                }))
+            except Exception:
+                self.slot_subscribers.pop(websocket, None)
+
+
+def serve_forever(frames: List[dict], rate: Optional[float], port_queue) -> None:
+    """Process entry point: run a MockRpcServer and report its port."""
+    async def run():
+        server = MockRpcServer(frames, rate=rate)
+        await server.start()
+        port_queue.put(server.port)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from typing import Callable, Dict
+
+from core.logs.logs import logger, log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from constants.constants import (
+    OVERLOAD_CHECK_INTERVAL,
+    OVERLOAD_LAG_HIGH,
+    OVERLOAD_LAG_LOW,
+    OVERLOAD_DEPTH_HIGH,
+    OVERLOAD_DEPTH_LOW,
+    OVERLOAD_RECOVERY_CHECKS,
+    PARSER_SAMPLE_EVERY,
+)
+
+# Shedding stages, in the order they are entered
+STAGES = ("normal", "quiet_logs", "skip_dex", "sample_parser")
+STAGE_QUIET_LOGS = 1     # No debug records, no verbatim instruction dumps
+STAGE_SKIP_DEX = 2       # Enrichment skips the DEX listing lookup
+STAGE_SAMPLE_PARSER = 3  # InstructionParser samples low-priority instructions
+
+
+class DebugShedFilter(logging.Filter):
+    """Drops (and counts) debug records while `active` is set."""
+    def __init__(self):
+        super().__init__()
+        self.active = False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.active and record.levelno < logging.INFO:
+            metrics.incr("shed.debug_logs")
+            return False
+        return True
+
+
+class OverloadController:
+    """
+    Degrades the pipeline in stages when the event loop falls behind.
+
+    Every `interval` seconds it measures how late the loop woke up and the
+    total depth of the registered queues. If either is above its high
+    watermark it enters the next stage of STAGES; once both have been below
+    their low watermarks for `recovery_checks` samples in a row it steps
+    back one stage. Stage changes and every shed item are counted in
+    metrics ("overload.*", "shed.*").
+    """
+    def __init__(
+        self,
+        pipeline,
+        interval: float = OVERLOAD_CHECK_INTERVAL,
+        lag_high: float = OVERLOAD_LAG_HIGH,
+        lag_low: float = OVERLOAD_LAG_LOW,
+        depth_high: int = OVERLOAD_DEPTH_HIGH,
+        depth_low: int = OVERLOAD_DEPTH_LOW,
+        recovery_checks: int = OVERLOAD_RECOVERY_CHECKS,
+        sample_every: int = PARSER_SAMPLE_EVERY,
+    ):
+        self.pipeline = pipeline
+        self.interval = interval
+        self.lag_high = lag_high
+        self.lag_low = lag_low
+        self.depth_high = depth_high
+        self.depth_low = depth_low
+        self.recovery_checks = recovery_checks
+        self.sample_every = sample_every
+        self.stage = 0
+        self.depth_probes: Dict[str, Callable[[], int]] = {}
+        self._healthy = 0
+        self._log_filter = DebugShedFilter()
+
+    def watch(self, name: str, depth: Callable[[], int]) -> None:
+        """Include a queue's depth (e.g. lambda: len(queue)) in overload checks."""
+        self.depth_probes[name] = depth
+
+    def unwatch(self, name: str) -> None:
+        self.depth_probes.pop(name, None)
+        metrics.gauges.pop(f"overload.depth.{name}", None)
+
+    async def run(self) -> None:
+        """Sample lag and depth until cancelled."""
+        loop = asyncio.get_running_loop()
+        logger.addFilter(self._log_filter)
+        try:
+            while True:
+                started = loop.time()
+                await asyncio.sleep(self.interval)
+                self.update(loop.time() - started - self.interval, self.depth())
+        finally:
+            logger.removeFilter(self._log_filter)
+
+    def depth(self) -> int:
+        total = 0
+        for name, probe in self.depth_probes.items():
+            value = probe()
+            metrics.set_gauge(f"overload.depth.{name}", value)
+            total += value
+        return total
+
+    def update(self, lag: float, depth: int) -> None:
+        """Feed one sample; escalates or recovers as needed."""
+        metrics.set_gauge("overload.loop_lag_ms", round(lag * 1000, 2))
+        if lag > self.lag_high or depth > self.depth_high:
+            self._healthy = 0
+            if self.stage < len(STAGES) - 1:
+                metrics.incr("overload.escalations")
+                log_warning(f"Overloaded (loop lag {lag * 1000:.0f}ms, {depth} queued): shedding {STAGES[self.stage + 1]}")
+                self.set_stage(self.stage + 1)
+        elif lag < self.lag_low and depth < self.depth_low and self.stage:
+            self._healthy += 1
+            if self._healthy >= self.recovery_checks:
+                self._healthy = 0
+                metrics.incr("overload.recoveries")
+                log_info(f"Load back to normal: restoring {STAGES[self.stage]}")
+                self.set_stage(self.stage - 1)
+        else:
+            self._healthy = 0
+
+    def set_stage(self, stage: int) -> None:
+        self.stage = stage
+        metrics.set_gauge("overload.stage", stage)
+        self._log_filter.active = stage >= STAGE_QUIET_LOGS
+        parser = self.pipeline.parser
+        if parser is not None:
+            parser.dump_unhandled = stage < STAGE_QUIET_LOGS
+            parser.sample_every = self.sample_every if stage >= STAGE_SAMPLE_PARSER else 1
+        enricher = self.pipeline.enricher
+        if enricher is not None:
+            enricher.shed_lookups = {"dex"} if stage >= STAGE_SKIP_DEX else set()
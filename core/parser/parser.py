@@ -1,12 +1,164 @@
 from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.logtree.logtree import Invocation, LogTree
+from core.metrics.metrics import metrics
 import re
+from typing import Any, Dict, Optional, Pattern, Tuple
+
+# Instructions that may be sampled when the sniffer is overloaded
+LOW_PRIORITY_INSTRUCTIONS = frozenset({
+    "InitializeAccount3", "InitializeAccount2", "InitializeAccount",
+    "TransferChecked", "Transfer",
+    "ApproveChecked", "Approve", "Revoke",
+    "CloseAccount", "FreezeAccount", "ThawAccount",
+    "SyncNative",
+})
+
+###############################################################################
+# Field Extraction
+###############################################################################
+PUBKEY = r"[1-9A-HJ-NP-Za-km-z]{32,44}"
+UINT = r"\d+"
+
+# field -> (label, value pattern, type); labels match case-insensitively,
+# followed by an optional colon: "Mint: <pk>", "amount 1000", "Decimals: 9"
+FIELDS: Dict[str, Tuple[str, str, type]] = {
+    "mint": (r"Mint", PUBKEY, str),
+    "authority": (r"(?:Mint ?|Owner ?)?Authority", PUBKEY, str),
+    "freeze_authority": (r"Freeze ?Authority", PUBKEY, str),
+    "new_authority": (r"New ?Authority", PUBKEY, str),
+    "authority_type": (r"Authority ?Type", r"\w+", str),
+    "owner": (r"Owner", PUBKEY, str),
+    "delegate": (r"Delegate", PUBKEY, str),
+    "source": (r"Source", PUBKEY, str),
+    "destination": (r"Destination", PUBKEY, str),
+    "account": (r"Account", PUBKEY, str),
+    "account_index": (r"Account ?index", UINT, int),
+    "amount": (r"Amount", UINT, int),
+    "decimals": (r"Decimals", UINT, int),
+    "signers": (r"(?:Required ?)?Signers", UINT, int),
+}
+
+INSTRUCTION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "InitializeMint2": ("mint", "decimals", "authority", "freeze_authority"),
+    "InitializeMint": ("mint", "decimals", "authority", "freeze_authority"),
+    "InitializeAccount3": ("account", "account_index", "mint", "owner"),
+    "InitializeAccount2": ("account", "account_index", "mint", "owner"),
+    "InitializeAccount": ("account", "account_index", "mint", "owner"),
+    "InitializeMultisig2": ("account", "account_index", "signers"),
+    "InitializeMultisig": ("account", "account_index", "signers"),
+    "TransferChecked": ("source", "mint", "destination", "authority", "amount", "decimals"),
+    "Transfer": ("source", "destination", "authority", "amount"),
+    "ApproveChecked": ("source", "mint", "delegate", "owner", "amount", "decimals"),
+    "Approve": ("source", "delegate", "owner", "amount"),
+    "Revoke": ("source", "owner"),
+    "SetAuthority": ("account", "account_index", "authority_type", "new_authority", "authority"),
+    "MintToChecked": ("mint", "account", "account_index", "authority", "amount", "decimals"),
+    "MintTo": ("mint", "account", "account_index", "authority", "amount"),
+    "BurnChecked": ("account", "account_index", "mint", "authority", "amount", "decimals"),
+    "Burn": ("account", "account_index", "mint", "authority", "amount"),
+    "CloseAccount": ("account", "account_index", "destination", "owner"),
+    "FreezeAccount": ("account", "account_index", "mint", "authority"),
+    "ThawAccount": ("account", "account_index", "mint", "authority"),
+    "SyncNative": ("account", "account_index"),
+}
+
+_specs: Dict[str, Pattern] = {}
+
+
+def extraction_spec(instruction: str) -> Pattern:
+    """
+    One compiled pattern per instruction (built on first use): an alternation
+    of its fields, one named group each, so a single scan finds them all.
+    Longer labels go first so "New Authority" is not read as "Authority".
+    """
+    spec = _specs.get(instruction)
+    if spec is None:
+        names = sorted(INSTRUCTION_FIELDS.get(instruction, ()), key=lambda name: -len(FIELDS[name][0]))
+        alternatives = [
+            rf"\b(?i:{FIELDS[name][0]}):?\s+(?P<{name}>{FIELDS[name][1]})\b" for name in names
+        ]
+        spec = _specs[instruction] = re.compile("|".join(alternatives) or r"(?!)")
+    return spec
+
+
+class InstructionFields:
+    """
+    The fields of one instruction log line, kept as (start, end) offsets
+    into the line.
+
+    The parser reuses a single instance for every line, so handlers must
+    read what they need before returning. The line is only scanned when a
+    field is first asked for, and a field's string (or int) is only built
+    when it is read.
+    """
+    __slots__ = ("line", "instruction", "invocation", "_starts", "_ends", "_scanned")
 
-class InstructionParser:
     def __init__(self):
+        self.line = ""
+        self.instruction: Optional[str] = None
+        self.invocation: Optional[Invocation] = None  # Program and depth that logged the line, if known
+        self._starts: Dict[str, int] = {}
+        self._ends: Dict[str, int] = {}
+        self._scanned = True
+
+    def reset(self, line: str, instruction: str, invocation: Optional[Invocation] = None) -> None:
+        self.line = line
+        self.instruction = instruction
+        self.invocation = invocation
+        self._scanned = False
+
+    def _scan(self) -> None:
+        starts, ends = self._starts, self._ends
+        starts.clear()
+        ends.clear()
+        for match in extraction_spec(self.instruction).finditer(self.line):
+            name = match.lastgroup
+            if name not in starts:  # First occurrence wins
+                starts[name] = match.start(name)
+                ends[name] = match.end(name)
+        self._scanned = True
+
+    def span(self, name: str) -> Optional[Tuple[int, int]]:
+        """Offsets of `name` in the line, or None if the line does not carry it."""
+        if not self._scanned:
+            self._scan()
+        start = self._starts.get(name)
+        return None if start is None else (start, self._ends[name])
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """The field's value, typed per FIELDS (amounts and decimals as int)."""
+        if not self._scanned:
+            self._scan()
+        start = self._starts.get(name)
+        if start is None:
+            return default
+        text = self.line[start:self._ends[name]]
+        return int(text) if FIELDS[name][2] is int else text
+
+    def __contains__(self, name: str) -> bool:
+        return self.span(name) is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Every field found, materialized (for logging and sinks)."""
+        if not self._scanned:
+            self._scan()
+        return {name: self.get(name) for name in self._starts}
+
+
+class InstructionParser:
+    def __init__(self, activity=None):
         """
         Initializes the InstructionParser class.
-        Add any required initialization logic here.
+
+        :param activity: Optional TransferActivity fed by the transfer, mint-to and burn handlers.
         """
+        self.activity = activity
+        # Load shedding knobs (set by core/overload/overload.py)
+        self.dump_unhandled = True  # Log unhandled "Instruction" lines verbatim
+        self.sample_every = 1       # Parse 1 in N low-priority instructions
+        self._low_priority_seen = 0
+        self._fields = InstructionFields()  # Reused for every line handed to a handler
+
         self.handlers = {
             # Mints
             "InitializeMint2": self.handle_initialize_mint2,
@@ -49,141 +201,133 @@ class InstructionParser:
     def parse_instruction(self, log: str) -> None:
         """
         Parses the log string and dispatches it to the appropriate handler.
+        Handlers get the shared InstructionFields for the line, not the string.
 
         :param log: Log string containing instruction information.
         """
         for instruction, handler in self.handlers.items():
             if instruction in log:
-                # log_info(f"Detected {instruction} instruction.")
-                handler(log)
+                self._dispatch(instruction, handler, log)
                 return
+        self._unhandled(log)
 
+    def parse_tree(self, tree: LogTree) -> None:
+        """
+        Dispatches every "Instruction: <name>" line of a transaction's invoke
+        tree. The name is already split off, so this is one dict lookup per
+        instruction instead of a substring test per handler per line, and
+        handlers can see which program (and depth) emitted the line.
+        """
+        for logged in tree.instructions:
+            handler = self.handlers.get(logged.name)
+            if handler is None:
+                self._unhandled(logged.line)
+            else:
+                self._dispatch(logged.name, handler, logged.line, logged.invocation)
+
+    def _dispatch(self, instruction: str, handler, log: str, invocation: Optional[Invocation] = None) -> None:
+        if self.sample_every > 1 and instruction in LOW_PRIORITY_INSTRUCTIONS:
+            self._low_priority_seen += 1
+            if self._low_priority_seen % self.sample_every:
+                metrics.incr("shed.instructions")
+                return
+        fields = self._fields
+        fields.reset(log, instruction, invocation)
+        handler(fields)
+
+    def _unhandled(self, log: str) -> None:
         if "Instruction" in log:
-            log_info(log)
-        else:
-            pass
-            # log_info(f"Unhandled log detected: {log}")
+            if self.dump_unhandled:
+                log_info(log)
+            else:
+                metrics.incr("shed.log_dumps")
 
-    # Instruction Handlers
-    def _extract_detail(self, log: str, detail_name: str) -> str:
+    def _record_activity(self, fields: InstructionFields, *wallet_fields: str) -> None:
         """
-        Helper function to extract specific details from the log string.
+        Feed a transfer, mint-to or burn into TransferActivity (if enabled).
 
-        :param log: Log string to parse.
-        :param detail_name: The name of the detail to extract.
-        :return: Extracted detail as a string.
+        Only lines that name their mint can be attributed: log notifications
+        carry neither the transaction's accounts nor its token balances, and
+        the token program's own "Instruction: Transfer" lines name nothing.
+        The rest are counted in activity.unattributed.
         """
-        # Example logic to extract detail (adjust pattern as needed)
-        
-        # pattern = fr"{detail_name}: ([a-zA-Z0-9]+)"
-        # match = re.search(pattern, log)
-        # return match.group(1) if match else "Unknown"
-        return "Unknown"
-
-    def handle_initialize_mint(self, log: str) -> None:
-        log_info("Handling InitializeMint logic...")
-        return
+        if self.activity is None:
+            return
+        mint = fields.get("mint")
+        if mint is None:
+            # Plain Transfer / MintTo / Burn lines may not name their mint
+            metrics.incr("activity.unattributed")
+            return
+        # Sampled instructions stand for sample_every of their kind
+        weight = self.sample_every if fields.instruction in LOW_PRIORITY_INSTRUCTIONS else 1
+        self.activity.record(mint, fields.get("amount"), [fields.get(name) for name in wallet_fields], weight)
+
+    # Instruction Handlers
+    # Handlers that only `pass` are for instructions with nothing to record:
+    # having one keeps their lines out of the unhandled-instruction dump.
+    def handle_initialize_mint(self, fields: InstructionFields) -> None:
+        log_debug("Handling InitializeMint logic...")
         # Extract mint authority and decimals
-        # mint_authority = self._extract_detail(log, "MintAuthority")
-        # decimals = self._extract_detail(log, "Decimals")
-        # log_info(f"Mint initialized with authority {mint_authority} and {decimals} decimals")
-
-    def handle_initialize_mint2(self, log: str) -> None:
-        return
-        log_info("Handling InitializeMint2 logic...")
-        # TODO: Add your custom logic here
-
-    def handle_initialize_account(self, log: str) -> None:
-        return
-        log_info("Handling InitializeAccount logic...")
-        # TODO: Add your custom logic here
-
-    def handle_initialize_account2(self, log: str) -> None:
-        return
-        log_info("Handling InitializeAccount2 logic...")
-        # TODO: Add your custom logic here
-
-    def handle_initialize_account3(self, log: str) -> None:
-        return
-        log_info("Handling InitializeAccount3 logic...")
-        # TODO: Add your custom logic here
-
-    def handle_initialize_multisig(self, log: str) -> None:
-        return
-        log_info("Handling InitializeMultisig logic...")
-        # TODO: Add your custom logic here
-
-    def handle_initialize_multisig2(self, log: str) -> None:
-        return
-        log_info("Handling InitializeMultisig2 logic...")
-        # TODO: Add your custom logic here
-
-    def handle_transfer(self, log: str) -> None:
-        return
-        log_info("Handling Transfer logic...")
-        # TODO: Add your custom logic here
-
-    def handle_transfer_checked(self, log: str) -> None:
-        return
-        log_info("Handling TransferChecked logic...")
-        # TODO: Add your custom logic here
-
-    def handle_approve(self, log: str) -> None:
-        return
-        log_info("Handling Approve logic...")
-        # TODO: Add your custom logic here
-
-    def handle_approve_checked(self, log: str) -> None:
-        return
-        log_info("Handling ApproveChecked logic...")
-        # TODO: Add your custom logic here
-
-    def handle_revoke(self, log: str) -> None:
-        return
-        log_info("Handling Revoke logic...")
-        # TODO: Add your custom logic here
-
-    def handle_set_authority(self, log: str) -> None:
-        return
-        log_info("Handling SetAuthority logic...")
-        # TODO: Add your custom logic here
-
-    def handle_mint_to(self, log: str) -> None:
-        return
-        log_info("Handling MintTo logic...")
-        # TODO: Add your custom logic here
-
-    def handle_mint_to_checked(self, log: str) -> None:
-        return
-        log_info("Handling MintToChecked logic...")
-        # TODO: Add your custom logic here
-
-    def handle_burn(self, log: str) -> None:
-        return
-        log_info("Handling Burn logic...")
-        # TODO: Add your custom logic here
-
-    def handle_burn_checked(self, log: str) -> None:
-        return
-        log_info("Handling BurnChecked logic...")
-        # TODO: Add your custom logic here
-
-    def handle_close_account(self, log: str) -> None:
-        return
-        log_info("Handling CloseAccount logic...")
-        # TODO: Add your custom logic here
-
-    def handle_freeze_account(self, log: str) -> None:
-        return
-        log_info("Handling FreezeAccount logic...")
-        # TODO: Add your custom logic here
-
-    def handle_thaw_account(self, log: str) -> None:
-        return
-        log_info("Handling ThawAccount logic...")
-        # TODO: Add your custom logic here
-
-    def handle_sync_native(self, log: str) -> None:
-        return
-        log_info("Handling SyncNative logic...")
-        # TODO: Add your custom logic here
\ No newline at end of file
+        mint_authority = fields.get("authority", "Unknown")
+        decimals = fields.get("decimals", "Unknown")
+        log_debug(f"Mint initialized with authority {mint_authority} and {decimals} decimals")
+
+    def handle_initialize_mint2(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_initialize_account(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_initialize_account2(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_initialize_account3(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_initialize_multisig(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_initialize_multisig2(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_transfer(self, fields: InstructionFields) -> None:
+        self._record_activity(fields, "source", "destination", "authority")
+
+    def handle_transfer_checked(self, fields: InstructionFields) -> None:
+        self._record_activity(fields, "source", "destination", "authority")
+
+    def handle_approve(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_approve_checked(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_revoke(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_set_authority(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_mint_to(self, fields: InstructionFields) -> None:
+        self._record_activity(fields, "account", "authority")
+
+    def handle_mint_to_checked(self, fields: InstructionFields) -> None:
+        self._record_activity(fields, "account", "authority")
+
+    def handle_burn(self, fields: InstructionFields) -> None:
+        self._record_activity(fields, "account", "authority")
+
+    def handle_burn_checked(self, fields: InstructionFields) -> None:
+        self._record_activity(fields, "account", "authority")
+
+    def handle_close_account(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_freeze_account(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_thaw_account(self, fields: InstructionFields) -> None:
+        pass
+
+    def handle_sync_native(self, fields: InstructionFields) -> None:
+        pass
@@ -0,0 +1,265 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.detector.detector import MintDetector
+from core.engines.engine import LogsEvent
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.parser.parser import InstructionParser
+from core.sinks.sinks import Sink
+from constants.constants import DEDUPE_WINDOW, RPC_HTTP_URL, RPC_WS_URL
+
+
+class Pipeline:
+    """
+    Everything after the transport: detection, optional instruction parsing
+    (and transfer activity tracking), enrichment, pool correlation and
+    commitment tracking, then fan-out to the sinks. An optional
+    OverloadController sheds the non-essential parts under load, and an
+    optional FilterSet drops mints no filter rule can match, before their
+    enrichment where the detection alone decides it, and holds back the
+    detections it cannot decide on yet until their mint matches. An optional MintTracker
+    follows the supply and authorities of the mints that get through.
+
+    Every engine feeds the same Pipeline through `process`, so engines only
+    differ in how frames are received and decoded.
+    """
+    def __init__(
+        self,
+        sinks: Optional[List[Sink]] = None,
+        enricher=None,
+        correlator=None,
+        parse_instructions: bool = False,
+        confirmer=None,
+        overload=None,
+        activity=None,
+        filters=None,
+        tracker=None,
+        reorder=None,
+        rpc_ws_url: str = RPC_WS_URL,
+        rpc_http_url: str = RPC_HTTP_URL,
+        metrics_interval: float = 0,
+    ):
+        self.sinks = sinks or []
+        # Endpoints of the pipeline's own subscriptions and lookups (pool correlation)
+        self.rpc_ws_url = rpc_ws_url
+        self.rpc_http_url = rpc_http_url
+        # Seconds between "metrics" events to the sinks (0 = never)
+        self.metrics_interval = metrics_interval
+        self.detector = MintDetector()
+        # Transfer activity comes from parsed instructions, so it turns parsing on
+        self.parser = InstructionParser(activity) if parse_instructions or activity is not None else None
+        self.activity = activity
+        self.enricher = enricher
+        self.correlator = correlator
+        self.confirmer = confirmer
+        self.overload = overload
+        self.filters = filters
+        self.tracker = tracker
+        # Optional core.reorder.reorder.ReorderBuffer: notifications from every
+        # subscription are processed in slot order (its release is process_ordered)
+        self.reorder = reorder
+        self.processed = 0
+        # Highest slot processed per program (kept across restarts by core/snapshot)
+        self.watermarks: Dict[str, int] = {}
+        # Recent (signature, mint) detections: one transaction seen through two
+        # subscriptions, or again after a restart, is only dispatched once
+        self.recent_detections: "OrderedDict[Tuple[str, Optional[str]], None]" = OrderedDict()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        for sink in self.sinks:
+            await sink.start()
+        if self.enricher is not None:
+            await self.enricher.start()
+        if self.tracker is not None:
+            await self.tracker.start()
+        if self.correlator is not None:
+            from core.correlation.correlation import watch_raydium_pools
+
+            self._tasks.append(asyncio.create_task(watch_raydium_pools(
+                self.correlator,
+                rpc_ws_url=self.rpc_ws_url,
+                rpc_http_url=self.rpc_http_url,
+            )))
+        if self.confirmer is not None:
+            self._tasks.append(asyncio.create_task(self.confirmer.run()))
+        if self.activity is not None:
+            self._tasks.append(asyncio.create_task(self.activity.run(self.emit)))
+        if self.reorder is not None:
+            self._tasks.append(asyncio.create_task(self.reorder.run()))
+        if self.overload is not None:
+            if self.enricher is not None:
+                self.overload.watch("enrichment", lambda: len(self.enricher.queue))
+            self._tasks.append(asyncio.create_task(self.overload.run()))
+        if self.filters is not None and self.filters.path:
+            self._tasks.append(asyncio.create_task(self.filters.run()))
+        if self.metrics_interval > 0:
+            from core.metrics.metrics import report_metrics
+
+            self._tasks.append(asyncio.create_task(report_metrics(self.emit, self.metrics_interval)))
+
+    async def drain(self, timeout: float) -> None:
+        """Give queued and in-flight enrichment up to `timeout` seconds to finish."""
+        if self.reorder is not None:
+            self.reorder.flush(everything=True)
+        if self.enricher is None:
+            return
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.enricher.busy and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        if self.enricher.busy:
+            log_info(f"Shutdown deadline reached with {len(self.enricher.snapshot())} mints still to enrich.")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.enricher is not None:
+            await self.enricher.stop()
+        if self.tracker is not None:
+            await self.tracker.stop()
+        for sink in self.sinks:
+            await sink.close()
+
+    def process(self, event: LogsEvent) -> List[Dict[str, Any]]:
+        """Run one notification through the pipeline. Returns its detections (none yet when reordering)."""
+        if self.reorder is not None:
+            self.reorder.push(event.program_id, event.slot, event)
+            return []
+        self.processed += 1
+        if event.slot > self.watermarks.get(event.program_id, 0):
+            self.watermarks[event.program_id] = event.slot
+        if self.parser is not None:
+            self.parser.parse_tree(event.tree)
+
+        detections = self.detector.detect(event)
+        if detections:
+            detections = self.dispatch_batch(detections)
+        return detections
+
+    def process_batch(self, events: List[LogsEvent]) -> List[Dict[str, Any]]:
+        """Run a batch of notifications through parsing and detection in one pass, then dispatch together."""
+        if self.reorder is not None:
+            self.reorder.push_batch([(event.program_id, event.slot, event) for event in events])
+            return []
+        return self.process_ordered(events)
+
+    def process_ordered(self, events: List[LogsEvent]) -> List[Dict[str, Any]]:
+        """`process_batch` for notifications already in the order they should be handled in."""
+        self.processed += len(events)
+        parser = self.parser
+        detect = self.detector.detect
+        watermarks = self.watermarks
+        detections = []
+        for event in events:
+            if event.slot > watermarks.get(event.program_id, 0):
+                watermarks[event.program_id] = event.slot
+            if parser is not None:
+                parser.parse_tree(event.tree)
+            detections.extend(detect(event))
+        if detections:
+            detections = self.dispatch_batch(detections)
+        return detections
+
+    @property
+    def prefilter(self) -> Optional[Tuple[str, ...]]:
+        """Substrings a notification needs to matter here (None: every notification matters)."""
+        if self.parser is not None:
+            return None
+        return self.detector.markers
+
+    def dispatch(self, detection: Dict[str, Any]) -> None:
+        """Emit one detection and hand its mint to correlation and enrichment."""
+        self.dispatch_batch([detection])
+
+    def remember(self, signature: Optional[str], mint: Optional[str]) -> bool:
+        """Add a detection to the dedupe window. Returns False if it was already there."""
+        key = (signature, mint)
+        if key in self.recent_detections:
+            return False
+        self.recent_detections[key] = None
+        if len(self.recent_detections) > DEDUPE_WINDOW:
+            self.recent_detections.popitem(last=False)
+        return True
+
+    def dispatch_batch(self, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Emit detections not seen before and hand their mints on. Returns those."""
+        detections = [d for d in detections if not d["signature"] or self.remember(d["signature"], d["mint"])]
+        if self.filters is not None:
+            detections = [d for d in detections if self.filters.admit_detection(d)]
+        if not detections:
+            return detections
+        emitted = detections
+        if self.filters is not None:
+            emitted = [d for d in detections if not self.filters.is_held(d)]
+        self._track(emitted)
+        self.emit_batch(emitted)
+        for detection in detections:
+            mint_address = detection["mint"]
+            if not mint_address:
+                continue
+            if self.correlator is not None:
+                self.correlator.add_mint(mint_address, detection["slot"], detection["signature"])
+            if self.enricher is not None:
+                self.enricher.submit(mint_address, authority=detection.get("authority"))
+            if self.tracker is not None:
+                self.tracker.track(mint_address)
+        return detections
+
+    def _track(self, detections: List[Dict[str, Any]]) -> None:
+        """Follow the commitment of detections about to be emitted."""
+        if self.confirmer is not None:
+            for detection in detections:
+                detection["status"] = "processed"
+                self.confirmer.track(detection)
+
+    def _release(self, sink_events: List[Dict[str, Any]]) -> None:
+        """Queue the held detections the filters just released, ahead of the event that matched them."""
+        released = self.filters.take_released()
+        if released:
+            self._track(released)
+            sink_events.extend(released)
+
+    def on_status(self, event: Dict[str, Any]) -> None:
+        """Confirmer callback: report the status change and forget retracted mints."""
+        self.emit(event)
+        if event["type"] == "retraction" and event["mint"] and self.correlator is not None:
+            self.correlator.index.pop(event["mint"])
+
+    def on_pool_created(self, event: Dict[str, Any]) -> None:
+        """Correlator callback: report the pool and move its mint up the enrichment queue."""
+        if not self.emit(event):
+            return
+        if self.enricher is not None:
+            self.enricher.promote(event["mint"])
+
+    def emit(self, event: Dict[str, Any]) -> bool:
+        """Send one event to every sink. Returns False if the filters dropped it."""
+        if self.filters is not None and not self.filters.admit(event):
+            if self.tracker is not None:
+                self.tracker.untrack(event["mint"])
+            return False
+        if self.filters is not None and self.filters.released:
+            events: List[Dict[str, Any]] = []
+            self._release(events)
+            events.append(event)
+            for sink in self.sinks:
+                sink.emit_batch(events)
+            return True
+        for sink in self.sinks:
+            sink.emit(event)
+        return True
+
+    def emit_batch(self, events: List[Dict[str, Any]]) -> None:
+        if self.filters is not None:
+            admitted: List[Dict[str, Any]] = []
+            for event in events:
+                if self.filters.admit(event):
+                    self._release(admitted)
+                    admitted.append(event)
+            events = admitted
+        for sink in self.sinks:
+            sink.emit_batch(events)
@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from constants.constants import (
+    RPC_WS_URL,
+    RECONNECT_DELAY,
+    LOGS_COMMITMENT,
+    REORDER_MAX_DELAY,
+    REORDER_MAX_BUFFERED,
+    REORDER_SLOT_LAG,
+)
+
+# Subscription commitment -> slotNotification field that tracks the chain at
+# that commitment (None is the node's default, finalized). slotSubscribe has
+# nothing for confirmed, so those subscriptions get no chain watermark.
+SLOT_FIELDS = {"processed": "slot", "finalized": "root", None: "root"}
+
+
+class ReorderBuffer:
+    """
+    Holds events from several sources (one per subscription) and releases
+    them in slot order, arrival order within a slot.
+
+    A slot is released once the watermark passes it: every source has moved
+    beyond it, or the chain has (slot notifications fed to `on_slot`), by
+    more than `slot_lag` slots of grace for stragglers. Waiting is capped:
+    a slot whose first event has been held `max_delay` seconds is released
+    anyway, with every lower slot, and so are the lowest slots whenever more
+    than `max_buffered` events are held.
+
+    An event for a slot already released is late: it is passed on at once
+    and counted (`late`, metric reorder.late), since holding it back cannot
+    restore the order any more.
+
+    With `rpc_ws_url`, `run` also subscribes to slot notifications there.
+    The chain slot must be at the subscriptions' `commitment`: a processed
+    tip runs ahead of finalized logs by ~32 slots and would release every
+    slot as soon as it arrives.
+    """
+    def __init__(
+        self,
+        release: Callable[[List[Any]], None],
+        max_delay: float = REORDER_MAX_DELAY,
+        max_buffered: int = REORDER_MAX_BUFFERED,
+        slot_lag: int = REORDER_SLOT_LAG,
+        rpc_ws_url: Optional[str] = None,
+        commitment: Optional[str] = LOGS_COMMITMENT,
+    ):
+        self.release = release
+        self.rpc_ws_url = rpc_ws_url
+        self.commitment = commitment
+        self.max_delay = max_delay
+        self.max_buffered = max_buffered
+        self.slot_lag = slot_lag
+        self.buckets: Dict[int, List[Any]] = {}
+        self.first_seen: Dict[int, float] = {}
+        self.slots: List[int] = []               # Heap of buffered slots
+        self.sources: Dict[str, int] = {}        # Source -> highest slot it delivered
+        self.chain_slot = 0                      # Highest slot from slot notifications
+        self.released_through = -1               # Highest slot released so far
+        self.buffered = 0
+        self.late = 0
+        self.forced = 0
+
+    def __len__(self) -> int:
+        return self.buffered
+
+    @property
+    def watermark(self) -> int:
+        """Slots below this are complete: no source is expected to deliver more for them."""
+        chain_slot = self.chain_slot
+        if not self.sources:
+            return chain_slot - self.slot_lag
+        return min(max(slot, chain_slot) for slot in self.sources.values()) - self.slot_lag
+
+    def push(self, source: str, slot: int, event: Any) -> None:
+        self.push_batch([(source, slot, event)])
+
+    def push_batch(self, items: List[tuple]) -> None:
+        """Buffer (source, slot, event) triples, then release what the watermark allows."""
+        now = time.monotonic()
+        late = []
+        sources = self.sources
+        for source, slot, event in items:
+            if slot > sources.get(source, -1):
+                sources[source] = slot
+            if slot <= self.released_through:
+                late.append(event)
+                continue
+            bucket = self.buckets.get(slot)
+            if bucket is None:
+                bucket = self.buckets[slot] = []
+                self.first_seen[slot] = now
+                heapq.heappush(self.slots, slot)
+            bucket.append(event)
+        self.buffered += len(items) - len(late)
+        if late:
+            self.late += len(late)
+            metrics.incr("reorder.late", len(late))
+            self.release(late)
+        self.flush(now)
+
+    def on_slot(self, slot: int) -> None:
+        """A slot notification: the chain has reached `slot`."""
+        if slot > self.chain_slot:
+            self.chain_slot = slot
+            self.flush()
+
+    def on_slot_notification(self, result: Dict[str, int]) -> None:
+        """A slotNotification result: the chain slot at the subscriptions' commitment, if it has one."""
+        field = SLOT_FIELDS.get(self.commitment)
+        if field is not None:
+            self.on_slot(result[field])
+
+    def forget(self, source: str) -> None:
+        """A subscription went away; stop waiting for it."""
+        if self.sources.pop(source, None) is not None:
+            self.flush()
+
+    def flush(self, now: Optional[float] = None, everything: bool = False) -> int:
+        """Release what the watermark, the delay bound and the size bound allow (or `everything`). Returns how many."""
+        if not self.slots:
+            return 0
+        now = time.monotonic() if now is None else now
+        through = self.watermark - 1
+        if everything:
+            through = max(self.slots)
+        else:
+            deadline = now - self.max_delay
+            overdue = -1
+            # first_seen is in arrival order: nothing is overdue unless the oldest is
+            if next(iter(self.first_seen.values())) <= deadline:
+                overdue = max(slot for slot, seen in self.first_seen.items() if seen <= deadline)
+            if overdue > through:
+                through = overdue
+                self.forced += 1
+                metrics.incr("reorder.forced.delay")
+        released = []
+        slots, buckets = self.slots, self.buckets
+        while slots and (slots[0] <= through or self.buffered - len(released) > self.max_buffered):
+            slot = heapq.heappop(slots)
+            if slot > through:
+                self.forced += 1
+                metrics.incr("reorder.forced.size")
+            released.extend(buckets.pop(slot))
+            del self.first_seen[slot]
+            if slot > self.released_through:
+                self.released_through = slot
+        if released:
+            self.buffered -= len(released)
+            metrics.set_gauge("reorder.buffered", self.buffered)
+            self.release(released)
+        return len(released)
+
+    async def run(self) -> None:
+        """Enforce `max_delay` while no new events arrive to trigger it, and follow slot notifications."""
+        slots = None
+        if self.rpc_ws_url:
+            if self.commitment in SLOT_FIELDS:
+                slots = asyncio.create_task(watch_slots(self, self.rpc_ws_url))
+            else:
+                log_info(f"No slot watermark at {self.commitment} commitment; ordering by the subscriptions' own slots.")
+        interval = max(self.max_delay / 4, 0.005)
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.flush()
+        finally:
+            if slots is not None:
+                slots.cancel()
+                await asyncio.gather(slots, return_exceptions=True)
+
+
+async def watch_slots(buffer: ReorderBuffer, rpc_ws_url: str = RPC_WS_URL) -> None:
+    """Feed slotSubscribe notifications to `buffer.on_slot_notification`, reconnecting on errors."""
+    import websockets
+
+    while True:
+        try:
+            async with websockets.connect(rpc_ws_url, ping_interval=None, close_timeout=10) as websocket:
+                await websocket.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "slotSubscribe"}))
+                log_info("Subscribed to slot notifications (reorder watermark).")
+                async for message in websocket:
+                    data = json.loads(message)
+                    if data.get("method") == "slotNotification":
+                        buffer.on_slot_notification(data["params"]["result"])
+                    elif "error" in data:
+                        log_error(f"slotSubscribe failed: {data['error']}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log_warning(f"(Slots) {e}. Reconnecting in {RECONNECT_DELAY}s...")
+        await asyncio.sleep(RECONNECT_DELAY)
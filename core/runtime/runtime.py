@@ -0,0 +1,100 @@
+import asyncio
+import functools
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Optional
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from constants.constants import USE_UVLOOP, EXECUTOR_WORKERS
+
+
+def new_event_loop(use_uvloop: bool = USE_UVLOOP) -> asyncio.AbstractEventLoop:
+    """Create a uvloop loop if asked for and installed, else a stock asyncio loop."""
+    if use_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            log_warning("uvloop is not installed; using the default asyncio loop.")
+        else:
+            return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+async def run_sync(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run blocking `func` on the runtime's executor and await its result.
+
+    Anything that blocks (requests, sqlite, CPU-heavy decoding) must go
+    through here rather than run on the loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+class Runtime:
+    """
+    Owns the process's single event loop.
+
+    Networking, enrichment and sinks all run as tasks on this loop; blocking
+    work goes to one explicit thread pool (the loop's default executor, see
+    `run_sync`). SIGINT/SIGTERM cancel the main task so its `finally` blocks
+    run, then every leftover task is cancelled and awaited before the loop
+    and executor are closed.
+    """
+    def __init__(self, use_uvloop: bool = USE_UVLOOP, executor_workers: int = EXECUTOR_WORKERS):
+        self.use_uvloop = use_uvloop
+        self.executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="solsniff")
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stop_signal: Optional[int] = None
+
+    def run(self, main: Coroutine) -> Any:
+        """Run `main` to completion (or until a stop signal) and tear everything down."""
+        self.loop = new_event_loop(self.use_uvloop)
+        asyncio.set_event_loop(self.loop)
+        self.loop.set_default_executor(self.executor)
+        log_debug(f"Event loop: {type(self.loop).__module__}.{type(self.loop).__name__}")
+
+        main_task = self.loop.create_task(main)
+        self._install_signal_handlers(main_task)
+        try:
+            return self.loop.run_until_complete(main_task)
+        except asyncio.CancelledError:
+            if self.stop_signal is None:
+                raise
+            return None
+        finally:
+            self._shutdown()
+
+    def _install_signal_handlers(self, main_task: asyncio.Task) -> None:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(sig, self._on_signal, sig, main_task)
+            except (NotImplementedError, RuntimeError):
+                # Windows / not the main thread: KeyboardInterrupt still works
+                pass
+
+    def _on_signal(self, sig: int, main_task: asyncio.Task) -> None:
+        if self.stop_signal is None:
+            log_info(f"Received {signal.Signals(sig).name}, shutting down...")
+        self.stop_signal = sig
+        main_task.cancel()
+
+    def _shutdown(self) -> None:
+        loop = self.loop
+        try:
+            pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.remove_signal_handler(sig)
+                except (NotImplementedError, RuntimeError):
+                    pass
+            asyncio.set_event_loop(None)
+            loop.close()
+            self.loop = None
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from core.engines.engine import LogsEvent
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.logtree.logtree import mentions_any
+from core.metrics.metrics import metrics
+from core.runtime.runtime import run_sync
+from core.utils.rate_limiter import RateLimiter
+from constants.constants import (
+    RPC_HTTP_URL,
+    SCAN_CONCURRENCY,
+    SCAN_RATE_LIMIT,
+    SCAN_RETRIES,
+    SCAN_TIMEOUT,
+    SCAN_CHECKPOINT_INTERVAL,
+    SCAN_PROGRESS_INTERVAL,
+)
+
+# getBlock errors for slots that have no block (skipped by their leader)
+SKIPPED_SLOT_CODES = frozenset({-32007, -32009})
+GET_BLOCK_OPTIONS = {
+    "encoding": "json",
+    "transactionDetails": "full",  # The only level that includes the logs
+    "maxSupportedTransactionVersion": 0,
+    "rewards": False,
+    "commitment": "finalized",
+}
+
+
+class SlotSkipped(Exception):
+    pass
+
+
+def fetch_block(session, url: str, slot: int, timeout: float = SCAN_TIMEOUT) -> Dict[str, Any]:
+    """getBlock over a pooled requests.Session. Raises SlotSkipped for slots without a block."""
+    payload = {"jsonrpc": "2.0", "id": slot, "method": "getBlock", "params": [slot, GET_BLOCK_OPTIONS]}
+    response = session.post(url, json=payload, timeout=timeout)
+    body = response.json()
+    error = body.get("error")
+    if error is not None:
+        if error.get("code") in SKIPPED_SLOT_CODES:
+            raise SlotSkipped(slot)
+        raise ValueError(f"getBlock {slot} failed: {error}")
+    if body.get("result") is None:
+        raise SlotSkipped(slot)
+    return body["result"]
+
+
+def block_events(block: Dict[str, Any], slot: int, program_ids: Iterable[str]) -> List[LogsEvent]:
+    """
+    The block's transactions as the LogsEvents logsSubscribe would have
+    delivered: one per transaction whose logs mention one of `program_ids`,
+    attributed to the first of them it mentions.
+    """
+    markers = [(program_id, f"Program {program_id} invoke") for program_id in program_ids]
+    events = []
+    for transaction in block.get("transactions") or ():
+        meta = transaction.get("meta") or {}
+        logs = meta.get("logMessages")
+        if not logs:
+            continue
+        for program_id, marker in markers:
+            if mentions_any(logs, (marker,)):
+                signatures = transaction["transaction"]["signatures"]
+                events.append(LogsEvent(program_id, slot, signatures[0], meta.get("err"), logs))
+                break
+    return events
+
+
+###############################################################################
+# Checkpoint
+###############################################################################
+class ScanCheckpoint:
+    """
+    Which slots of a scan are finished, saved as JSON so an interrupted scan
+    resumes where it stopped.
+
+    Blocks finish out of order, so this keeps the highest slot below which
+    everything is done (`done_through`) plus the finished slots above it.
+    Slots whose fetch kept failing are kept in `failed`: they do not hold
+    `done_through` back, and are retried first on resume.
+    """
+    def __init__(self, start_slot: int, end_slot: int, path: Optional[str] = None):
+        self.start_slot = start_slot
+        self.end_slot = end_slot
+        self.path = path
+        self.done_through = start_slot - 1
+        self.done: Set[int] = set()
+        self.failed: Set[int] = set()
+
+    @classmethod
+    def load(cls, start_slot: int, end_slot: int, path: Optional[str]) -> "ScanCheckpoint":
+        """Resume from `path` if it holds a checkpoint of the same range, else start over."""
+        checkpoint = cls(start_slot, end_slot, path)
+        if not path or not os.path.exists(path):
+            return checkpoint
+        with open(path) as f:
+            saved = json.load(f)
+        if (saved["start_slot"], saved["end_slot"]) != (start_slot, end_slot):
+            raise ValueError(
+                f"Checkpoint {path} belongs to a scan of slots {saved['start_slot']}-{saved['end_slot']}; "
+                f"use another --checkpoint or delete it"
+            )
+        checkpoint.done_through = saved["done_through"]
+        checkpoint.done = set(saved["done"])
+        checkpoint.failed = set(saved.get("failed", ()))
+        return checkpoint
+
+    @property
+    def finished(self) -> int:
+        # Failed slots are either at or below done_through or in done
+        return self.done_through - self.start_slot + 1 + len(self.done) - len(self.failed)
+
+    @property
+    def complete(self) -> bool:
+        return self.done_through >= self.end_slot and not self.failed
+
+    def remaining(self) -> Iterator[int]:
+        yield from sorted(self.failed)
+        for slot in range(self.done_through + 1, self.end_slot + 1):
+            if slot not in self.done:
+                yield slot
+
+    def mark(self, slot: int) -> None:
+        self.failed.discard(slot)
+        self._settle(slot)
+
+    def mark_failed(self, slot: int) -> None:
+        self.failed.add(slot)
+        self._settle(slot)
+
+    def _settle(self, slot: int) -> None:
+        if slot <= self.done_through:
+            return  # A failed slot being retried
+        self.done.add(slot)
+        while self.done_through + 1 in self.done:
+            self.done_through += 1
+            self.done.discard(self.done_through)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "start_slot": self.start_slot,
+                "end_slot": self.end_slot,
+                "done_through": self.done_through,
+                "done": sorted(self.done),
+                "failed": sorted(self.failed),
+                "saved_at": time.time(),
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+###############################################################################
+# Scanner
+###############################################################################
+class Scanner:
+    """
+    Replays a past slot range through a Pipeline: the same parsing,
+    detection, filters and sinks as a live run, fed from getBlock instead
+    of subscriptions.
+
+    `concurrency` fetches run at once, together limited to `rate_limit`
+    requests per second; each block is fetched on the runtime's executor,
+    then decoded and processed on the loop as it arrives (so blocks are
+    handled in completion order, not slot order). Failed fetches are retried
+    `retries` times with backoff, then left for the next run. Progress is
+    checkpointed every SCAN_CHECKPOINT_INTERVAL seconds and on exit,
+    including cancellation.
+    """
+    def __init__(
+        self,
+        pipeline,
+        start_slot: int,
+        end_slot: int,
+        program_ids: Iterable[str],
+        rpc_http_url: str = RPC_HTTP_URL,
+        concurrency: int = SCAN_CONCURRENCY,
+        rate_limit: int = SCAN_RATE_LIMIT,
+        checkpoint_path: Optional[str] = None,
+        retries: int = SCAN_RETRIES,
+    ):
+        if end_slot < start_slot:
+            raise ValueError(f"Empty slot range {start_slot}-{end_slot}")
+        self.pipeline = pipeline
+        self.program_ids = list(program_ids)
+        self.rpc_http_url = rpc_http_url
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.retries = retries
+        self.checkpoint = ScanCheckpoint.load(start_slot, end_slot, checkpoint_path)
+        self.blocks = 0
+        self.skipped = 0
+        self.transactions = 0
+        self.detections = 0
+        self.failed: List[int] = []
+        self._session = None
+        self._scanned = 0
+
+    async def run(self) -> Dict[str, Any]:
+        """Scan every unfinished slot. Returns the report (also logged)."""
+        from core.execution.execution import new_session
+
+        checkpoint = self.checkpoint
+        if checkpoint.finished:
+            log_info(f"Resuming scan: {checkpoint.finished} of {checkpoint.end_slot - checkpoint.start_slot + 1} slots already done.")
+        self._session = new_session(self.concurrency)
+        slots = checkpoint.remaining()
+        started = time.monotonic()
+        workers = [asyncio.create_task(self._worker(slots)) for _ in range(self.concurrency)]
+        progress = asyncio.create_task(self._report_progress(started))
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            log_info(f"Scan interrupted with {checkpoint.finished} slots done; run it again to resume.")
+            raise
+        finally:
+            for task in workers + [progress]:
+                task.cancel()
+            await asyncio.gather(*workers, progress, return_exceptions=True)
+            checkpoint.save()
+            self._session.close()
+        report = self.report(time.monotonic() - started)
+        log_info(
+            f"Scanned {report['slots']} slots in {report['seconds']}s ({report['slots_per_second']} slots/s): "
+            f"{self.blocks} blocks, {self.skipped} skipped, {self.transactions} transactions, "
+            f"{self.detections} detections, {len(self.failed)} failed"
+        )
+        if self.failed:
+            log_warning(f"{len(self.failed)} slots failed; run the scan again to retry them (first: {self.failed[:5]})")
+        return report
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "slots": self._scanned,
+            "seconds": round(elapsed, 2),
+            "slots_per_second": round(self._scanned / elapsed, 1) if elapsed else 0.0,
+            "blocks": self.blocks,
+            "skipped": self.skipped,
+            "transactions": self.transactions,
+            "detections": self.detections,
+            "failed": len(self.failed),
+            "complete": self.checkpoint.complete,
+        }
+
+    async def _worker(self, slots: Iterator[int]) -> None:
+        for slot in slots:  # Shared by every worker: each slot is taken once
+            events = await self._fetch(slot)
+            if events is None:
+                self.checkpoint.mark_failed(slot)
+                continue
+            if events:
+                self.detections += len(self.pipeline.process_batch(events))
+            self.checkpoint.mark(slot)
+            self._scanned += 1
+
+    async def _fetch(self, slot: int) -> Optional[List[LogsEvent]]:
+        """The slot's events ([] if skipped), or None once every retry failed."""
+        for attempt in range(self.retries + 1):
+            await self.rate_limiter.wait()
+            try:
+                block = await run_sync(fetch_block, self._session, self.rpc_http_url, slot)
+            except SlotSkipped:
+                self.skipped += 1
+                metrics.incr("scan.skipped")
+                return []
+            except Exception as e:
+                metrics.incr("scan.errors")
+                if attempt < self.retries:
+                    log_debug(f"getBlock {slot} failed ({e}), retrying")
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+                    continue
+                log_error(f"Giving up on slot {slot}: {e}")
+                self.failed.append(slot)
+                return None
+            self.blocks += 1
+            self.transactions += len(block.get("transactions") or ())
+            metrics.incr("scan.blocks")
+            return block_events(block, slot, self.program_ids)
+
+    async def _report_progress(self, started: float) -> None:
+        last_saved = time.monotonic()
+        total = self.checkpoint.end_slot - self.checkpoint.start_slot + 1
+        while True:
+            await asyncio.sleep(SCAN_PROGRESS_INTERVAL)
+            now = time.monotonic()
+            rate = self._scanned / (now - started)
+            left = total - self.checkpoint.finished
+            metrics.set_gauge("scan.slots_per_second", rate)
+            log_info(
+                f"Scan progress: {self.checkpoint.finished}/{total} slots, {rate:.1f} slots/s, "
+                f"{self.detections} detections" + (f", ~{left / rate:.0f}s left" if rate else "")
+            )
+            if now - last_saved >= SCAN_CHECKPOINT_INTERVAL:
+                self.checkpoint.save()
+                last_saved = now
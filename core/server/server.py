@@ -0,0 +1,244 @@
+import asyncio
+import json
+import os
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional, Set
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from constants.constants import (
+    FANOUT_HOST,
+    FANOUT_PORT,
+    FANOUT_SOCKET_PATH,
+    FANOUT_QUEUE_SIZE,
+    FANOUT_SLOW_POLICY,
+)
+
+SLOW_POLICIES = ("drop", "coalesce", "disconnect")
+
+
+def encode_event(event: Dict[str, Any]) -> bytes:
+    """Encode an event as one compact JSON line."""
+    return json.dumps(event, separators=(",", ":"), default=str).encode() + b"\n"
+
+
+class Subscriber:
+    """
+    One connected consumer: its filter and its bounded send queue.
+
+    The filter maps event fields to the values the consumer wants, e.g.
+    {"type": ["detection"], "program_id": ["Tokenkeg..."]}. An empty filter
+    matches everything.
+    """
+    def __init__(self, writer: asyncio.StreamWriter, queue_size: int, policy: str):
+        self.writer = writer
+        self.queue_size = queue_size
+        self.policy = policy
+        self.filters: Dict[str, Set[Any]] = {}
+        self.frames: "deque[bytes]" = deque()
+        self.coalesced: "OrderedDict[Any, bytes]" = OrderedDict()
+        self.wakeup = asyncio.Event()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    @property
+    def peer(self) -> str:
+        return str(self.writer.get_extra_info("peername") or "unix")
+
+    def set_filters(self, raw: Dict[str, Any]) -> None:
+        filters = {}
+        for field, allowed in raw.items():
+            if not isinstance(allowed, list):
+                allowed = [allowed]
+            filters[field] = set(allowed)
+        self.filters = filters
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        for field, allowed in self.filters.items():
+            if event.get(field) not in allowed:
+                return False
+        return True
+
+    def pending(self) -> int:
+        return len(self.frames) + len(self.coalesced)
+
+    def offer(self, frame: bytes, key: Any) -> bool:
+        """
+        Queue a frame without blocking, applying the slow-consumer policy.
+
+        :return: False if the subscriber must be disconnected.
+        """
+        if self.policy == "coalesce":
+            if key is None:
+                key = object()  # Nothing to coalesce with: queued in order, never replaced
+            if key in self.coalesced:
+                # Newer state for the same key replaces the queued one in place
+                self.coalesced[key] = frame
+                metrics.incr("fanout.coalesced")
+            else:
+                if len(self.coalesced) >= self.queue_size:
+                    self.coalesced.popitem(last=False)
+                    self.dropped += 1
+                    metrics.incr("fanout.dropped")
+                self.coalesced[key] = frame
+        elif len(self.frames) >= self.queue_size:
+            if self.policy == "disconnect":
+                return False
+            # "drop": the oldest frame goes, the consumer always sees the newest
+            self.frames.popleft()
+            self.frames.append(frame)
+            self.dropped += 1
+            metrics.incr("fanout.dropped")
+        else:
+            self.frames.append(frame)
+        self.wakeup.set()
+        return True
+
+    def _next_frame(self) -> Optional[bytes]:
+        if self.frames:
+            return self.frames.popleft()
+        if self.coalesced:
+            return self.coalesced.popitem(last=False)[1]
+        return None
+
+    async def send_loop(self) -> None:
+        """Write queued frames until the subscriber goes away."""
+        while not self.closed:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            frame = self._next_frame()
+            while frame is not None and not self.closed:
+                self.writer.write(frame)
+                self.sent += 1
+                # Only yield to the socket once the kernel buffer is getting full
+                if self.writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await self.writer.drain()
+                frame = self._next_frame()
+            if not self.closed:
+                await self.writer.drain()
+
+
+class FanoutServer:
+    """
+    Publishes detection events to local consumers over TCP or a Unix socket.
+
+    Framing is one compact JSON object per line. A consumer may send a JSON
+    filter object (one per line, replacing the previous one) at any time.
+    Each event is encoded once and the same bytes are queued for every
+    matching subscriber, so publishing never waits on a slow client.
+    """
+    def __init__(
+        self,
+        host: str = FANOUT_HOST,
+        port: int = FANOUT_PORT,
+        socket_path: Optional[str] = FANOUT_SOCKET_PATH,
+        queue_size: int = FANOUT_QUEUE_SIZE,
+        policy: str = FANOUT_SLOW_POLICY,
+        coalesce_field: str = "mint",
+    ):
+        if policy not in SLOW_POLICIES:
+            raise ValueError(f"Unknown slow-consumer policy {policy!r}, expected one of {SLOW_POLICIES}")
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.queue_size = queue_size
+        self.policy = policy
+        self.coalesce_field = coalesce_field
+        self.subscribers: Set[Subscriber] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        """Start accepting subscribers on the running loop."""
+        self._loop = asyncio.get_running_loop()
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+            log_info(f"Fan-out server listening on {self.socket_path}")
+        else:
+            self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+            log_info(f"Fan-out server listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        """Close the listener and every subscriber connection."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for subscriber in list(self.subscribers):
+            self._disconnect(subscriber)
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """
+        Queue an event for every matching subscriber. Must run on the server loop.
+
+        :return: Number of subscribers the event was queued for.
+        """
+        if not self.subscribers:
+            return 0
+        frame = None
+        # Only newer state of the same kind for the same thing replaces a queued event
+        key = event.get(self.coalesce_field)
+        if key is not None:
+            key = (event.get("type"), key)
+        delivered = 0
+        for subscriber in list(self.subscribers):
+            if not subscriber.matches(event):
+                continue
+            if frame is None:
+                frame = encode_event(event)
+            if subscriber.offer(frame, key):
+                delivered += 1
+            else:
+                log_warning(f"Disconnecting slow fan-out subscriber {subscriber.peer}.")
+                metrics.incr("fanout.disconnected")
+                self._disconnect(subscriber)
+        metrics.incr("fanout.published")
+        return delivered
+
+    def publish_threadsafe(self, event: Dict[str, Any]) -> None:
+        """Publish from a thread other than the one running the server loop."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self.publish, event)
+
+    def _disconnect(self, subscriber: Subscriber) -> None:
+        subscriber.closed = True
+        subscriber.wakeup.set()
+        self.subscribers.discard(subscriber)
+        subscriber.writer.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        subscriber = Subscriber(writer, self.queue_size, self.policy)
+        self.subscribers.add(subscriber)
+        log_info(f"Fan-out subscriber connected: {subscriber.peer}")
+        sender = asyncio.create_task(subscriber.send_loop())
+        try:
+            while not subscriber.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    raw = json.loads(line)
+                except ValueError:
+                    log_debug(f"Ignoring malformed filter from {subscriber.peer}: {line!r}")
+                    continue
+                if isinstance(raw, dict):
+                    subscriber.set_filters(raw)
+                    log_debug(f"Filter for {subscriber.peer}: {subscriber.filters}")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            log_error(f"Fan-out subscriber {subscriber.peer} failed: {e}")
+        finally:
+            self._disconnect(subscriber)
+            sender.cancel()
+            try:
+                await sender
+            except (asyncio.CancelledError, ConnectionError):
+                pass
+            log_info(f"Fan-out subscriber disconnected: {subscriber.peer} (sent={subscriber.sent}, dropped={subscriber.dropped})")
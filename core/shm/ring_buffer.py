@@ -0,0 +1,280 @@
+import struct
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from constants.constants import SHM_RING_SLOTS, SHM_SLOT_SIZE, SHM_MAX_CONSUMERS
+
+###############################################################################
+# Layout
+###############################################################################
+# Header: u64 words
+#   0 magic | 1 slot count | 2 slot size | 3 last published seq | 4 closed
+#   5 overwritten (producer side) | 6 oversize rejects | 7.. consumer cursors
+# Slot:   u64 stamp | u32 length | u32 pad | payload[slot size]
+#
+# A slot's stamp is (seq << 1) | 1 while the producer writes it and seq << 1
+# once it is published (seqlock). Aligned 8-byte stores through a "Q" view are
+# single machine stores, and x86-64/ARM64 keep them untorn, so readers never
+# need a lock: they check the stamp before and after reading a payload.
+MAGIC = 0x534F4C534E494646  # "SOLSNIFF"
+H_MAGIC, H_SLOTS, H_SLOT_SIZE, H_WRITE_SEQ, H_CLOSED, H_OVERWRITTEN, H_OVERSIZE = range(7)
+H_CURSORS = 7
+SLOT_HEADER = 16
+
+
+class ShmRingBuffer:
+    """
+    Single-producer / multi-consumer ring buffer on `multiprocessing.shared_memory`.
+
+    The producer never waits for consumers: when the ring wraps, the oldest
+    records are overwritten and counted. Consumers read payloads in place as
+    memoryviews and detect records overwritten under them via the stamp, so
+    drops are always visible through sequence gaps and counters.
+
+    Create with `ShmRingBuffer.create()` in the producer and
+    `ShmRingBuffer.attach(name)` in consumer processes.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.header = shm.buf[: (H_CURSORS + SHM_MAX_CONSUMERS) * 8].cast("Q")
+        if self.header[H_MAGIC] != MAGIC:
+            raise ValueError(f"Shared memory {shm.name} is not a SolSniff ring buffer")
+        self.slots = self.header[H_SLOTS]
+        self.slot_size = self.header[H_SLOT_SIZE]
+        self.stride = SLOT_HEADER + self.slot_size
+        self.data_offset = (H_CURSORS + SHM_MAX_CONSUMERS) * 8
+        # One u64 view per slot stamp, one u32 view per slot length
+        body = shm.buf[self.data_offset: self.data_offset + self.slots * self.stride]
+        self.body = body
+        self.stamps = [body[i * self.stride: i * self.stride + 8].cast("Q") for i in range(self.slots)]
+        self.lengths = [body[i * self.stride + 8: i * self.stride + 12].cast("I") for i in range(self.slots)]
+        self.written = 0
+
+    ###########################################################################
+    # Lifecycle
+    ###########################################################################
+    @classmethod
+    def create(cls, slots: int = SHM_RING_SLOTS, slot_size: int = SHM_SLOT_SIZE, name: Optional[str] = None):
+        slot_size = (slot_size + 7) // 8 * 8
+        size = (H_CURSORS + SHM_MAX_CONSUMERS) * 8 + slots * (SLOT_HEADER + slot_size)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = shm.buf[: (H_CURSORS + SHM_MAX_CONSUMERS) * 8].cast("Q")
+        for i in range(len(header)):
+            header[i] = 0
+        header[H_SLOTS] = slots
+        header[H_SLOT_SIZE] = slot_size
+        header[H_MAGIC] = MAGIC
+        header.release()
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def closed(self) -> bool:
+        return bool(self.header[H_CLOSED])
+
+    def close(self) -> None:
+        """Mark the ring closed so consumers stop once they have drained it."""
+        self.header[H_CLOSED] = 1
+
+    def release(self) -> None:
+        """Drop this process's mapping (and unlink it if we created it)."""
+        for view in self.stamps + self.lengths:
+            view.release()
+        self.stamps, self.lengths = [], []
+        self.body.release()
+        self.header.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    ###########################################################################
+    # Producer
+    ###########################################################################
+    def write(self, payload) -> bool:
+        """
+        Publish one record. Never blocks.
+
+        :return: False if the payload is larger than a slot (counted, not written).
+        """
+        length = len(payload)
+        if length > self.slot_size:
+            self.header[H_OVERSIZE] += 1
+            return False
+
+        header = self.header
+        seq = header[H_WRITE_SEQ] + 1
+        index = seq % self.slots
+        if seq > self.slots and self._min_cursor() <= seq - self.slots:
+            header[H_OVERWRITTEN] += 1
+
+        stamp = self.stamps[index]
+        stamp[0] = (seq << 1) | 1
+        start = index * self.stride + SLOT_HEADER
+        self.body[start: start + length] = payload
+        self.lengths[index][0] = length
+        stamp[0] = seq << 1
+        header[H_WRITE_SEQ] = seq
+        self.written += 1
+        return True
+
+    def _min_cursor(self) -> int:
+        lowest = 0
+        for cursor in self.header[H_CURSORS:]:
+            if cursor and (not lowest or cursor < lowest):
+                lowest = cursor
+        return lowest or (1 << 63)
+
+    ###########################################################################
+    # Consumers
+    ###########################################################################
+    def consumer(
+        self,
+        consumer_id: int = 0,
+        group_size: int = 1,
+        member: int = 0,
+        start_seq: Optional[int] = None,
+    ) -> "RingConsumer":
+        return RingConsumer(self, consumer_id, group_size, member, start_seq)
+
+    def reserve(self, consumer_id: int, seq: int = 1) -> None:
+        """
+        Publish a cursor at `seq` for a consumer that has not attached yet,
+        so records it will read from there are counted if overwritten.
+        """
+        self.header[H_CURSORS + consumer_id] = seq
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "published": self.header[H_WRITE_SEQ],
+            "overwritten": self.header[H_OVERWRITTEN],
+            "oversize": self.header[H_OVERSIZE],
+        }
+
+
+class RingConsumer:
+    """
+    One reader's cursor into a ShmRingBuffer.
+
+    Consumers in a group of `group_size` split the stream: member k only
+    takes sequence numbers with seq % group_size == k, so a worker pool
+    shares the work without any cross-process lock. A group of one sees
+    every record.
+
+    A consumer starts after the last published record, or at `start_seq`
+    (1 = the first record ever written) to pick up what was published
+    before it attached.
+    """
+    def __init__(self, ring: ShmRingBuffer, consumer_id: int, group_size: int, member: int, start_seq: Optional[int] = None):
+        if not 0 <= consumer_id < SHM_MAX_CONSUMERS:
+            raise ValueError(f"consumer_id must be below {SHM_MAX_CONSUMERS}")
+        self.ring = ring
+        self.consumer_id = consumer_id
+        self.group_size = group_size
+        self.member = member
+        self.next_seq = self._first_seq(ring.header[H_WRITE_SEQ] + 1 if start_seq is None else start_seq)
+        self.consumed = 0
+        self.dropped = 0    # Records overwritten before we got to them
+        self.torn = 0       # Records overwritten while we were reading them
+        self._publish_cursor()
+
+    def _first_seq(self, seq: int) -> int:
+        """Smallest seq >= `seq` that belongs to this member."""
+        return seq + (self.member - seq) % self.group_size
+
+    def _publish_cursor(self) -> None:
+        self.ring.header[H_CURSORS + self.consumer_id] = self.next_seq
+
+    def lag(self) -> int:
+        """Published records this consumer has not looked at yet (whole group)."""
+        return max(self.ring.header[H_WRITE_SEQ] - self.next_seq + 1, 0)
+
+    def consume(self, handler: Callable[[int, memoryview], Any], max_items: int = 256) -> List[Any]:
+        """
+        Run `handler(seq, payload)` over up to `max_items` available records.
+
+        `payload` is a memoryview straight into shared memory, valid only
+        during the call; copy anything you keep. Results of records that were
+        overwritten while the handler ran are discarded and counted in `torn`.
+
+        :return: The handler results of the records read intact.
+        """
+        ring = self.ring
+        results = []
+        while len(results) < max_items:
+            seq = self.next_seq
+            index = seq % ring.slots
+            stamp = ring.stamps[index][0]
+            expected = seq << 1
+            if stamp <= (expected | 1) and stamp != expected:
+                break  # Not written yet, or still being written
+            if stamp != expected:
+                # The producer lapped us: skip to the oldest record still in the ring
+                oldest = self._first_seq(max(ring.header[H_WRITE_SEQ] - ring.slots + 2, seq + 1))
+                self.dropped += (oldest - seq) // self.group_size
+                self.next_seq = oldest
+                continue
+
+            start = index * ring.stride + SLOT_HEADER
+            payload = ring.body[start: start + ring.lengths[index][0]]
+            try:
+                result = handler(seq, payload)
+            finally:
+                payload.release()
+            if ring.stamps[index][0] == expected:
+                results.append(result)
+                self.consumed += 1
+            else:
+                self.torn += 1
+            self.next_seq = seq + self.group_size
+        self._publish_cursor()
+        return results
+
+    def read(self, max_items: int = 256) -> List[Tuple[int, bytes]]:
+        """Like `consume`, returning (seq, copied payload) pairs."""
+        return self.consume(lambda seq, payload: (seq, bytes(payload)), max_items)
+
+    def close(self) -> None:
+        self.ring.header[H_CURSORS + self.consumer_id] = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"consumed": self.consumed, "dropped": self.dropped, "torn": self.torn, "lag": self.lag()}
+
+
+###############################################################################
+# Fixed-Layout Detection Records
+###############################################################################
+# slot, detected_at, mint, signature, program id, authority (base58, NUL padded)
+DETECTION_RECORD = struct.Struct("<Qd44s88s44s44s")
+
+
+def pack_detection(detection: Dict[str, Any]) -> bytes:
+    return DETECTION_RECORD.pack(
+        detection["slot"],
+        detection["detected_at"],
+        (detection.get("mint") or "").encode(),
+        (detection.get("signature") or "").encode(),
+        (detection.get("program_id") or "").encode(),
+        (detection.get("authority") or "").encode(),
+    )
+
+
+def unpack_detection(payload) -> Dict[str, Any]:
+    """Decode a record in place (works on a shared-memory memoryview)."""
+    slot, detected_at, mint, signature, program_id, authority = DETECTION_RECORD.unpack_from(payload)
+    return {
+        "type": "detection",
+        "slot": slot,
+        "signature": signature.rstrip(b"\0").decode() or None,
+        "mint": mint.rstrip(b"\0").decode() or None,
+        "authority": authority.rstrip(b"\0").decode() or None,
+        "program_id": program_id.rstrip(b"\0").decode() or None,
+        "detected_at": detected_at,
+    }
@@ -0,0 +1,187 @@
+import asyncio
+import multiprocessing
+import time
+from typing import Iterable, List, Optional
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.shm.ring_buffer import ShmRingBuffer, RingConsumer, DETECTION_RECORD, pack_detection, unpack_detection
+from constants.constants import (
+    SHM_RING_SLOTS,
+    SHM_SLOT_SIZE,
+    SHM_MAX_CONSUMERS,
+    SHM_POLL_INTERVAL,
+    SHM_RESULT_SLOTS,
+)
+
+WORKER_JOIN_TIMEOUT = 5
+
+
+###############################################################################
+# Worker Process
+###############################################################################
+def worker_main(frames_name: str, results_name: str, member: int, group_size: int, program_ids: List[str]) -> None:
+    """
+    Child-process entry point: decode this worker's share of the raw frames,
+    run detection and publish fixed-layout detection records.
+
+    Byte 0 of every frame record is the index of its program in
+    `program_ids`; the rest is the frame exactly as the socket delivered it.
+    """
+    from core.detector.detector import MintDetector
+    from core.engines.websockets_engine import WebsocketsEngine
+    from core.logs.logs import setup_logging
+
+    setup_logging(log_dir=None)
+    engines = [WebsocketsEngine([program_id]) for program_id in program_ids]
+    detector = MintDetector()
+    frames = ShmRingBuffer.attach(frames_name)
+    results = ShmRingBuffer.attach(results_name)
+    # From the first frame: the reader may have written some before this process started
+    consumer = frames.consumer(consumer_id=member, group_size=group_size, member=member, start_seq=1)
+
+    def handle(seq, payload):
+        # json.loads needs bytes, so the frame is copied once here
+        event = engines[payload[0]].decode(payload[1:].tobytes())
+        return detector.detect(event) if event is not None else []
+
+    try:
+        while True:
+            batches = consumer.consume(handle)
+            for detections in batches:
+                for detection in detections:
+                    results.write(pack_detection(detection))
+            if batches:
+                continue
+            if frames.closed and consumer.lag() == 0:
+                break
+            time.sleep(SHM_POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if consumer.dropped or consumer.torn:
+            log_warning(f"Worker {member}: {consumer.dropped} frames dropped, {consumer.torn} torn")
+        consumer.close()
+        frames.release()
+        results.release()
+
+
+###############################################################################
+# Worker Pool
+###############################################################################
+class WorkerPool:
+    """
+    Moves decoding and detection off the reader's event loop into
+    `workers` processes.
+
+    The reader writes raw frames into one shared-memory ring with
+    `submit_frame`; workers split it between them by sequence number and
+    each writes detection records into its own result ring, which `collect`
+    drains back into the pipeline. Nothing is pickled on the hot path.
+
+    Frames written before a worker process is up wait for it in the ring
+    (its cursor is reserved at start); detections overwritten in a result
+    ring before `collect` drained them show up in `stats()`.
+    """
+    def __init__(
+        self,
+        workers: int,
+        program_ids: Iterable,
+        slots: int = SHM_RING_SLOTS,
+        slot_size: int = SHM_SLOT_SIZE,
+        result_slots: int = SHM_RESULT_SLOTS,
+    ):
+        if not 0 < workers <= SHM_MAX_CONSUMERS:
+            raise ValueError(f"workers must be between 1 and {SHM_MAX_CONSUMERS}")
+        self.workers = workers
+        self.program_ids: List[str] = [str(p) for p in program_ids]
+        self.slots = slots
+        self.slot_size = slot_size
+        self.result_slots = result_slots
+        self.frames: Optional[ShmRingBuffer] = None
+        self.results: List[ShmRingBuffer] = []
+        self._consumers: List[RingConsumer] = []
+        self._processes: List[multiprocessing.Process] = []
+
+    def start(self) -> None:
+        self.frames = ShmRingBuffer.create(self.slots, self.slot_size)
+        ctx = multiprocessing.get_context("spawn")
+        for member in range(self.workers):
+            self.frames.reserve(member)
+            results = ShmRingBuffer.create(self.result_slots, DETECTION_RECORD.size)
+            self.results.append(results)
+            self._consumers.append(results.consumer())
+            process = ctx.Process(
+                target=worker_main,
+                args=(self.frames.name, results.name, member, self.workers, self.program_ids),
+                name=f"solsniff-worker-{member}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        log_info(f"Started {self.workers} worker processes on ring {self.frames.name}.")
+
+    def program_index(self, program_id: str) -> int:
+        return self.program_ids.index(str(program_id))
+
+    def submit_frame(self, program_index: int, raw) -> bool:
+        """
+        Hand one raw frame to the workers. Never blocks.
+
+        :return: False if the frame does not fit in a slot; the caller
+                 should process it itself.
+        """
+        if isinstance(raw, str):
+            raw = raw.encode()
+        return self.frames.write(bytes((program_index,)) + raw)
+
+    def poll(self, dispatch) -> int:
+        """Pass every waiting worker detection to `dispatch`. Returns how many."""
+        count = 0
+        for consumer in self._consumers:
+            for detection in consumer.consume(lambda seq, payload: unpack_detection(payload)):
+                dispatch(detection)
+                count += 1
+        return count
+
+    async def collect(self, dispatch) -> None:
+        """Feed worker detections to `dispatch` until cancelled."""
+        while True:
+            if not self.poll(dispatch):
+                await asyncio.sleep(SHM_POLL_INTERVAL)
+
+    def stop(self, dispatch=None) -> None:
+        """
+        Let workers drain the frame ring, hand their last detections to
+        `dispatch` (if given) and release every ring.
+        """
+        if self.frames is None:
+            return
+        self.frames.close()
+        for process in self._processes:
+            process.join(WORKER_JOIN_TIMEOUT)
+            if process.is_alive():
+                log_warning(f"{process.name} did not exit, terminating it.")
+                process.terminate()
+                process.join()
+        if dispatch is not None:
+            while self.poll(dispatch):
+                pass
+        stats = self.stats()
+        log_info(f"Worker pool stopped: {stats}")
+        if stats["detections_dropped"]:
+            log_warning(f"{stats['detections_dropped']} worker detections were overwritten before they were collected.")
+        for consumer in self._consumers:
+            consumer.close()
+        for ring in [self.frames] + self.results:
+            ring.release()
+        self.frames, self.results, self._consumers, self._processes = None, [], [], []
+
+    def stats(self) -> dict:
+        frames = self.frames.stats()
+        return {
+            "frames": frames["published"],
+            "overwritten": frames["overwritten"],
+            "oversize": frames["oversize"],
+            "detections": sum(consumer.consumed for consumer in self._consumers),
+            "detections_dropped": sum(consumer.dropped + consumer.torn for consumer in self._consumers),
+        }
@@ -0,0 +1,154 @@
+from typing import Any, Dict, List, Optional
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+
+
+class Sink:
+    """Receives detection and enrichment events from the pipeline."""
+    async def start(self) -> None:
+        pass
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def emit_batch(self, events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            self.emit(event)
+
+    async def close(self) -> None:
+        pass
+
+
+class LogSink(Sink):
+    """Writes enrichment, mint update, pool, status, hot-mint, execution and metrics events to the log (detections are logged by the detector)."""
+    def emit(self, event: Dict[str, Any]) -> None:
+        kind = event.get("type")
+        if kind == "pool_created":
+            log_info(
+                f"  Mint address {event['mint']} got a Raydium pool {event['pool_id']} "
+                f"({event['seconds_since_mint']}s after creation)!"
+            )
+            return
+        if kind == "retraction":
+            log_warning(f"  Retracted mint {event['mint']} (slot {event['slot']}): transaction {event['reason']}")
+            return
+        if kind == "confirmation":
+            log_debug(f"  Mint {event['mint']} is {event['status']} (slot {event['slot']})")
+            return
+        if kind == "hot_mints":
+            log_info(f"[Hot Mints] {event['recorded']} transfers seen")
+            for rank, entry in enumerate(event["mints"], start=1):
+                log_info(
+                    f"  {rank}. {entry['mint']}: ~{entry['transfers']} transfers, "
+                    f"~{entry['volume']:.0f} volume, ~{entry['unique_wallets']} wallets"
+                )
+            return
+        if kind == "execution":
+            if "error" in event:
+                log_warning(f"  Execution for {event['mint']} failed: {event['error']}")
+            else:
+                log_info(
+                    f"  Sent {event['template']} for {event['mint']}: {event['signature']} "
+                    f"(built in {event['build_us']}us, accepted in {event['submit_ms']}ms by {event['endpoint']})"
+                )
+            return
+        if kind == "metrics":
+            log_info("[Metrics] " + ", ".join(f"{name}={value:g}" for name, value in sorted(event["metrics"].items())))
+            return
+        if kind == "mint_update":
+            fields = ", ".join(f"{key}={event[key]}" for key in event["changed"])
+            log_info(f"[Mint Update] {event['mint']} in slot {event['slot']}: {fields}")
+            return
+        if kind == "enrichment_update":
+            fields = ", ".join(f"{key}={value}" for key, value in event.items() if key not in ("type", "mint"))
+            log_info(f"[Token Extended Info] Update for {event['mint']}: {fields}")
+            return
+        if kind != "enrichment":
+            return
+        log_info(f"[Token Extended Info] MintAddress: {event['mint']}")
+        log_info(f"  Name: {event.get('name')} ({event.get('symbol')})")
+        log_info(f"  Decimals: {event.get('decimals')}")
+        log_info(f"  Supply: {event.get('supply')}")
+        log_info(f"  Mintable?: {event.get('is_mintable')}")
+        if event.get("dex_listings"):
+            log_info(f"  Available on: {', '.join(event['dex_listings'])}")
+        elif "dex_listings" in event:
+            log_info("  Not found on known DEXs")
+        if event.get("pending"):
+            log_info(f"  Still waiting for: {', '.join(event['pending'])}")
+
+
+class StoreSink(Sink):
+    """Persists detections and enrichment results in a DetectionStore."""
+    def __init__(self, db_path: Optional[str] = None):
+        from core.storage.storage import DetectionStore
+
+        self.store = DetectionStore(db_path) if db_path else DetectionStore()
+
+    async def start(self) -> None:
+        self.store.start()
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        kind = event.get("type")
+        if kind == "detection":
+            self.store.add_detection(
+                slot=event["slot"],
+                mint=event.get("mint"),
+                signature=event.get("signature"),
+                authority=event.get("authority"),
+                decimals=event.get("decimals"),
+                program_id=event.get("program_id"),
+                detected_at=event.get("detected_at"),
+                status=event.get("status"),
+            )
+        elif kind in ("enrichment", "enrichment_update", "mint_update"):
+            self.store.add_enrichment(event["mint"], event)
+        elif kind == "confirmation":
+            self.store.set_status(event["signature"], event["status"])
+        elif kind == "retraction":
+            self.store.set_status(event["signature"], event["reason"])
+
+    async def close(self) -> None:
+        self.store.close()
+
+
+class FanoutSink(Sink):
+    """Streams every event to local subscribers through a FanoutServer."""
+    def __init__(self, **server_options):
+        from core.server.server import FanoutServer
+
+        self.server = FanoutServer(**server_options)
+
+    async def start(self) -> None:
+        await self.server.start()
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        self.server.publish(event)
+
+    async def close(self) -> None:
+        await self.server.stop()
+
+
+class ClusterSink(Sink):
+    """Sends every event to the cluster coordinator through a ClusterNode."""
+    def __init__(self, node):
+        self.node = node
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        self.node.forward(event)
+
+
+class ExecutionSink(Sink):
+    """Hands every detected mint to an Executor (core/execution), which reports back through the pipeline."""
+    def __init__(self, executor):
+        self.executor = executor
+
+    async def start(self) -> None:
+        await self.executor.start()
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        if event.get("type") == "detection" and event.get("mint"):
+            self.executor.execute(event["mint"], event.get("detected_at"))
+
+    async def close(self) -> None:
+        await self.executor.stop()
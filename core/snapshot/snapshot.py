@@ -0,0 +1,216 @@
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+
+###############################################################################
+# Layout
+###############################################################################
+# MAGIC | u32 table length | table (JSON) | section payloads
+#
+# The table maps each section name to [format, offset, length]. "json"
+# sections hold one compact JSON document; "records" sections hold
+# fixed-layout structs (RECORDS) that are unpacked straight from the
+# mapping, so opening a snapshot only parses the table and a section
+# nobody asks for is never read.
+MAGIC = b"SOLSNAP1"
+HEADER = struct.Struct("<8sI")
+
+# Fixed-layout sections (strings are NUL padded)
+RECORDS = {
+    # mint, signature, slot, detected_at (wall clock), seconds since it was indexed
+    "recent_mints": struct.Struct("<44s88sQdd"),
+    # signature, mint
+    "dedupe": struct.Struct("<88s44s"),
+}
+
+
+def _pack_field(value):
+    if isinstance(value, str):
+        return value.encode()
+    if value is None:
+        return b""
+    return value
+
+
+def _unpack_field(value):
+    if isinstance(value, bytes):
+        return value.rstrip(b"\0").decode() or None
+    return value
+
+
+class SnapshotWriter:
+    """Collects sections in memory and writes them out in one atomic replace."""
+    def __init__(self):
+        self._sections: List[Tuple[str, str, bytes]] = []
+
+    def add_json(self, name: str, value: Any) -> None:
+        self._sections.append((name, "json", json.dumps(value, separators=(",", ":")).encode()))
+
+    def add_records(self, name: str, rows) -> None:
+        record = RECORDS[name]
+        payload = b"".join(record.pack(*(_pack_field(value) for value in row)) for row in rows)
+        self._sections.append((name, "records", payload))
+
+    def write(self, path: str) -> int:
+        """Write every section to `path`. Returns the file size."""
+        written_at = time.time()
+        # Payload offsets depend on the table's own length: grow the base until it fits
+        base = HEADER.size
+        while True:
+            sections, offset = {}, base
+            for name, kind, payload in self._sections:
+                sections[name] = [kind, offset, len(payload)]
+                offset += len(payload)
+            encoded = json.dumps({"written_at": written_at, "sections": sections}, separators=(",", ":")).encode()
+            if HEADER.size + len(encoded) <= base:
+                encoded = encoded.ljust(base - HEADER.size)
+                break
+            base = HEADER.size + len(encoded)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(encoded)))
+            f.write(encoded)
+            for _name, _kind, payload in self._sections:
+                f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return offset
+
+
+class Snapshot:
+    """
+    A snapshot file mapped read-only. Sections are decoded on first access.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty")
+        magic, table_length = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a SolSniff snapshot")
+        table = json.loads(self._map[HEADER.size: HEADER.size + table_length])
+        self.written_at: float = table["written_at"]
+        self.sections: Dict[str, List] = table["sections"]
+        self._json: Dict[str, Any] = {}
+
+    @classmethod
+    def open(cls, path: str) -> Optional["Snapshot"]:
+        """The snapshot at `path`, or None if there is none (or it is unreadable)."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            log_warning(f"Ignoring unreadable state snapshot {path}: {e}")
+            return None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was written (the downtime, on restart)."""
+        return max(time.time() - self.written_at, 0.0)
+
+    def json(self, name: str, default: Any = None) -> Any:
+        if name not in self.sections:
+            return default
+        if name not in self._json:
+            _kind, offset, length = self.sections[name]
+            self._json[name] = json.loads(self._map[offset: offset + length])
+        return self._json[name]
+
+    def records(self, name: str) -> Iterator[tuple]:
+        """Unpack a fixed-layout section in place, one tuple per record."""
+        if name not in self.sections:
+            return
+        _kind, offset, length = self.sections[name]
+        view = memoryview(self._map)[offset: offset + length]
+        try:
+            for row in RECORDS[name].iter_unpack(view):
+                yield tuple(_unpack_field(value) for value in row)
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+###############################################################################
+# Pipeline State
+###############################################################################
+def save_state(pipeline, path: str) -> int:
+    """
+    Snapshot everything a restarted pipeline needs to start warm: slot
+    watermarks, the detection dedupe window, the recent-mint index, queued
+    and in-flight enrichment, pending confirmations and transfer activity.
+
+    :return: The snapshot size in bytes.
+    """
+    writer = SnapshotWriter()
+    writer.add_json("watermarks", pipeline.watermarks)
+    writer.add_records("dedupe", pipeline.recent_detections)
+    if pipeline.correlator is not None:
+        writer.add_records("recent_mints", pipeline.correlator.index.snapshot())
+    if pipeline.enricher is not None and pipeline.enricher.queue is not None:
+        writer.add_json("enrichment", pipeline.enricher.snapshot())
+    if pipeline.confirmer is not None:
+        writer.add_json("confirmation", pipeline.confirmer.snapshot())
+    if pipeline.activity is not None:
+        writer.add_json("activity", pipeline.activity.snapshot())
+    size = writer.write(path)
+    log_info(f"Saved state snapshot to {path} ({size / 1024:.1f} KiB).")
+    return size
+
+
+def restore_state(pipeline, path: str) -> bool:
+    """
+    Warm up a started pipeline from the snapshot at `path`. Only the
+    sections of stages this pipeline actually runs are read. Time-based
+    state (TTLs, deadlines, timeouts) counts the downtime as elapsed.
+
+    :return: False if there was no usable snapshot.
+    """
+    started = time.perf_counter()
+    snapshot = Snapshot.open(path)
+    if snapshot is None:
+        return False
+    try:
+        downtime = snapshot.age
+        for program_id, slot in snapshot.json("watermarks", {}).items():
+            pipeline.watermarks[program_id] = max(slot, pipeline.watermarks.get(program_id, 0))
+        for signature, mint in snapshot.records("dedupe"):
+            pipeline.remember(signature, mint)
+        if pipeline.correlator is not None:
+            pipeline.correlator.index.restore(snapshot.records("recent_mints"), downtime)
+        if pipeline.enricher is not None and "enrichment" in snapshot:
+            pipeline.enricher.restore(snapshot.json("enrichment"), downtime)
+        if pipeline.confirmer is not None and "confirmation" in snapshot:
+            pipeline.confirmer.restore(snapshot.json("confirmation"), downtime)
+        if pipeline.activity is not None and "activity" in snapshot:
+            pipeline.activity.merge(snapshot.json("activity"))
+    except (KeyError, ValueError, TypeError, struct.error) as e:
+        log_warning(f"State snapshot {path} only partly restored: {e}")
+    finally:
+        snapshot.close()
+    log_info(
+        f"Restored state from {path} in {(time.perf_counter() - started) * 1000:.0f} ms "
+        f"(written {downtime:.0f}s ago)."
+    )
+    return True
@@ -0,0 +1,395 @@
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from constants.constants import (
+    STORAGE_DB_PATH,
+    STORAGE_BATCH_SIZE,
+    STORAGE_FLUSH_INTERVAL,
+    STORAGE_MAX_PENDING,
+)
+
+###############################################################################
+# Schema
+###############################################################################
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    id          INTEGER PRIMARY KEY,
+    slot        INTEGER NOT NULL,
+    signature   TEXT,
+    mint        TEXT,
+    authority   TEXT,
+    decimals    INTEGER,
+    program_id  TEXT,
+    detected_at REAL NOT NULL,
+    status      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_detections_slot ON detections (slot);
+CREATE INDEX IF NOT EXISTS idx_detections_mint ON detections (mint);
+CREATE INDEX IF NOT EXISTS idx_detections_authority ON detections (authority);
+CREATE INDEX IF NOT EXISTS idx_detections_detected_at ON detections (detected_at);
+CREATE INDEX IF NOT EXISTS idx_detections_signature ON detections (signature);
+
+CREATE TABLE IF NOT EXISTS enrichments (
+    id          INTEGER PRIMARY KEY,
+    mint        TEXT NOT NULL,
+    name        TEXT,
+    decimals    INTEGER,
+    supply      REAL,
+    is_mintable INTEGER,
+    data        TEXT,
+    enriched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_enrichments_mint ON enrichments (mint);
+CREATE INDEX IF NOT EXISTS idx_enrichments_enriched_at ON enrichments (enriched_at);
+"""
+
+INSERT_DETECTION = (
+    "INSERT INTO detections (slot, signature, mint, authority, decimals, program_id, detected_at, status) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+UPDATE_STATUS = "UPDATE detections SET status = ? WHERE signature = ?"
+
+# Columns added after the first release: name -> type
+MIGRATIONS = {"detections": {"status": "TEXT"}}
+INSERT_ENRICHMENT = (
+    "INSERT INTO enrichments (mint, name, decimals, supply, is_mintable, data, enriched_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Sentinel used to wake the writer thread on shutdown
+_STOP = object()
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a connection with the pragmas every store connection shares."""
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Add columns that databases created by older versions lack."""
+    for table, columns in MIGRATIONS.items():
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not existing:
+            continue  # New database: SCHEMA creates the table complete
+        for column, column_type in columns.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    conn.commit()
+
+
+class DetectionStore:
+    """
+    Persists detections and enrichment results to SQLite.
+
+    Writes are queued without blocking and committed by a background thread
+    in batched transactions, so the sniffing hot path never waits on disk.
+    When the queue is full new writes are dropped and counted in `dropped`.
+    """
+    def __init__(
+        self,
+        db_path: str = STORAGE_DB_PATH,
+        batch_size: int = STORAGE_BATCH_SIZE,
+        flush_interval: float = STORAGE_FLUSH_INTERVAL,
+        max_pending: int = STORAGE_MAX_PENDING,
+    ):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self.written = 0
+        self.dropped = 0
+        self._writer: Optional[threading.Thread] = None
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+
+        conn = _connect(self.db_path)
+        try:
+            _migrate(conn)
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    ###########################################################################
+    # Lifecycle
+    ###########################################################################
+    def start(self) -> None:
+        """Start the background writer thread."""
+        if self._writer and self._writer.is_alive():
+            return
+        self._writer = threading.Thread(target=self._writer_loop, name="DetectionStore", daemon=True)
+        self._writer.start()
+        log_info(f"Detection store writing to {self.db_path}")
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued writes and stop the writer thread."""
+        if self._writer and self._writer.is_alive():
+            self.pending.put(_STOP)
+            self._writer.join(timeout)
+            if self._writer.is_alive():
+                log_warning(f"Detection store did not flush within {timeout}s.")
+        self._writer = None
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+
+    ###########################################################################
+    # Writes (hot path)
+    ###########################################################################
+    def add_detection(
+        self,
+        slot: int,
+        mint: Optional[str],
+        signature: Optional[str] = None,
+        authority: Optional[str] = None,
+        decimals: Optional[int] = None,
+        program_id: Optional[str] = None,
+        detected_at: Optional[float] = None,
+        status: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue a detection for writing.
+
+        :return: False if the row was dropped because the queue is full.
+        """
+        row = (
+            slot,
+            signature,
+            mint,
+            authority,
+            decimals,
+            str(program_id) if program_id is not None else None,
+            detected_at if detected_at is not None else time.time(),
+            status,
+        )
+        return self._enqueue(INSERT_DETECTION, row)
+
+    def set_status(self, signature: str, status: str) -> bool:
+        """Queue a commitment status change (or retraction) for a signature's detections."""
+        return self._enqueue(UPDATE_STATUS, (status, signature))
+
+    def add_enrichment(self, mint: str, fields: Dict[str, Any], enriched_at: Optional[float] = None) -> bool:
+        """
+        Queue an enrichment result for writing.
+
+        The well-known fields get their own columns; the full dict is kept as JSON.
+
+        :return: False if the row was dropped because the queue is full.
+        """
+        is_mintable = fields.get("is_mintable")
+        row = (
+            mint,
+            fields.get("name"),
+            fields.get("decimals"),
+            fields.get("supply"),
+            int(is_mintable) if is_mintable is not None else None,
+            json.dumps(fields, default=str),
+            enriched_at if enriched_at is not None else time.time(),
+        )
+        return self._enqueue(INSERT_ENRICHMENT, row)
+
+    def _enqueue(self, statement: str, row: tuple) -> bool:
+        try:
+            self.pending.put_nowait((statement, row))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    ###########################################################################
+    # Background writer
+    ###########################################################################
+    def _writer_loop(self) -> None:
+        conn = _connect(self.db_path)
+        try:
+            running = True
+            while running:
+                batch, running = self._collect_batch()
+                if batch:
+                    self._write_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _collect_batch(self):
+        """
+        Block for the first item, then gather more until the batch is full or
+        the flush interval has passed.
+
+        :return: (batch, keep_running)
+        """
+        batch: List[tuple] = []
+        item = self.pending.get()
+        if item is _STOP:
+            return batch, False
+        batch.append(item)
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.pending.get(timeout=remaining) if remaining > 0 else self.pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Drain whatever is left so close() never loses queued rows
+                while True:
+                    try:
+                        item = self.pending.get_nowait()
+                    except queue.Empty:
+                        return batch, False
+                    if item is not _STOP:
+                        batch.append(item)
+            batch.append(item)
+        return batch, True
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[tuple]) -> None:
+        # Group consecutive rows of the same statement, keeping the queue order
+        # (a status update must run after the insert it refers to)
+        grouped: List[Tuple[str, List[tuple]]] = []
+        for statement, row in batch:
+            if grouped and grouped[-1][0] == statement:
+                grouped[-1][1].append(row)
+            else:
+                grouped.append((statement, [row]))
+        try:
+            with conn:
+                for statement, rows in grouped:
+                    conn.executemany(statement, rows)
+            self.written += len(batch)
+            log_debug(f"Detection store committed {len(batch)} rows.")
+        except sqlite3.Error as e:
+            log_error(f"Detection store failed to write {len(batch)} rows: {e}")
+
+    ###########################################################################
+    # Queries
+    ###########################################################################
+    def _reader(self) -> sqlite3.Connection:
+        if self._read_conn is None:
+            self._read_conn = _connect(self.db_path)
+        return self._read_conn
+
+    def query_detections(
+        self,
+        slot_from: Optional[int] = None,
+        slot_to: Optional[int] = None,
+        mint: Optional[str] = None,
+        authority: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return detections matching every given filter, oldest slot first.
+
+        :param slot_from: Inclusive lower slot bound.
+        :param slot_to: Inclusive upper slot bound.
+        :param since: Inclusive lower bound on detection time (unix seconds).
+        :param until: Exclusive upper bound on detection time (unix seconds).
+        """
+        clauses = []
+        params: List[Any] = []
+        if slot_from is not None:
+            clauses.append("slot >= ?")
+            params.append(slot_from)
+        if slot_to is not None:
+            clauses.append("slot <= ?")
+            params.append(slot_to)
+        if mint is not None:
+            clauses.append("mint = ?")
+            params.append(mint)
+        if authority is not None:
+            clauses.append("authority = ?")
+            params.append(authority)
+        if since is not None:
+            clauses.append("detected_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("detected_at < ?")
+            params.append(until)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+
+        sql = "SELECT * FROM detections"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY slot, id LIMIT ?"
+        params.append(limit)
+
+        with self._read_lock:
+            rows = self._reader().execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_enrichments(self, mint: str) -> List[Dict[str, Any]]:
+        """Return every enrichment stored for a mint, newest first."""
+        sql = "SELECT * FROM enrichments WHERE mint = ? ORDER BY enriched_at DESC"
+        with self._read_lock:
+            rows = self._reader().execute(sql, (mint,)).fetchall()
+        results = []
+        for row in rows:
+            result = dict(row)
+            result["data"] = json.loads(result["data"]) if result["data"] else {}
+            results.append(result)
+        return results
+
+
+###############################################################################
+# Query CLI
+###############################################################################
+def build_query_parser(parser: Optional[argparse.ArgumentParser] = None) -> argparse.ArgumentParser:
+    """Add the detection query options to `parser` (or a new parser)."""
+    if parser is None:
+        parser = argparse.ArgumentParser(description="Query stored SolSniff detections.")
+    parser.add_argument("--db", default=STORAGE_DB_PATH, help="SQLite database path")
+    parser.add_argument("--slot-from", type=int, help="Inclusive lower slot bound")
+    parser.add_argument("--slot-to", type=int, help="Inclusive upper slot bound")
+    parser.add_argument("--mint", help="Only this mint address")
+    parser.add_argument("--authority", help="Only this mint authority")
+    parser.add_argument("--since", type=float, help="Detected at or after this unix time")
+    parser.add_argument("--until", type=float, help="Detected before this unix time")
+    parser.add_argument("--status", help="Only this commitment status (processed, confirmed, dropped...)")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum rows to print")
+    parser.add_argument("--enrichment", action="store_true", help="Include enrichment results per mint")
+    return parser
+
+
+def run_query(args: argparse.Namespace) -> int:
+    """Print matching detections as JSON lines."""
+    store = DetectionStore(db_path=args.db)
+    try:
+        rows = store.query_detections(
+            slot_from=args.slot_from,
+            slot_to=args.slot_to,
+            mint=args.mint,
+            authority=args.authority,
+            since=args.since,
+            until=args.until,
+            status=args.status,
+            limit=args.limit,
+        )
+        for row in rows:
+            if args.enrichment and row["mint"]:
+                row["enrichment"] = store.get_enrichments(row["mint"])
+            print(json.dumps(row, default=str))
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_query(build_query_parser().parse_args()))
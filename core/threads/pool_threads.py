@@ -1,42 +1,107 @@
 import asyncio
-from typing import Dict
-from solana.rpc.async_api import AsyncClient
+from typing import Dict, Optional
 
-from solders.rpc.responses import LogsNotification
-from solders.rpc.config import (
-    RpcTransactionLogsFilterMentions
-)
+from core.engines.engine import get_engine
+from core.engines.inbox import Inbox
 from core.logs.logs import log_info, log_debug, log_warning, log_error
-from core.parser.parser import InstructionParser
+from core.metrics.metrics import metrics
+from core.pipeline.pipeline import Pipeline
+from constants.constants import (
+    DEFAULT_ENGINE,
+    LOGS_COMMITMENT,
+    MAX_SNIFFERS,
+    BATCH_MAX_FRAMES,
+    INBOX_MAX_FRAMES,
+    INBOX_OVERFLOW_POLICY,
+)
+
 
 class SolanaSniffer:
-    def __init__(self, rpc_ws_url: str, reconnect_delay: int = 5):
+    def __init__(
+        self,
+        rpc_ws_url: str,
+        reconnect_delay: int = 5,
+        engine: str = DEFAULT_ENGINE,
+        pipeline: Optional[Pipeline] = None,
+        commitment: Optional[str] = LOGS_COMMITMENT,
+        workers=None,
+        batch: int = BATCH_MAX_FRAMES,
+        inbox_size: int = INBOX_MAX_FRAMES,
+        overflow_policy: str = INBOX_OVERFLOW_POLICY,
+        engine_options: Optional[Dict] = None,
+    ):
         self.rpc_ws_url = rpc_ws_url
         self.reconnect_delay = reconnect_delay
+        self.engine_cls = get_engine(engine)
+        # Engine-specific constructor arguments (e.g. the geyser engine's endpoint)
+        self.engine_options = engine_options or {}
+        self.commitment = commitment
         self.tasks: Dict[str, asyncio.Task] = {}
-        self.parser = InstructionParser()
+        self.pipeline = pipeline or Pipeline()
+        # Optional core.shm.workers.WorkerPool: frames are decoded there instead
+        self.workers = workers
+        # Frames drained and decoded together; 1 = one notification at a time
+        self.batch = batch
+        # Frames a dedicated reader task may queue ahead of processing; 0 = read inline
+        self.inbox_size = inbox_size
+        self.overflow_policy = overflow_policy
 
     async def _sniff_logs(self, program_id: str):
         """Continuously sniff logs for the given program ID."""
-        client = None
-        while True:
-            try:
-                async with AsyncClient(self.rpc_ws_url) as client:
-                    log_info(f"Connected to Solana WebSocket endpoint for program {program_id}.")
-                    res = await client.is_connected()
-                    log_info(f"Connected: {res}")
-                    client.prog
+        engine = self.engine_cls(
+            [program_id],
+            rpc_ws_url=self.rpc_ws_url,
+            reconnect_delay=self.reconnect_delay,
+            commitment=self.commitment,
+            **self.engine_options,
+        )
+        log_info(f"Sniffing program {program_id} with the {engine.name} engine.")
+        try:
+            if self.workers is None and self.inbox_size:
+                await self._sniff_through_inbox(engine, program_id)
+            elif self.workers is None and self.batch > 1:
+                async for events in engine.batches(self.batch, self.pipeline.prefilter):
+                    self._process_batch(events)
+            elif self.workers is None:
+                async for event in engine.notifications():
+                    self.pipeline.process(event)
+            else:
+                program_index = self.workers.program_index(program_id)
+                async for raw in engine.frames():
+                    if not self.workers.submit_frame(program_index, raw):
+                        # Larger than a ring slot: decode it here instead
+                        event = engine.decode(raw)
+                        if event is not None:
+                            self.pipeline.process(event)
+        except asyncio.CancelledError:
+            log_info(f"Sniffer for program {program_id} was cancelled.")
+            raise  # Re-raise the exception to propagate cancellation
+
+    async def _sniff_through_inbox(self, engine, program_id: str):
+        """Receive in a reader task of its own; process here whatever it has queued."""
+        inbox = Inbox(program_id, self.inbox_size, self.overflow_policy)
+        overload = self.pipeline.overload
+        if overload is not None:
+            overload.watch(f"inbox.{program_id}", inbox.__len__)
+        reader = asyncio.create_task(engine.read_into(inbox))
+        try:
+            async for events in engine.inbox_batches(inbox, self.batch, self.pipeline.prefilter):
+                self._process_batch(events)
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+            if overload is not None:
+                overload.unwatch(f"inbox.{program_id}")
+            if inbox.dropped:
+                log_warning(f"Inbox for program {program_id} dropped {inbox.dropped} frames ({inbox.policy}).")
 
-            except asyncio.CancelledError:
-                log_info(f"Sniffer for program {program_id} was cancelled.")
-                raise  # Re-raise the exception to propagate cancellation
-            except Exception as e:
-                log_error(f"Unexpected error for program {program_id}: {e}. Reconnecting in {self.reconnect_delay}s...")
-                await asyncio.sleep(self.reconnect_delay)
-            finally:
-                if client and not client.closed:
-                    await client.close()
-                    log_info(f"WebSocket connection for program {program_id} closed.")
+    def _process_batch(self, events) -> None:
+        """Run a batch through the pipeline; a failure costs that batch, not the sniffer."""
+        try:
+            self.pipeline.process_batch(events)
+        except Exception as e:
+            metrics.incr("pipeline.errors")
+            log_error(f"Pipeline failed on a batch of {len(events)} events: {e}")
 
     def add_sniffer(self, program_id: str):
         """Add a new sniffer task for the given program ID."""
@@ -44,9 +109,21 @@ class SolanaSniffer:
             log_info(f"Sniffer for program {program_id} is already running.")
             return
 
+        if len(self.tasks) >= MAX_SNIFFERS:
+            log_warning(f"Already running {MAX_SNIFFERS} sniffers; not adding {program_id}.")
+            return
+
         log_info(f"Starting sniffer for program {program_id}.")
         task = asyncio.create_task(self._sniff_logs(program_id))
         self.tasks[program_id] = task
+        task.add_done_callback(lambda done: self._forget(program_id, done))
+
+    def _forget(self, program_id: str, task: asyncio.Task):
+        # Finished tasks leave the map so it only ever holds live sniffers
+        if self.tasks.get(program_id) is task:
+            del self.tasks[program_id]
+        if self.pipeline.reorder is not None:
+            self.pipeline.reorder.forget(program_id)
 
     def remove_sniffer(self, program_id: str):
         """Remove the sniffer task for the given program ID."""
@@ -59,9 +136,12 @@ class SolanaSniffer:
         task.cancel()
 
     async def stop_all(self):
-        """Stop all running sniffer tasks."""
+        """Stop all running sniffer tasks and wait until they have finished."""
         log_info("Stopping all sniffer tasks.")
+        tasks = list(self.tasks.values())
         for program_id, task in self.tasks.items():
             log_info(f"Stopping sniffer for program {program_id}.")
             task.cancel()
-        self.tasks.clear()
\ No newline at end of file
+        self.tasks.clear()
+        # Nothing may still be feeding the pipeline once this returns
+        await asyncio.gather(*tasks, return_exceptions=True)
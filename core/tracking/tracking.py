@@ -0,0 +1,334 @@
+import asyncio
+import base64
+import itertools
+import json
+import struct
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set
+
+from core.logs.logs import log_info, log_debug, log_warning, log_error
+from core.metrics.metrics import metrics
+from constants.constants import (
+    RPC_WS_URL,
+    RECONNECT_DELAY,
+    HEARTBEAT_INTERVAL,
+    TRACKING_MAX_MINTS,
+    TRACKING_MAX_AGE,
+    TRACKING_PER_CONNECTION,
+    TRACKING_COMMITMENT,
+    TRACKING_SWEEP_INTERVAL,
+)
+
+
+###############################################################################
+# Mint Account Layout
+###############################################################################
+# SPL Token mint (82 bytes, Token-2022 extensions follow it):
+# mint authority COption<Pubkey> (u32 tag + 32) | supply u64 | decimals u8 |
+# is_initialized u8 | freeze authority COption<Pubkey> (u32 tag + 32)
+MINT_SIZE = 82
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+# Field -> byte range; only ranges that changed since the last update are decoded
+MINT_FIELDS = {
+    "mint_authority": (0, 36),
+    "supply": (36, 44),
+    "decimals": (44, 45),
+    "freeze_authority": (46, 82),
+}
+
+
+def _optional_pubkey(view: memoryview, offset: int) -> Optional[str]:
+    (tag,) = U32.unpack_from(view, offset)
+    if not tag:
+        return None
+    from solders.pubkey import Pubkey
+
+    return str(Pubkey.from_bytes(bytes(view[offset + 4: offset + 36])))
+
+
+def decode_mint_field(view: memoryview, field: str):
+    start, _end = MINT_FIELDS[field]
+    if field == "supply":
+        return U64.unpack_from(view, start)[0]
+    if field == "decimals":
+        return view[start]
+    return _optional_pubkey(view, start)
+
+
+class MintState:
+    """
+    The last known state of one tracked mint, kept as the raw account bytes
+    plus their decoded fields. `update` compares the new bytes range by range
+    and decodes only the fields that moved.
+    """
+    __slots__ = ("mint", "raw", "fields", "slot", "tracked_at", "updates")
+
+    def __init__(self, mint: str):
+        self.mint = mint
+        self.raw: Optional[bytes] = None
+        self.fields: Dict[str, Any] = {}
+        self.slot = 0
+        self.tracked_at = time.monotonic()
+        self.updates = 0
+
+    def update(self, data: bytes, slot: int) -> Dict[str, Any]:
+        """Apply a new copy of the account. Returns the fields that changed (all of them the first time)."""
+        if len(data) < MINT_SIZE:
+            raise ValueError(f"{len(data)} bytes is too short for a mint account")
+        if slot < self.slot:
+            return {}  # An older notification overtaken by a newer one
+        self.slot = slot
+        view = memoryview(data)
+        old = self.raw
+        changed = {}
+        for field, (start, end) in MINT_FIELDS.items():
+            if old is None or view[start:end] != old[start:end]:
+                changed[field] = self.fields[field] = decode_mint_field(view, field)
+        self.raw = bytes(view[:MINT_SIZE])
+        if changed:
+            self.updates += 1
+        return changed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.fields, "is_mintable": self.fields.get("mint_authority") is not None, "slot": self.slot}
+
+
+###############################################################################
+# Shared Connections
+###############################################################################
+class _Connection:
+    """
+    One WebSocket carrying the accountSubscribe subscriptions of up to
+    `per_connection` mints.
+
+    Subscribes whatever is in `mints` when it (re)connects, and follows
+    later `add` / `remove` calls on the live socket.
+    """
+    def __init__(self, tracker: "MintTracker", index: int):
+        self.tracker = tracker
+        self.index = index
+        self.mints: Set[str] = set()
+        self.websocket = None
+        self.subscriptions: Dict[int, str] = {}  # Subscription id -> mint
+        self.by_mint: Dict[str, int] = {}
+        self.requests: Dict[int, tuple] = {}     # Request id -> (method, mint)
+        self.request_ids = itertools.count(1)
+        self.task: Optional[asyncio.Task] = None
+        self._writes: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def add(self, mint: str) -> None:
+        self.mints.add(mint)
+        self._send("accountSubscribe", mint, [mint, {"encoding": "base64", "commitment": self.tracker.commitment}])
+
+    def remove(self, mint: str) -> None:
+        self.mints.discard(mint)
+        subscription = self.by_mint.pop(mint, None)
+        if subscription is not None:
+            self.subscriptions.pop(subscription, None)
+            self._send("accountUnsubscribe", mint, [subscription])
+
+    def _send(self, method: str, mint: str, params: list) -> None:
+        if self.websocket is None:
+            return  # Sent on (re)connection
+        request_id = next(self.request_ids)
+        self.requests[request_id] = (method, mint)
+        message = json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        write = asyncio.create_task(self._write(message))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    async def _write(self, message: str) -> None:
+        try:
+            await self.websocket.send(message)
+        except Exception as e:
+            log_debug(f"(Mint tracking {self.index}) Send failed: {e}")
+
+    async def _run(self) -> None:
+        import websockets
+        from core.engines.engine import keepalive
+
+        while True:
+            try:
+                async with websockets.connect(
+                    self.tracker.rpc_ws_url,
+                    ping_interval=None,
+                    close_timeout=10,
+                ) as websocket:
+                    heartbeat = asyncio.create_task(keepalive(websocket, self.tracker.heartbeat_interval))
+                    try:
+                        self.websocket = websocket
+                        for mint in list(self.mints):
+                            self.add(mint)
+                        log_debug(f"(Mint tracking {self.index}) Connected, subscribing to {len(self.mints)} mints.")
+                        async for message in websocket:
+                            self._receive(json.loads(message))
+                    finally:
+                        self._reset()
+                        heartbeat.cancel()
+                        await asyncio.gather(heartbeat, return_exceptions=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_warning(f"(Mint tracking {self.index}) {e}. Reconnecting in {RECONNECT_DELAY}s...")
+            metrics.incr("tracking.reconnects")
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _reset(self) -> None:
+        self.websocket = None
+        self.subscriptions.clear()
+        self.by_mint.clear()
+        self.requests.clear()
+
+    def _receive(self, message: Dict[str, Any]) -> None:
+        if message.get("method") == "accountNotification":
+            params = message["params"]
+            mint = self.subscriptions.get(params["subscription"])
+            if mint is not None:
+                result = params["result"]
+                self.tracker.on_account(mint, base64.b64decode(result["value"]["data"][0]), result["context"]["slot"])
+            return
+        request = self.requests.pop(message.get("id"), None)
+        if request is None:
+            return
+        method, mint = request
+        if "error" in message:
+            log_error(f"(Mint tracking {self.index}) {method} for {mint} failed: {message['error']}")
+            return
+        if method == "accountSubscribe":
+            if mint not in self.mints:
+                # Evicted before the confirmation came back
+                self._send("accountUnsubscribe", mint, [message["result"]])
+                return
+            self.subscriptions[message["result"]] = mint
+            self.by_mint[mint] = message["result"]
+
+
+###############################################################################
+# Tracker
+###############################################################################
+class MintTracker:
+    """
+    Pushes changes to the supply, mint authority and freeze authority of a
+    bounded set of mints, through accountSubscribe instead of polling.
+
+    `track` adds a mint (or refreshes one already tracked). Subscriptions
+    are spread over shared connections of `per_connection` each, and every
+    notification's raw account data is folded into the mint's MintState;
+    the fields that changed are emitted as a "mint_update" event. The
+    least recently tracked mint is evicted when more than `max_tracked`
+    are, and any mint is dropped `max_age` seconds after it was last
+    tracked.
+    """
+    def __init__(
+        self,
+        emit: Callable[[Dict[str, Any]], None],
+        rpc_ws_url: str = RPC_WS_URL,
+        max_tracked: int = TRACKING_MAX_MINTS,
+        max_age: float = TRACKING_MAX_AGE,
+        per_connection: int = TRACKING_PER_CONNECTION,
+        commitment: str = TRACKING_COMMITMENT,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+    ):
+        self.emit = emit
+        self.rpc_ws_url = rpc_ws_url
+        self.max_tracked = max_tracked
+        self.max_age = max_age
+        self.per_connection = per_connection
+        self.commitment = commitment
+        self.heartbeat_interval = heartbeat_interval
+        self.states: "OrderedDict[str, MintState]" = OrderedDict()  # Least recently tracked first
+        self.connections: list = []
+        self.placement: Dict[str, _Connection] = {}
+        self.evicted = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._sweeper = asyncio.create_task(self._sweep())
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        for connection in self.connections:
+            await connection.stop()
+        self.connections = []
+
+    def track(self, mint: str) -> None:
+        state = self.states.get(mint)
+        if state is not None:
+            state.tracked_at = time.monotonic()
+            self.states.move_to_end(mint)
+            return
+        self.states[mint] = MintState(mint)
+        connection = self._connection_with_room()
+        self.placement[mint] = connection
+        connection.add(mint)
+        while len(self.states) > self.max_tracked:
+            self.untrack(next(iter(self.states)))
+            self.evicted += 1
+            metrics.incr("tracking.evicted.lru")
+        metrics.set_gauge("tracking.mints", len(self.states))
+
+    def untrack(self, mint: str) -> None:
+        if self.states.pop(mint, None) is None:
+            return
+        connection = self.placement.pop(mint)
+        connection.remove(mint)
+        metrics.set_gauge("tracking.mints", len(self.states))
+
+    def on_account(self, mint: str, data: bytes, slot: int) -> None:
+        state = self.states.get(mint)
+        if state is None:
+            return
+        try:
+            changed = state.update(data, slot)
+        except ValueError as e:
+            log_debug(f"Ignoring account data for {mint}: {e}")
+            return
+        metrics.incr("tracking.notifications")
+        if changed:
+            metrics.incr("tracking.updates")
+            self.emit({
+                "type": "mint_update",
+                "mint": mint,
+                "slot": slot,
+                "changed": sorted(changed),
+                **state.to_dict(),
+            })
+
+    def _connection_with_room(self) -> _Connection:
+        for connection in self.connections:
+            if len(connection.mints) < self.per_connection:
+                break
+        else:
+            connection = _Connection(self, len(self.connections))
+            self.connections.append(connection)
+            connection.start()
+            metrics.set_gauge("tracking.connections", len(self.connections))
+        return connection
+
+    async def _sweep(self) -> None:
+        """Drop mints nobody has tracked for `max_age` seconds."""
+        while True:
+            await asyncio.sleep(TRACKING_SWEEP_INTERVAL)
+            cutoff = time.monotonic() - self.max_age
+            # Oldest first: stop at the first one still young enough
+            while self.states:
+                mint, state = next(iter(self.states.items()))
+                if state.tracked_at > cutoff:
+                    break
+                self.untrack(mint)
+                self.evicted += 1
+                metrics.incr("tracking.evicted.age")
@@ -0,0 +1,26 @@
+import asyncio
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """Sliding one-second window limiter shared by RPC callers."""
+    def __init__(self, rate_limit: int):
+        self.rate_limit = rate_limit
+        self.timestamps = deque()
+
+    def is_allowed(self) -> bool:
+        """Return True if we can perform an action, False if rate-limited."""
+        now = time.monotonic()
+        while self.timestamps and self.timestamps[0] < now - 1:
+            self.timestamps.popleft()
+
+        if len(self.timestamps) < self.rate_limit:
+            self.timestamps.append(now)
+            return True
+        return False
+
+    async def wait(self) -> None:
+        """Sleep until an action is allowed, then take the slot."""
+        while not self.is_allowed():
+            await asyncio.sleep(max(self.timestamps[0] + 1 - time.monotonic(), 0.001))
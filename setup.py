@@ -4,4 +4,9 @@ setup(
     name="my_package",
     version="0.1",
     packages=find_packages(),
-)
\ No newline at end of file
+    entry_points={
+        "console_scripts": [
+            "solsniff=core.cli.cli:main",
+        ],
+    },
+)
@@ -0,0 +1,46 @@
+from core.reorder.reorder import ReorderBuffer
+
+TIP = {"parent": 1031, "root": 1000, "slot": 1032}
+# Two subscriptions delivering slots 1000-1002 interleaved, 32 slots behind the processed tip
+ARRIVALS = [
+    ("a", 1001, "a1001"),
+    ("b", 1000, "b1000"),
+    ("a", 1002, "a1002"),
+    ("b", 1001, "b1001"),
+    ("a", 1000, "a1000"),
+    ("b", 1002, "b1002"),
+]
+IN_SLOT_ORDER = ["b1000", "a1000", "a1001", "b1001", "a1002", "b1002"]
+
+
+def _replay(commitment):
+    released = []
+    buffer = ReorderBuffer(released.extend, max_delay=60, commitment=commitment)
+    buffer.on_slot_notification(TIP)
+    for source, slot, event in ARRIVALS:
+        buffer.push(source, slot, event)
+    buffer.flush(everything=True)
+    return released, buffer
+
+
+def test_finalized_logs_behind_processed_tip_are_reordered():
+    released, buffer = _replay("finalized")
+    assert released == IN_SLOT_ORDER
+    assert buffer.late == 0
+
+
+def test_node_default_commitment_follows_the_root():
+    released, _ = _replay(None)
+    assert released == IN_SLOT_ORDER
+
+
+def test_confirmed_ignores_slot_notifications():
+    released, buffer = _replay("confirmed")
+    assert buffer.chain_slot == 0
+    assert released == IN_SLOT_ORDER
+
+
+def test_processed_tip_releases_slots_it_has_passed():
+    released, buffer = _replay("processed")
+    assert buffer.chain_slot == 1032
+    assert released == [event for _, _, event in ARRIVALS]  # Each was already complete on arrival